@@ -0,0 +1,73 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from timetable_automation.benchmark import run_suite
+from timetable_automation.main import Scheduler
+from timetable_automation.synthetic import generate_institute
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+def header(path):
+    with open(path, newline="") as fh:
+        return next(csv.reader(fh))
+
+
+class TestSyntheticInstitute(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_schemas_match_bundled_data(self):
+        m = generate_institute(self.tmp.name, sections=5, courses_per_section=3)
+        self.assertEqual(len(m["departments"]), 5)
+        self.assertEqual(header(m["rooms"]), header(os.path.join(DATA_DIR, "rooms.csv")))
+        self.assertEqual(header(m["slots"]), header(os.path.join(DATA_DIR, "timeslots.csv")))
+        self.assertEqual(header(m["faculty"]), header(os.path.join(DATA_DIR, "Faculty.csv")))
+        self.assertEqual(header(m["exam_faculty"]), header(os.path.join(DATA_DIR, "exam_data", "Faculty.csv")))
+        for path in m["departments"].values():
+            self.assertEqual(header(path), header(os.path.join(DATA_DIR, "coursesCSEA-III.csv")))
+        for path in m["exam_departments"].values():
+            self.assertEqual(header(path), header(os.path.join(DATA_DIR, "exam_data", "CSE_3.csv")))
+
+        sched = Scheduler(m["slots"], m["departments"]["CSE-1-A"], m["rooms"], {}, dept_name="CSE-1-A")
+        self.assertIn("07:30-09:00", sched.slots)
+        self.assertIn("13:15-14:00", sched.slots)
+        self.assertTrue(any(c.is_combined for c in sched.courses))
+        self.assertTrue(any(c.is_elective and c.basket == 2 for c in sched.courses))
+
+    def test_same_seed_same_files(self):
+        a = generate_institute(os.path.join(self.tmp.name, "a"), sections=4, seed=7)
+        b = generate_institute(os.path.join(self.tmp.name, "b"), sections=4, seed=7)
+        for name in a["departments"]:
+            with open(a["departments"][name]) as fa, open(b["departments"][name]) as fb:
+                self.assertEqual(fa.read(), fb.read())
+
+    def test_suite_writes_json_results(self):
+        output = os.path.join(self.tmp.name, "bench.json")
+        run_suite(
+            [2],
+            output=output,
+            workdir=os.path.join(self.tmp.name, "run"),
+            courses_per_section=2,
+            elective_baskets=1,
+            combined_courses=1,
+        )
+        with open(output) as fh:
+            report = json.load(fh)
+        run = report["runs"][0]
+        self.assertEqual(run["sections"], 2)
+        for phase in ("generate_timetable", "run_all_outputs", "faculty_export", "exam_generate", "exam_export"):
+            self.assertIn(phase, run["timings"])
+        self.assertGreater(run["required_hours"], 0)
+        self.assertGreaterEqual(run["unscheduled_ratio"], 0.0)
+        self.assertLessEqual(run["unscheduled_ratio"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
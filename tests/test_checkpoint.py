@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from timetable_automation.main import generate_all_departments
+from timetable_automation.runstate import load_checkpoint
+
+
+def crash_on(dept_name):
+    def on_department(name, scheduler):
+        if name == dept_name:
+            raise RuntimeError(f"{name}_timetable.xlsx is locked")
+
+    return on_department
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        root = Path(self.tmp.name)
+        pd.DataFrame(
+            [{"Start_Time": f"{h:02d}:00", "End_Time": f"{h + 1:02d}:00"} for h in range(9, 18)]
+        ).to_csv(root / "slots.csv", index=False)
+        pd.DataFrame(
+            [{"Room_ID": r, "Capacity": 90} for r in ("C101", "C102", "C201")] + [{"Room_ID": "L101", "Capacity": 40}]
+        ).to_csv(root / "rooms.csv", index=False)
+        self.departments = {}
+        for i, name in enumerate(("CSE-1-A", "CSE-1-B", "CSE-3-A")):
+            pd.DataFrame(
+                [
+                    {"Course_Code": f"CS{i}01", "Course_Title": "Intro", "Faculty": "Prof X", "L-T-P-S-C": "3-1-2-0-4", "Semester_Half": "0", "Elective": "0"},
+                    {"Course_Code": f"CS{i}02", "Course_Title": "Data", "Faculty": f"Prof {i}", "L-T-P-S-C": "2-1-0-0-3", "Semester_Half": "0", "Elective": "0"},
+                ]
+            ).to_csv(root / f"courses{i}.csv", index=False)
+            self.departments[name] = f"courses{i}.csv"
+        os.chdir(root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def generate(self, **kwargs):
+        _, entries = generate_all_departments(
+            self.departments, "rooms.csv", "slots.csv", checkpoint_file="ckpt.pkl", **kwargs
+        )
+        return [dict(e) for e in entries]
+
+    def test_resume_matches_an_uninterrupted_run(self):
+        expected = self.generate(seed=5)
+        self.assertFalse(os.path.exists("ckpt.pkl"))
+
+        with self.assertRaises(RuntimeError):
+            self.generate(seed=5, on_department=crash_on("CSE-3-A"))
+        saved = load_checkpoint("ckpt.pkl", self.departments, "rooms.csv", "slots.csv")
+        self.assertEqual(list(saved["departments"]), ["CSE-1-A", "CSE-1-B"])
+
+        resumed = self.generate(seed=99, resume=True)
+        self.assertEqual(resumed, expected)
+        self.assertFalse(os.path.exists("ckpt.pkl"))
+
+    def test_checkpoint_is_ignored_when_an_input_changed(self):
+        with self.assertRaises(RuntimeError):
+            self.generate(on_department=crash_on("CSE-1-B"))
+        self.assertIsNotNone(load_checkpoint("ckpt.pkl", self.departments, "rooms.csv", "slots.csv"))
+        Path("courses0.csv").write_text(Path("courses0.csv").read_text().replace("Prof X", "Prof Xavier"))
+        self.assertIsNone(load_checkpoint("ckpt.pkl", self.departments, "rooms.csv", "slots.csv"))
+
+
+if __name__ == "__main__":
+    unittest.main()
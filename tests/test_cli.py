@@ -0,0 +1,158 @@
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from timetable_automation.cli import build_parser, main
+from timetable_automation.config import ConfigError, load_config, validate_config
+from timetable_automation.main import Scheduler
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        root = Path(self.tmp.name)
+        (root / "inputs").mkdir()
+        pd.DataFrame(
+            [{"Start_Time": f"{h:02d}:00", "End_Time": f"{h + 1:02d}:00"} for h in range(8, 17)]
+        ).to_csv(root / "inputs" / "slots.csv", index=False)
+        pd.DataFrame(
+            [{"Room_ID": r, "Capacity": 90} for r in ("C101", "C102", "C201")] + [{"Room_ID": "L101", "Capacity": 40}]
+        ).to_csv(root / "inputs" / "rooms.csv", index=False)
+        pd.DataFrame(
+            [
+                {"Course_Code": "CS101", "Course_Title": "Intro", "Faculty": "Prof X", "L-T-P-S-C": "3-1-2-0-4", "Semester_Half": "0", "Elective": "0"},
+                {"Course_Code": "CS102", "Course_Title": "Data", "Faculty": "Prof Y", "L-T-P-S-C": "2-0-0-0-2", "Semester_Half": "0", "Elective": "0"},
+            ]
+        ).to_csv(root / "inputs" / "courses.csv", index=False)
+        self.config = {
+            "departments": {"CSE-1-A": "inputs/courses.csv"},
+            "rooms": "inputs/rooms.csv",
+            "slots": "inputs/slots.csv",
+            "days": ["Monday", "Wednesday", "Friday"],
+            "excluded_slots": ["08:00-09:00"],
+            "policies": {"compulsory_only_rooms": [], "combined_only_rooms": ["C201"]},
+            "output_dir": "out",
+        }
+        self.root = root
+        os.chdir(root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def write_config(self, name="run.json", config=None):
+        path = self.root / name
+        path.write_text(json.dumps(self.config if config is None else config))
+        return str(path)
+
+    def test_paths_are_relative_to_the_config_file(self):
+        os.chdir(self.cwd)
+        config = load_config(self.write_config())
+        self.assertEqual(config["rooms"], str(self.root / "inputs" / "rooms.csv"))
+        self.assertEqual(config["departments"]["CSE-1-A"], str(self.root / "inputs" / "courses.csv"))
+        self.assertEqual(config["days"], ["Monday", "Wednesday", "Friday"])
+        self.assertEqual(validate_config(config, exam=False), [])
+
+    def test_toml_config(self):
+        path = self.root / "run.toml"
+        path.write_text('rooms = "inputs/rooms.csv"\nseed = 7\n[policies]\ncombined_only_rooms = ["C201"]\n')
+        config = load_config(str(path))
+        self.assertEqual(config["seed"], 7)
+        self.assertEqual(config["policies"]["combined_only_rooms"], ["C201"])
+        self.assertEqual(config["policies"]["compulsory_only_rooms"], ["C002", "C003"])
+
+    def test_bad_settings_are_reported(self):
+        with self.assertRaises(ConfigError):
+            load_config(self.write_config(config={"dayz": ["Monday"]}))
+        with self.assertRaises(ConfigError):
+            load_config(self.write_config(config={"seed": "7"}))
+        policies = {"compulsory_only_rooms": [], "combined_only_rooms": ["C999"]}
+        broken = dict(self.config, excluded_slots=["07:00-08:00"], policies=policies)
+        problems = validate_config(load_config(self.write_config(config=broken)), exam=False)
+        self.assertEqual(len(problems), 2)
+
+    def test_validate_command(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertEqual(main(["validate", "--config", self.write_config()]), 1)  # default exam files are missing
+        self.assertIn("exam.rooms", out.getvalue())
+        self.assertNotIn("departments.CSE-1-A", out.getvalue())
+
+    def test_generate_uses_configured_days_and_output_dir(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(main(["generate", "--config", self.write_config(), "--cache-dir", ""]), 0)
+        out = self.root / "out"
+        self.assertTrue((out / "CSE-1-A_timetable.xlsx").exists())
+        self.assertTrue((out / "faculty_timetable.xlsx").exists())
+        self.assertEqual(list(out.glob("*.pkl")), [])
+        grid = pd.read_excel(out / "CSE-1-A_timetable.xlsx", sheet_name=None)
+        days = {str(v) for frame in grid.values() for v in frame.iloc[:, 0]}
+        self.assertFalse(days & {"Tuesday", "Thursday"})
+
+    def test_state_and_checkpoint_files_are_opt_in(self):
+        parser = build_parser()
+        args = parser.parse_args(["generate"])
+        self.assertIsNone(args.state_file)
+        self.assertIsNone(args.checkpoint)
+        args = parser.parse_args(["generate", "--state-file", "--checkpoint", "run.pkl"])
+        self.assertEqual((args.state_file, args.checkpoint), ("timetable_state.pkl", "run.pkl"))
+
+    def test_generate_rejects_options_a_mode_would_ignore(self):
+        config = self.write_config()
+        for argv, message in (
+            (["--workers", "4", "--repair", "10"], "--repair cannot be combined with --workers"),
+            (["--workers", "2", "--checkpoint"], "--checkpoint cannot be combined with --workers"),
+            (["--portfolio", "2", "--resume"], "--resume cannot be combined with --portfolio"),
+            (["--incremental", "--improve", "5"], "--improve cannot be combined with --incremental"),
+            (["--time-budget", "60"], "--time-budget only applies to --portfolio"),
+            (["--checkpoint", "--repair", "5"], "cannot be combined with --improve or --repair"),
+        ):
+            with self.subTest(argv=argv), contextlib.redirect_stderr(io.StringIO()) as err:
+                with self.assertRaises(SystemExit) as raised:
+                    main(["generate", "--config", config, *argv])
+                self.assertEqual(raised.exception.code, 2)
+                self.assertIn(message, err.getvalue())
+        self.assertFalse((self.root / "out").exists())
+
+    def test_scheduler_room_policy(self):
+        sched = Scheduler(
+            "inputs/slots.csv",
+            "inputs/courses.csv",
+            "inputs/rooms.csv",
+            {},
+            days=["Monday"],
+            compulsory_only_rooms=["c101"],
+            combined_only_rooms=["C201"],
+        )
+        self.assertEqual(sched.days, ["Monday"])
+        self.assertTrue(sched.room_symbols.profile("C201").is_c004)
+        self.assertTrue(sched.room_symbols.profile("C101").compulsory_only)
+        self.assertFalse(sched.room_symbols.profile("C004").is_c004)
+
+    def test_help_and_validate_do_not_import_pandas(self):
+        code = (
+            "import sys, contextlib, io\n"
+            "from timetable_automation.cli import main\n"
+            "with contextlib.redirect_stdout(io.StringIO()):\n"
+            "    main(['validate'])\n"
+            "print(sorted(m for m in ('pandas', 'openpyxl', 'numpy') if m in sys.modules))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
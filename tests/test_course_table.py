@@ -0,0 +1,63 @@
+import unittest
+
+import pandas as pd
+
+from timetable_automation import exam
+from timetable_automation.courses import load_course_table, load_exam_course_table
+from timetable_automation.main import Course
+
+
+class TestCourseTable(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame(
+            [
+                {"Course_Code": " CS101 ", "Course_Title": "Intro", "Faculty": "Prof X", "L-T-P-S-C": "3-1-0-0-4",
+                 "Semester_Half": 1, "Elective": "0", "Students": "85", "basket": 0, "is_combined": "1"},
+                {"Course_Code": "CS201", "Course_Title": "Algo", "Faculty": "Prof Y", "L-T-P-S-C": "3-0-2-0-4",
+                 "Semester_Half": 0, "Elective": "yes", "Students": "12.7", "basket": 2, "is_combined": "no"},
+                {"Course_Code": "CS301", "Course_Title": None, "Faculty": None, "L-T-P-S-C": "bad-data",
+                 "Semester_Half": 2, "Elective": None, "Students": "n/a", "basket": 0, "is_combined": "TRUE"},
+            ]
+        )
+
+    def test_matches_row_parser(self):
+        table = load_course_table(self.df, Course.from_record)
+        self.assertEqual(len(table), 3)
+        for (_, row), view in zip(self.df.iterrows(), table):
+            expected = Course(row)
+            for name in ("code", "basket", "title", "faculty", "ltp", "semester_half",
+                         "is_elective", "is_combined", "students", "L", "T", "P"):
+                self.assertEqual(getattr(view, name), getattr(expected, name), name)
+                self.assertIs(type(getattr(view, name)), type(getattr(expected, name)), name)
+
+    def test_columns_are_parsed_in_bulk(self):
+        table = load_course_table(self.df.to_dict("records"), Course.from_record)
+        self.assertEqual(list(table.column("L")), [3, 3, 0])
+        self.assertEqual(list(table.column("P")), [0, 2, 0])
+        self.assertEqual(list(table.column("students")), [85, 12, 0])
+        self.assertEqual(list(table.column("is_elective")), [False, True, False])
+
+    def test_views_are_built_lazily_once(self):
+        table = load_course_table(self.df, Course.from_record)
+        self.assertEqual(table._views, [None, None, None])
+        first = table[1]
+        self.assertIs(table[1], first)
+        self.assertEqual(sum(v is not None for v in table._views), 1)
+        self.assertEqual(first.code, "CS201")
+
+    def test_exam_table_matches_row_parser(self):
+        df = pd.DataFrame(
+            [
+                {"Course_Code": "CS101", "Course_Title": "Intro", "Students": 80, "Elective": "YES"},
+                {"Course_Code": "CS102", "Students": "12.5", "Elective": "y"},
+            ]
+        )
+        table = load_exam_course_table(df, "CSE-3", exam.Course.from_record)
+        for (_, row), view in zip(df.iterrows(), table):
+            expected = exam.Course(row, "CSE-3")
+            for name in exam.Course.__slots__:
+                self.assertEqual(getattr(view, name), getattr(expected, name), name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from timetable_automation.main import Scheduler
+
+
+class TestDeferredFacultyExport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        root = Path(self.tmp.name)
+        pd.DataFrame(
+            [{"Start_Time": "09:00", "End_Time": "10:00"}, {"Start_Time": "10:00", "End_Time": "11:00"}]
+        ).to_csv(root / "slots.csv", index=False)
+        pd.DataFrame(
+            [{"Course_Code": "CS101", "Course_Title": "Intro", "Faculty": "Prof X", "L-T-P-S-C": "1-0-0-0-1", "Semester_Half": "1", "Elective": "0"}]
+        ).to_csv(root / "courses.csv", index=False)
+        pd.DataFrame([{"Room_ID": "C101", "Type": "classroom"}]).to_csv(root / "rooms.csv", index=False)
+        os.chdir(root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_deferred_run_skips_faculty_workbook(self):
+        sched = Scheduler("slots.csv", "courses.csv", "rooms.csv", {})
+        sched.run_all_outputs("CSE", faculty_filename="faculty.xlsx", defer_faculty_export=True)
+        self.assertTrue(Path("CSE_timetable.xlsx").exists())
+        self.assertFalse(Path("faculty.xlsx").exists())
+        self.assertEqual(sched.last_run_timings["faculty_export"], 0.0)
+        self.assertTrue(sched.scheduled_entries)
+
+        sched._generate_faculty_workbook("faculty.xlsx")
+        self.assertTrue(Path("faculty.xlsx").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+from timetable_automation.entries import EntryStore
+
+
+def _entry(sheet, day, slot, code, faculty="", room=""):
+    return {"sheet": sheet, "day": day, "slot": slot, "code": code, "display": code, "faculty": faculty, "room": room}
+
+
+class TestEntryStore(unittest.TestCase):
+    def test_indexes_follow_appends(self):
+        store = EntryStore()
+        store.append(_entry("First_Half", "Monday", "09:00-10:00", "CS101", "Prof X / Prof Y", "C101"))
+        store.append(_entry("First_Half", "Monday", "10:00-11:00", "CS101", "Prof X / Prof Y", "C101"))
+        store.append(_entry("Second_Half", "Tuesday", "09:00-10:00", "CS102", "Prof Z", "C102"))
+
+        self.assertTrue(store.has_session("First_Half", "Monday", "CS101"))
+        self.assertFalse(store.has_session("First_Half", "Tuesday", "CS101"))
+        self.assertEqual(len(store.for_sheet_code("First_Half", "CS101")), 2)
+        self.assertEqual(len(store.for_faculty("Prof Y")), 2)
+        self.assertEqual(len(store.for_room("C102")), 1)
+        self.assertEqual(store.faculty_names(), {"Prof X", "Prof Y", "Prof Z"})
+
+    def test_list_view_and_reindex(self):
+        store = EntryStore([_entry("S", "Monday", "09:00-10:00", "A"), _entry("S", "Monday", "10:00-11:00", "B")])
+        self.assertIsInstance(store, list)
+        self.assertEqual([e["code"] for e in store], ["A", "B"])
+        store.pop(0)
+        self.assertFalse(store.has_session("S", "Monday", "A"))
+        store.clear()
+        self.assertEqual(store.for_sheet_code("S", "B"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
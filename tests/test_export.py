@@ -0,0 +1,135 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+
+from timetable_automation.export import (
+    BOXED,
+    BREAK_STYLE,
+    CENTER,
+    PALETTE,
+    ColorMap,
+    SheetLayout,
+    StyleSheet,
+    color_style,
+    frame_layout,
+    put_runs,
+    write_faculty_workbook,
+)
+from timetable_automation.main import Scheduler
+
+
+class TestStreamingExport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        root = Path(self.tmp.name)
+        pd.DataFrame(
+            [
+                {"Start_Time": "09:00", "End_Time": "10:00"},
+                {"Start_Time": "10:00", "End_Time": "11:00"},
+                {"Start_Time": "11:00", "End_Time": "12:00"},
+            ]
+        ).to_csv(root / "slots.csv", index=False)
+        pd.DataFrame(
+            [{"Course_Code": "CS101", "Course_Title": "Intro", "Faculty": "Prof X", "L-T-P-S-C": "2-0-0-0-2", "Semester_Half": "1", "Elective": "0"}]
+        ).to_csv(root / "courses.csv", index=False)
+        pd.DataFrame([{"Room_ID": "C101", "Type": "classroom"}]).to_csv(root / "rooms.csv", index=False)
+        os.chdir(root)
+        self.sched = Scheduler("slots.csv", "courses.csv", "rooms.csv", {})
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def _grid(self):
+        grid = pd.DataFrame("", index=self.sched.days, columns=self.sched.slots)
+        first, second, third = self.sched.slots[:3]
+        grid.at[self.sched.days[0], first] = "CS101 (C101)"
+        grid.at[self.sched.days[0], second] = "CS101 (C101)"
+        grid.at[self.sched.days[0], third] = "BREAK"
+        return grid
+
+    def test_student_workbook_styles_and_legend(self):
+        self.sched.export_student_outputs("CSE", "out.xlsx", timetables={"First_Half": self._grid()})
+        ws = load_workbook("out.xlsx")["First_Half"]
+
+        self.assertEqual([str(r) for r in ws.merged_cells.ranges], ["B2:C2"])
+        self.assertEqual(ws["B2"].value, "CS101 (C101)")
+        self.assertEqual(ws["B2"].fill.fgColor.rgb, "00" + PALETTE[0])
+        self.assertEqual(ws["B2"].alignment.horizontal, "center")
+        self.assertEqual(ws["D2"].fill.fgColor.rgb, "00D9D9D9")
+        self.assertEqual(ws["B3"].border.left.style, "thin")
+        self.assertEqual(ws.freeze_panes, "B2")
+
+        legend_row = len(self.sched.days) + 4
+        self.assertEqual(ws.cell(legend_row, 3).value, "Course Code")
+        self.assertEqual(ws.cell(legend_row + 1, 3).value, "CS101")
+        self.assertEqual(ws.cell(legend_row + 1, 4).value, "Intro")
+        self.assertEqual(ws.cell(legend_row + 1, 7).fill.fgColor.rgb, "00" + PALETTE[0])
+        self.assertEqual(ws.column_dimensions["D"].width, len("Elective Title") + 2)
+
+    def test_prewritten_workbook_is_reformatted_identically(self):
+        self.sched.export_student_outputs("CSE", "streamed.xlsx", timetables={"First_Half": self._grid()})
+        with pd.ExcelWriter("legacy.xlsx", engine="openpyxl") as writer:
+            self._grid().to_excel(writer, sheet_name="First_Half", index=True)
+        self.sched.format_student_timetable_with_legend("legacy.xlsx")
+
+        a = load_workbook("streamed.xlsx")["First_Half"]
+        b = load_workbook("legacy.xlsx")["First_Half"]
+        self.assertEqual(list(a.iter_rows(values_only=True)), list(b.iter_rows(values_only=True)))
+        self.assertEqual(a.merged_cells.ranges, b.merged_cells.ranges)
+
+    def test_faculty_workbook_layout(self):
+        grid = pd.DataFrame("    ", index=self.sched.days, columns=self.sched.slots)
+        grid.iloc[0, 0] = "CS101 (C101)"
+        grid.iloc[0, 1] = "CS101 (C101)"
+        empty = pd.DataFrame("    ", index=self.sched.days, columns=self.sched.slots)
+        write_faculty_workbook("faculty.xlsx", {"Prof X": {"First_Half": grid, "Second_Half": empty}}, self.sched.slots)
+
+        ws = load_workbook("faculty.xlsx")["Prof X"]
+        self.assertEqual(ws["A1"].value, "First Half")
+        self.assertEqual(ws["A2"].value, "Day")
+        self.assertTrue(ws["A2"].font.b)
+        self.assertEqual(ws["B2"].fill.fgColor.rgb, "00D3D3D3")
+        self.assertEqual([str(r) for r in ws.merged_cells.ranges], ["B3:C3"])
+        second_title = len(self.sched.days) + 4
+        self.assertEqual(ws.cell(second_title, 1).value, "Second Half")
+        self.assertEqual(ws.cell(second_title + 1, 1).value, "Day")
+
+
+class TestRenderEngine(unittest.TestCase):
+    def test_runs_are_merged_from_the_row_values(self):
+        layout = SheetLayout("Grid")
+        put_runs(layout, 2, 2, ["CS101 (C101)", "CS101 (C101)", "BREAK", "", "CS101T (C101)"], ColorMap(), ("BREAK",))
+        self.assertEqual([str(r) for r in layout.merges], ["B2:C2"])
+        self.assertEqual(layout.cells[(2, 2)], ("CS101 (C101)", color_style(PALETTE[0], CENTER)))
+        self.assertEqual(layout.cells[(2, 3)], (None, color_style(PALETTE[0])))
+        self.assertEqual(layout.cells[(2, 4)], ("BREAK", BREAK_STYLE))
+        self.assertEqual(layout.cells[(2, 5)], (None, BOXED))
+        # The tutorial shares its course's colour object.
+        self.assertIs(layout.cells[(2, 6)][1], layout.cells[(2, 2)][1])
+
+    def test_frame_layout_and_shared_style_arrays(self):
+        frame = pd.DataFrame({"2025-11-20": ["CS101", ""], "2025-11-21": ["", "A" * 90]}, index=["09:00", "14:00"])
+        layout = frame_layout("Grid", frame, index=True, header_style=BREAK_STYLE, body_style=BOXED, min_width=12, pad=4, max_width=70)
+        self.assertEqual(layout.column_widths(), {1: 16, 2: 16, 3: 70})
+        styles = StyleSheet()
+        wb = Workbook(write_only=True)
+        layout.write(wb, styles)
+        self.assertEqual(set(styles.arrays), {BREAK_STYLE, BOXED})
+        with tempfile.TemporaryDirectory() as tmp:
+            wb.save(os.path.join(tmp, "exam.xlsx"))
+            ws = load_workbook(os.path.join(tmp, "exam.xlsx"))["Grid"]
+        self.assertIsNone(ws["A1"].value)
+        self.assertEqual(ws["A1"].fill.fgColor.rgb, "00D9D9D9")
+        self.assertEqual(ws["A2"].value, "09:00")
+        self.assertEqual(ws["B3"].border.left.style, "thin")
+        self.assertIsNone(ws["B3"].fill.fill_type)
+
+
+if __name__ == "__main__":
+    unittest.main()
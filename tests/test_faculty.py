@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+
+import pandas as pd
+
+from timetable_automation.faculty import FacultyCalendar
+from timetable_automation.main import Scheduler, new_global_state
+
+SLOTS = ["09:00-10:00", "10:00-11:00", "11:00-12:00"]
+
+
+class TestFacultyCalendar(unittest.TestCase):
+    def setUp(self):
+        self.cal = FacultyCalendar()
+        self.bits = [self.cal.occupancy.bit(s) for s in SLOTS]
+
+    def test_co_taught_names_and_halves(self):
+        self.cal.claim(("CSE-3-A", "First_Half"), "Dr. A / Dr. B", "First_Half", "Monday", self.bits[0])
+        self.assertTrue(self.cal.clash("dr. b", "First_Half", "Monday", self.bits[0]))
+        self.assertTrue(self.cal.clash("Dr. C/Dr. A", "First_Half", "Monday", self.bits[0] | self.bits[1]))
+        self.assertFalse(self.cal.clash("Dr. A", "First_Half", "Monday", self.bits[1]))
+        self.assertFalse(self.cal.clash("Dr. A", "Second_Half", "Monday", self.bits[0]))
+        self.assertEqual(self.cal.busy("DR. B", "First_Half", "Monday"), self.bits[0])
+
+    def test_shared_sessions_and_release(self):
+        key = ("3", "First_Half", "CS301", "L")
+        self.cal.claim(("CSE-3-A", "First_Half"), "Dr. A", "First_Half", "Monday", self.bits[0], key)
+        self.assertFalse(self.cal.clash("Dr. A", "First_Half", "Monday", self.bits[0], key))
+        self.assertTrue(self.cal.clash("Dr. A", "First_Half", "Monday", self.bits[0]))
+        self.cal.claim(("DSAI-3", "First_Half"), "Dr. A", "First_Half", "Monday", self.bits[0], key)
+        self.cal.claim(("DSAI-3", "First_Half"), "Dr. A", "First_Half", "Monday", self.bits[2])
+        self.assertTrue(self.cal.clash("Dr. A", "First_Half", "Monday", self.bits[2], key))
+
+        self.cal.release_holder(("DSAI-3", "First_Half"))
+        self.assertEqual(self.cal.busy("Dr. A", "First_Half", "Monday"), self.bits[0])
+        self.cal.release(("CSE-3-A", "First_Half"), "Dr. A", "First_Half", "Monday", self.bits[0], key)
+        self.assertEqual(self.cal.busy("Dr. A", "First_Half", "Monday"), 0)
+        self.assertEqual(self.cal.load(), {})
+
+    def test_load(self):
+        self.cal.claim(("CSE-1-A", "First_Half"), "Dr. A / Dr. B", "First_Half", "Monday", self.bits[0] | self.bits[1])
+        self.cal.claim(("ECE-1", "Second_Half"), "Dr. A", "Second_Half", "Friday", self.bits[2])
+        hours = {"09:00-10:00": 1.0, "10:00-11:00": 1.0, "11:00-12:00": 0.5}
+        self.assertEqual(
+            self.cal.load(hours),
+            {("DR. A", "First_Half", "Monday"): 2.0, ("DR. B", "First_Half", "Monday"): 2.0, ("DR. A", "Second_Half", "Friday"): 0.5},
+        )
+        self.assertEqual(self.cal.load()[("DR. A", "First_Half", "Monday")], 2)
+
+
+class TestSharedFacultyCalendar(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        root = Path(self.tmp.name)
+        pd.DataFrame(
+            [{"Start_Time": f"{h:02d}:00", "End_Time": f"{h + 1:02d}:00"} for h in range(9, 13)]
+        ).to_csv(root / "slots.csv", index=False)
+        pd.DataFrame([{"Room_ID": r, "Capacity": 90} for r in ("C101", "C102")]).to_csv(root / "rooms.csv", index=False)
+        for name, code in (("a", "CS101"), ("b", "MA101")):
+            pd.DataFrame(
+                [{"Course_Code": code, "Course_Title": code, "Faculty": "Prof X", "L-T-P-S-C": "3-0-0-0-3", "Semester_Half": "1", "Elective": "0"}]
+            ).to_csv(root / f"courses_{name}.csv", index=False)
+        os.chdir(root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_departments_do_not_double_book_a_faculty_member(self):
+        departments = {"CSE-1-A": "courses_a.csv", "ECE-1": "courses_b.csv"}
+        state = new_global_state(departments)
+        entries = []
+        for dept_name, course_file in departments.items():
+            sched = Scheduler("slots.csv", course_file, "rooms.csv", dept_name=dept_name, **state)
+            sched.days = ["Monday", "Tuesday"]
+            sched.generate_timetable(sched.courses, None, "First_Half")
+            self.assertIs(sched.faculty_calendar, state["global_faculty_calendar"])
+            entries.extend(sched.scheduled_entries)
+        self.assertTrue({e["code"] for e in entries} >= {"CS101", "MA101"})
+        booked = Counter((e["day"], e["slot"]) for e in entries)
+        self.assertEqual(max(booked.values()), 1)
+        load = state["global_faculty_calendar"].load()
+        self.assertEqual(sum(n for (name, _, _), n in load.items() if name == "PROF X"), len(entries))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import random
+import unittest
+
+import pandas as pd
+
+from timetable_automation.geometry import slot_geometry
+
+SLOTS = [
+    "07:30-09:00",
+    "09:00-10:00",
+    "10:00-10:30",
+    "10:30-10:45",
+    "10:45-11:00",
+    "11:00-12:00",
+    "12:00-13:15",
+    "13:15-14:00",
+    "14:00-15:30",
+    "15:30-15:45",
+    "15:45-17:00",
+    "17:00-18:30",
+]
+EXCLUDED = ["07:30-09:00", "13:15-14:00"]
+
+
+def sliding_windows(geometry, timetable, day, duration):
+    # Reference: the free-block scan + sliding window _allocate_session used to run.
+    blocks, block = [], []
+    for slot in SLOTS:
+        if timetable.at[day, slot] == "" and slot not in EXCLUDED:
+            block.append(slot)
+        elif block:
+            blocks.append(block)
+            block = []
+    if block:
+        blocks.append(block)
+    candidates = []
+    for block in blocks:
+        for i in range(len(block)):
+            acc = 0
+            for j in range(i, len(block)):
+                acc += geometry.durations[block[j]]
+                if acc >= duration:
+                    candidates.append((block[i:j + 1], acc - duration))
+                    break
+    candidates.sort(key=lambda c: c[1])
+    return candidates
+
+
+class TestSlotGeometry(unittest.TestCase):
+    def setUp(self):
+        self.geometry = slot_geometry(SLOTS, EXCLUDED, 1)
+
+    def test_shared_per_layout(self):
+        self.assertIs(slot_geometry(list(SLOTS), list(EXCLUDED), 1), self.geometry)
+        self.assertIsNot(slot_geometry(SLOTS, EXCLUDED, 2), self.geometry)
+
+    def test_windows_match_sliding_window_scan(self):
+        rng = random.Random(3)
+        for _ in range(200):
+            timetable = pd.DataFrame("", index=["Monday"], columns=SLOTS)
+            for slot in SLOTS:
+                if rng.random() < 0.3:
+                    timetable.at["Monday", slot] = rng.choice(["CS101 (C101)", "BREAK", "FREE"])
+            busy = self.geometry.busy_mask(timetable, "Monday")
+            for duration in (0.5, 1, 1.5, 2):
+                got = [(list(w.slots), w.waste) for w in self.geometry.free_windows(duration, busy)]
+                self.assertEqual(got, sliding_windows(self.geometry, timetable, "Monday", duration))
+
+    def test_window_carries_start_and_trailing_slot(self):
+        windows = self.geometry.windows(1.5)
+        self.assertEqual(windows[0].slots, ("09:00-10:00", "10:00-10:30"))
+        window = next(w for w in windows if w.slots == ("14:00-15:30",))
+        self.assertEqual(window.waste, 0)
+        self.assertEqual(window.start, SLOTS.index("14:00-15:30"))
+        self.assertEqual(window.trailing, ("15:30-15:45",))
+        self.assertEqual(self.geometry.trailing["17:00-18:30"], ())
+        for window in self.geometry.windows(2):
+            self.assertFalse(set(window.slots) & set(EXCLUDED))
+
+
+if __name__ == "__main__":
+    unittest.main()
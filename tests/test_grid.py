@@ -0,0 +1,39 @@
+import unittest
+
+import pandas as pd
+
+from timetable_automation.grid import TimetableGrid
+from timetable_automation.main import Scheduler
+
+DAYS = ["Monday", "Tuesday"]
+SLOTS = ["09:00-10:00", "10:00-11:00", "11:00-12:00"]
+
+
+class TestTimetableGrid(unittest.TestCase):
+    def test_cells_and_frame_round_trip(self):
+        grid = TimetableGrid(DAYS, SLOTS)
+        grid.at["Tuesday", "10:00-11:00"] = "CS101 (C101)"
+        self.assertEqual(grid.at["Tuesday", "10:00-11:00"], "CS101 (C101)")
+        self.assertEqual(grid.row("Tuesday"), ["", "CS101 (C101)", ""])
+
+        expected = pd.DataFrame("", index=DAYS, columns=SLOTS)
+        expected.at["Tuesday", "10:00-11:00"] = "CS101 (C101)"
+        pd.testing.assert_frame_equal(grid.to_frame(), expected)
+
+        back = TimetableGrid.from_frame(expected)
+        self.assertEqual(back.cells, grid.cells)
+        self.assertIs(TimetableGrid.coerce(grid), grid)
+
+    def test_scheduler_grids_and_dataframes(self):
+        sched = Scheduler("tests/test_data/temp_slots.csv", "tests/test_data/temp_courses.csv", "tests/test_data/temp_rooms.csv", {})
+        grid = sched.generate_timetable(sched.courses, None, "First_Half")
+        self.assertIsInstance(grid, TimetableGrid)
+        self.assertEqual(grid.columns, sched.slots)
+
+        df = grid.to_frame()
+        for day in sched.days:
+            self.assertEqual(sched._get_free_blocks(df, day), sched._get_free_blocks(grid, day))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Cold-start budget for importing the schedulers; pandas alone costs more.
+IMPORT_BUDGET_SECONDS = 0.3
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl")
+ENTRY_MODULES = ("timetable_automation.main", "timetable_automation.exam", "timetable_automation.cli")
+
+
+def import_times(modules):
+    # {module: cumulative microseconds} from a fresh interpreter's -X importtime.
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestImportTime(unittest.TestCase):
+    def test_entry_points_do_not_import_heavy_dependencies(self):
+        times = import_times(ENTRY_MODULES)
+        self.assertEqual([m for m in HEAVY_MODULES if m in times], [])
+
+    def test_cold_start_budget(self):
+        times = import_times(ENTRY_MODULES)
+        total = sum(times[m] for m in ENTRY_MODULES if m in times) / 1e6
+        self.assertLess(total, IMPORT_BUDGET_SECONDS, f"importing {', '.join(ENTRY_MODULES)} took {total:.3f}s")
+
+
+if __name__ == "__main__":
+    unittest.main()
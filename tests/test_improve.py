@@ -0,0 +1,93 @@
+import os
+import random
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+
+import pandas as pd
+
+from timetable_automation.improve import LocalSearch, session_hours
+from timetable_automation.main import Course, Scheduler
+
+
+class TestLocalSearch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        root = Path(self.tmp.name)
+        pd.DataFrame(
+            [{"Start_Time": f"{h:02d}:00", "End_Time": f"{h + 1:02d}:00"} for h in range(9, 17)]
+        ).to_csv(root / "slots.csv", index=False)
+        pd.DataFrame(
+            [
+                {"Course_Code": f"CS10{i}", "Course_Title": f"Course {i}", "Faculty": f"Prof {i % 3}", "L-T-P-S-C": ltp, "Semester_Half": "0", "Elective": "0"}
+                for i, ltp in enumerate(["3-1-2-0-4", "3-1-0-0-4", "2-0-2-0-3", "3-0-0-0-3"])
+            ]
+        ).to_csv(root / "courses.csv", index=False)
+        pd.DataFrame(
+            [{"Room_ID": "C101", "Capacity": 90}, {"Room_ID": "C102", "Capacity": 90}, {"Room_ID": "L101", "Capacity": 40}]
+        ).to_csv(root / "rooms.csv", index=False)
+        os.chdir(root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def scheduler(self, max_attempts=None):
+        sched = Scheduler("slots.csv", "courses.csv", "rooms.csv", {}, dept_name="CSE-1-A", seed=3)
+        if max_attempts is not None:
+            sched.MAX_ATTEMPTS = max_attempts
+        return sched, sched.generate_all_sheets()
+
+    def assert_consistent(self, sched, grids):
+        cells = {(e["sheet"], e["day"], e["slot"]): e["display"] for e in sched.scheduled_entries}
+        for sheet, grid in grids.items():
+            for day, row in grid.rows():
+                for slot, value in zip(grid.slots, row):
+                    expected = cells.get((sheet, day, slot))
+                    if expected is None:
+                        self.assertIn(value, ("", "BREAK"))
+                    else:
+                        self.assertEqual(value, expected)
+        rooms = Counter((e["sheet"], e["day"], e["slot"], e["room"]) for e in sched.scheduled_entries)
+        self.assertEqual(max(rooms.values()), 1)
+        faculty = Counter((e["sheet"], e["day"], e["slot"], e["faculty"]) for e in sched.scheduled_entries)
+        self.assertEqual(max(faculty.values()), 1)
+        sessions = Counter(
+            (e["sheet"], e["day"], e["code"]) for e in sched.scheduled_entries if e["slot"] == sched.slots[0]
+        )
+        self.assertFalse([k for k, n in sessions.items() if n > 1])
+
+    def test_moves_keep_every_rule_and_lower_the_cost(self):
+        sched, grids = self.scheduler()
+        hours_before = Counter(e["code"] for e in sched.scheduled_entries)
+        search = LocalSearch([(sched, grids)], time_budget=None, max_moves=3000, rng=random.Random(1))
+        stats = search.run()
+        self.assertLessEqual(stats["final_cost"], stats["initial_cost"])
+        self.assertGreater(stats["accepted"], 0)
+        self.assert_consistent(sched, grids)
+        self.assertEqual(Counter(e["code"] for e in sched.scheduled_entries).keys(), hours_before.keys())
+        # The incrementally tracked cost matches a fresh evaluation.
+        self.assertAlmostEqual(LocalSearch([(sched, grids)]).cost(), stats["final_cost"])
+
+    def test_unscheduled_chunks_are_inserted(self):
+        sched, grids = self.scheduler(max_attempts=0)
+        missing = sum(r["remaining_hours"] for r in sched.unscheduled_courses)
+        self.assertGreater(missing, 0)
+        stats = LocalSearch([(sched, grids)], time_budget=None, max_moves=5000, rng=random.Random(1)).run()
+        self.assertGreater(stats["inserted_hours"], 0)
+        left = sum(r["remaining_hours"] for r in sched.unscheduled_courses)
+        self.assertAlmostEqual(left, missing - stats["inserted_hours"])
+        self.assertTrue(sched.scheduled_entries)
+        self.assert_consistent(sched, grids)
+
+    def test_session_hours_recovers_requested_duration(self):
+        course = Course({"Course_Code": "CS101", "L-T-P-S-C": "2-1-0-0-3"})
+        self.assertEqual(session_hours(course, "L", [1.0, 1.0]), 1.5)
+        self.assertEqual(session_hours(course, "L", [0.5]), 0.5)
+        self.assertEqual(session_hours(course, "T", [0.5, 1.0]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import os
+import tempfile
+import unittest
+from collections import defaultdict
+from pathlib import Path
+
+import pandas as pd
+
+from timetable_automation.incremental import format_incremental_report, incremental_run
+from timetable_automation.main import Scheduler, new_global_state
+from timetable_automation.occupancy import scope_for_sheet
+from timetable_automation.records import ScheduledEntry
+from timetable_automation.runstate import STATE_FILENAME, load_run_state, unpack_records
+
+
+def course(code, faculty, ltp="3-1-0-0-4", basket=0, combined=0):
+    return {
+        "Course_Code": code,
+        "Course_Title": f"Course {code}",
+        "L-T-P-S-C": ltp,
+        "Faculty": faculty,
+        "Semester_Half": "0",
+        "Elective": 1 if basket else 0,
+        "Students": 40,
+        "basket": basket,
+        "is_combined": combined,
+    }
+
+
+class TestIncremental(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        root = Path(self.tmp.name)
+        pd.DataFrame(
+            [{"Start_Time": f"{h:02d}:00", "End_Time": f"{h + 1:02d}:00"} for h in range(9, 18)]
+        ).to_csv(root / "slots.csv", index=False)
+        pd.DataFrame(
+            [{"Room_ID": r, "Capacity": 90} for r in ("C101", "C102", "C201", "C202")]
+            + [{"Room_ID": r, "Capacity": 40} for r in ("L101", "L102")]
+        ).to_csv(root / "rooms.csv", index=False)
+        for section, faculty in (("A", "Prof A"), ("B", "Prof B")):
+            pd.DataFrame(
+                [
+                    course(f"CS1{section}1", faculty, "3-0-2-0-4"),
+                    course("MA101", "Prof M", combined=1),
+                    course("EL101", "Prof E", basket=1),
+                    course("EL102", "Prof F", basket=1),
+                ]
+            ).to_csv(root / f"cse1{section}.csv", index=False)
+        pd.DataFrame([course("CS301", "Prof C"), course("CS302", "Prof D", "2-0-2-0-3")]).to_csv(
+            root / "cse3.csv", index=False
+        )
+        self.departments = {"CSE-1-A": "cse1A.csv", "CSE-1-B": "cse1B.csv", "CSE-3-A": "cse3.csv"}
+        os.chdir(root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def run_incremental(self):
+        return incremental_run(self.departments, "rooms.csv", "slots.csv")
+
+    def edit(self, path, old, new):
+        text = Path(path).read_text().replace(old, new)
+        Path(path).write_text(text)
+
+    def entries(self):
+        return {name: snap["entries"] for name, snap in load_run_state(STATE_FILENAME)["departments"].items()}
+
+    def assert_no_room_clashes(self):
+        holders = defaultdict(set)
+        for rows in self.entries().values():
+            for sheet, day, slot, code, _, _, room in rows:
+                if room:
+                    holders[(scope_for_sheet(sheet), day, slot, room)].add(code)
+        self.assertEqual([k for k, codes in holders.items() if len(codes) > 1], [])
+
+    def test_first_run_is_full_and_saves_state(self):
+        self.assertIsNone(self.run_incremental())
+        self.assertEqual(set(self.entries()), set(self.departments))
+        for name in self.departments:
+            self.assertTrue(os.path.exists(f"{name}_timetable.xlsx"))
+        plan = self.run_incremental()
+        self.assertEqual(plan["affected"], [])
+        self.assertIn("nothing re-solved", format_incremental_report(plan))
+
+    def test_regular_course_change_re_solves_only_its_section(self):
+        self.run_incremental()
+        before = self.entries()
+        self.edit("cse3.csv", "Prof C", "Prof Charles")
+        plan = self.run_incremental()
+        self.assertEqual(plan["affected"], ["CSE-3-A"])
+        self.assertEqual(plan["faculty"], {"Prof C", "Prof Charles"})
+        after = self.entries()
+        self.assertEqual(after["CSE-1-A"], before["CSE-1-A"])
+        self.assertEqual(after["CSE-1-B"], before["CSE-1-B"])
+        self.assertIn("Prof Charles", {row[5] for row in after["CSE-3-A"]})
+        self.assert_no_room_clashes()
+
+    def test_elective_change_re_solves_every_section_with_the_basket(self):
+        self.run_incremental()
+        before = self.entries()
+        self.edit("cse1A.csv", "EL102,Course EL102,3-1-0-0-4", "EL102,Course EL102,2-1-0-0-3")
+        plan = self.run_incremental()
+        self.assertEqual(plan["changed"], ["CSE-1-A"])
+        self.assertEqual(plan["affected"], ["CSE-1-A", "CSE-1-B"])
+        self.assertEqual(plan["elective_templates"], {("1", 1)})
+        self.assertEqual(self.entries()["CSE-3-A"], before["CSE-3-A"])
+        self.assert_no_room_clashes()
+
+    def test_combined_change_re_solves_the_cluster(self):
+        self.run_incremental()
+        self.edit("cse1B.csv", "Prof M", "Prof Maria")
+        plan = self.run_incremental()
+        self.assertEqual(plan["affected"], ["CSE-1-A", "CSE-1-B"])
+        self.assertEqual(plan["combined_templates"], {("1", "CSE", "MA101")})
+        self.assert_no_room_clashes()
+
+    def test_room_change_forces_a_full_run(self):
+        self.run_incremental()
+        self.edit("rooms.csv", "C202,90", "C202,120")
+        self.assertIsNone(self.run_incremental())
+
+    def test_restore_entries_claims_the_saved_rooms(self):
+        self.run_incremental()
+        snapshot = load_run_state(STATE_FILENAME)["departments"]["CSE-3-A"]
+        state = new_global_state(self.departments)
+        sched = Scheduler("slots.csv", "cse3.csv", "rooms.csv", dept_name="CSE-3-A", **state)
+        sched.restore_entries(unpack_records(snapshot["entries"], ScheduledEntry))
+        for sheet, day, slot, _, _, _, room in snapshot["entries"]:
+            if room:
+                self.assertFalse(sched._is_room_available(day, [slot], room, sheet_name=sheet))
+
+
+if __name__ == "__main__":
+    unittest.main()
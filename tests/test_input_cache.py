@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+from timetable_automation.inputs import InputCache
+from timetable_automation.main import Scheduler, parse_courses, parse_rooms, parse_slots
+
+
+class TestInputCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        pd.DataFrame(
+            [{"Start_Time": "09:00", "End_Time": "10:00"}, {"Start_Time": "10:00", "End_Time": "11:00"}]
+        ).to_csv(self.root / "slots.csv", index=False)
+        pd.DataFrame(
+            [{"Course_Code": "CS101", "Course_Title": "Intro", "Faculty": "Prof X", "L-T-P-S-C": "1-0-0-0-1", "Semester_Half": "1", "Elective": "0"}]
+        ).to_csv(self.root / "courses.csv", index=False)
+        pd.DataFrame([{"Room_ID": "C101", "Capacity": 60}, {"Room_ID": "L1", "Capacity": 40}]).to_csv(
+            self.root / "rooms.csv", index=False
+        )
+        self.files = [str(self.root / name) for name in ("slots.csv", "courses.csv", "rooms.csv")]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_each_file_parsed_once_across_schedulers(self):
+        cache = InputCache()
+        with mock.patch.object(pd, "read_csv", wraps=pd.read_csv) as read_csv:
+            first = Scheduler(*self.files, {}, input_cache=cache)
+            second = Scheduler(*self.files, {}, input_cache=cache)
+        self.assertEqual(read_csv.call_count, 3)
+        self.assertEqual(first.slots, ["09:00-10:00", "10:00-11:00"])
+        self.assertEqual(first.classrooms, ["C101"])
+        self.assertEqual(first.labs, ["L1"])
+        self.assertEqual(first.room_capacity, {"C101": 60, "L1": 40})
+        self.assertIs(first.courses[0], second.courses[0])
+        self.assertIsNot(first.courses, second.courses)
+        self.assertIsInstance(cache.parsed(self.files[0], parse_slots), tuple)
+
+    def test_changed_file_is_reparsed(self):
+        cache = InputCache()
+        path = self.files[1]
+        self.assertEqual([c.code for c in cache.parsed(path, parse_courses)], ["CS101"])
+        pd.DataFrame(
+            [{"Course_Code": "CS102", "Course_Title": "Next", "Faculty": "Prof Y", "L-T-P-S-C": "1-0-0-0-1", "Semester_Half": "1", "Elective": "0"}]
+        ).to_csv(path, index=False)
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        self.assertEqual([c.code for c in cache.parsed(path, parse_courses)], ["CS102"])
+        self.assertEqual(cache.parses, 2)
+
+    def test_disk_cache_skips_pandas_on_repeat_run(self):
+        cache_dir = str(self.root / "cache")
+        InputCache(cache_dir).parsed(self.files[2], parse_rooms)
+        self.assertTrue(os.listdir(cache_dir))
+
+        warm = InputCache(cache_dir)
+        with mock.patch.object(pd, "read_csv", side_effect=AssertionError("parsed again")):
+            rooms = warm.parsed(self.files[2], parse_rooms)
+        self.assertEqual(rooms, (("C101", 60), ("L1", 40)))
+        self.assertEqual((warm.parses, warm.disk_hits), (0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
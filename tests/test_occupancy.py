@@ -0,0 +1,36 @@
+import unittest
+from timetable_automation.occupancy import OccupancyIndex, scope_for_sheet
+
+
+class TestOccupancyIndex(unittest.TestCase):
+    def setUp(self):
+        self.occ = OccupancyIndex(["09:00-10:00", "10:00-11:00", "11:00-12:00"])
+
+    def test_contiguous_block_free_check(self):
+        mask = self.occ.mask_for(["09:00-10:00", "10:00-11:00"])
+        self.assertTrue(self.occ.is_free("room", "First_Half", "C101", "Monday", mask))
+        self.occ.occupy("room", "First_Half", "C101", "Monday", self.occ.bit("10:00-11:00"))
+        self.assertFalse(self.occ.is_free("room", "First_Half", "C101", "Monday", mask))
+        # Halves are independent namespaces.
+        self.assertTrue(self.occ.is_free("room", "Second_Half", "C101", "Monday", mask))
+        self.occ.release("room", "First_Half", "C101", "Monday", self.occ.bit("10:00-11:00"))
+        self.assertTrue(self.occ.is_free("room", "First_Half", "C101", "Monday", mask))
+
+    def test_load_legacy_room_usage(self):
+        usage = {
+            "Monday": {"09:00-10:00": ["C101"]},
+            "First_Half": {"Tuesday": {"11:00-12:00": ["C102"]}},
+            "MAPPING": {"CS101": "C101"},
+        }
+        self.occ.load_room_usage(usage)
+        self.assertEqual(self.occ.slots_in(self.occ.busy("room", "", "C101", "Monday")), ["09:00-10:00"])
+        self.assertEqual(self.occ.slots_in(self.occ.busy("room", "First_Half", "C102", "Tuesday")), ["11:00-12:00"])
+        self.assertEqual(self.occ.keys("room"), ["C101", "C102"])
+
+    def test_scope_for_sheet(self):
+        self.assertEqual(scope_for_sheet("Second_Half"), "Second_Half")
+        self.assertEqual(scope_for_sheet("TestSheet"), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from timetable_automation.faculty import FacultyCalendar
+from timetable_automation.portfolio import RunScore, format_portfolio_report, run_portfolio, score_key
+
+
+class _FakeScheduler:
+    def __init__(self, entries, unscheduled=()):
+        self.scheduled_entries = entries
+        self.unscheduled_courses = list(unscheduled)
+        self.slot_durations = {"09:00-10:00": 1.0, "10:00-11:30": 1.5, "11:30-13:00": 1.5, "14:00-15:30": 1.5}
+        self.faculty_calendar = FacultyCalendar()
+        for ent in entries:
+            mask = self.faculty_calendar.occupancy.bit(ent["slot"])
+            self.faculty_calendar.claim(("CSE", ent["sheet"]), ent["faculty"], ent["sheet"], ent["day"], mask)
+
+
+def entry(slot, code, faculty, room, day="Monday"):
+    return {"sheet": "First_Half", "day": day, "slot": slot, "code": code, "display": code, "faculty": faculty, "room": room}
+
+
+class TestPortfolio(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        root = Path(self.tmp.name)
+        pd.DataFrame(
+            [{"Start_Time": f"{h:02d}:00", "End_Time": f"{h + 1:02d}:00"} for h in range(9, 17)]
+        ).to_csv(root / "slots.csv", index=False)
+        pd.DataFrame(
+            [
+                {"Course_Code": "CS101", "Course_Title": "Intro", "Faculty": "Prof X", "L-T-P-S-C": "3-1-2-0-4", "Semester_Half": "0", "Elective": "0"},
+                {"Course_Code": "CS102", "Course_Title": "Data", "Faculty": "Prof Y", "L-T-P-S-C": "2-0-0-0-2", "Semester_Half": "1", "Elective": "0"},
+            ]
+        ).to_csv(root / "courses.csv", index=False)
+        pd.DataFrame([{"Room_ID": "C101", "Capacity": 90}, {"Room_ID": "L101", "Capacity": 40}]).to_csv(
+            root / "rooms.csv", index=False
+        )
+        os.chdir(root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_score_counts_churn_and_overload(self):
+        score = RunScore()
+        score.add_department(
+            "CSE",
+            _FakeScheduler(
+                [
+                    entry("09:00-10:00", "CS101", "Prof X", "C101"),
+                    entry("10:00-11:30", "CS101", "Prof X / Prof Y", "C102"),
+                    entry("11:30-13:00", "CS102", "Prof X", "C101"),
+                    entry("14:00-15:30", "CS102", "Prof X", ""),
+                ],
+                [{"remaining_hours": 1.5}],
+            ),
+        )
+        result = score.as_dict()
+        self.assertEqual(result["unscheduled_hours"], 1.5)
+        self.assertEqual(result["room_churn"], 1)
+        self.assertEqual(result["faculty_overload"], 1.5)
+
+    def test_ties_go_to_the_earlier_seed(self):
+        zero = {"unscheduled_hours": 0, "room_churn": 0, "faculty_overload": 0}
+        runs = [{"index": 1, "score": zero}, {"index": 0, "score": zero}, {"index": 2, "score": dict(zero, unscheduled_hours=-1)}]
+        self.assertEqual([r["index"] for r in sorted(runs, key=score_key)], [2, 0, 1])
+
+    def test_best_run_outputs_are_copied(self):
+        report = run_portfolio({"CSE": "courses.csv"}, "rooms.csv", "slots.csv", seeds=3, root_seed=7)
+        best = min(report["runs"], key=score_key)
+        self.assertEqual(report["best_seed"], best["seed"])
+        self.assertTrue(os.path.exists("CSE_timetable.xlsx"))
+        self.assertTrue(os.path.exists("faculty_timetable.xlsx"))
+        self.assertFalse([p for p in os.listdir(".") if p.startswith(".portfolio-")])
+        run_seeds = [r["seed"] for r in report["runs"]]
+        self.assertEqual(sorted(run_seeds + report["skipped_seeds"]), [7, 8, 9])
+        self.assertIn("Portfolio results:", format_portfolio_report(report))
+
+    def test_zero_time_budget_runs_a_single_seed(self):
+        report = run_portfolio({"CSE": "courses.csv"}, "rooms.csv", "slots.csv", seeds=4, time_budget=1e-9)
+        self.assertEqual(len(report["runs"]), 1)
+        self.assertEqual(len(report["skipped_seeds"]), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
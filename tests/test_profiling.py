@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+from timetable_automation.main import Scheduler, generate_all_departments
+from timetable_automation.profiling import HOT_PATHS, PROFILE_ENV, PROFILE_FILENAME
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        root = Path(self.tmp.name)
+        pd.DataFrame(
+            [{"Start_Time": f"{h:02d}:00", "End_Time": f"{h + 1:02d}:00"} for h in range(9, 17)]
+        ).to_csv(root / "slots.csv", index=False)
+        pd.DataFrame(
+            [
+                {"Course_Code": "CS101", "Course_Title": "Intro", "Faculty": "Prof X", "L-T-P-S-C": "3-1-2-0-4", "Semester_Half": "0", "Elective": "0"},
+                {"Course_Code": "CS102", "Course_Title": "Data", "Faculty": "Prof Y", "L-T-P-S-C": "2-0-0-0-2", "Semester_Half": "1", "Elective": "0"},
+            ]
+        ).to_csv(root / "courses.csv", index=False)
+        pd.DataFrame([{"Room_ID": "C101", "Capacity": 90}, {"Room_ID": "L101", "Capacity": 40}]).to_csv(
+            root / "rooms.csv", index=False
+        )
+        os.chdir(root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_disabled_scheduler_is_not_wrapped(self):
+        with mock.patch.dict(os.environ, {PROFILE_ENV: ""}):
+            sched = Scheduler("slots.csv", "courses.csv", "rooms.csv", {}, dept_name="CSE")
+        self.assertIsNone(sched.profiler)
+        for name in HOT_PATHS:
+            self.assertNotIn(name, vars(sched))
+
+    def test_env_var_dumps_profile_next_to_outputs(self):
+        with mock.patch.dict(os.environ, {PROFILE_ENV: "1"}):
+            sched = Scheduler("slots.csv", "courses.csv", "rooms.csv", {}, dept_name="CSE")
+            sched.run_all_outputs("CSE")
+        with open("CSE_profile.json") as fh:
+            profile = json.load(fh)
+        hot = profile["hot_paths"]
+        self.assertGreater(hot["_allocate_session[search]"]["calls"], 0)
+        self.assertGreater(hot["_free_windows"]["calls"], 0)
+        self.assertGreater(hot["_pick_room_for_slots"]["calls"], 0)
+        self.assertEqual(hot["_write_student_workbook"]["calls"], 1)
+        self.assertEqual(hot["_generate_faculty_workbook"]["calls"], 1)
+        sessions = {(a["course"], a["session"]) for a in profile["attempts"]["courses"]}
+        self.assertTrue({("CS101", "L"), ("CS101", "T"), ("CS101", "P"), ("CS102", "L")} <= sessions)
+        self.assertEqual(profile["attempts"]["total"], sum(a["attempts"] for a in profile["attempts"]["courses"]))
+
+    def test_driver_shares_one_profiler(self):
+        with mock.patch.dict(os.environ, {PROFILE_ENV: ""}):
+            generate_all_departments(
+                {"CSE-1": "courses.csv", "CSE-3": "courses.csv"},
+                rooms_file="rooms.csv",
+                slots_file="slots.csv",
+                profile=True,
+            )
+        self.assertFalse(os.path.exists("CSE-1_profile.json"))
+        with open(PROFILE_FILENAME) as fh:
+            profile = json.load(fh)
+        self.assertEqual(profile["hot_paths"]["_write_student_workbook"]["calls"], 2)
+        self.assertEqual(profile["hot_paths"]["_generate_faculty_workbook"]["calls"], 1)
+        self.assertEqual({a["department"] for a in profile["attempts"]["courses"]}, {"CSE-1", "CSE-3"})
+
+
+if __name__ == "__main__":
+    unittest.main()
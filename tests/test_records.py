@@ -0,0 +1,72 @@
+import copy
+import pickle
+import unittest
+
+import pandas as pd
+
+from timetable_automation.benchmark import record_memory
+from timetable_automation.entries import EntryStore
+from timetable_automation.main import Course
+from timetable_automation.records import ScheduledEntry, UnscheduledCourse
+
+
+def entry(**overrides):
+    fields = dict(sheet="First_Half", day="Monday", slot="09:00-10:00", code="CS101",
+                  display="CS101 (C101)", faculty="Prof X", room="C101")
+    fields.update(overrides)
+    return ScheduledEntry(**fields)
+
+
+class TestRecords(unittest.TestCase):
+    def test_dict_compatible_access(self):
+        ent = entry()
+        self.assertEqual(ent["room"], "C101")
+        self.assertEqual(ent.get("room", ""), "C101")
+        self.assertIsNone(ent.get("missing"))
+        self.assertIn("display", ent)
+        self.assertNotIn("get", ent)
+        with self.assertRaises(KeyError):
+            ent["get"]
+        ent["room"] = "C102"
+        self.assertEqual(ent.room, "C102")
+        with self.assertRaises(KeyError):
+            ent["extra"] = 1
+        self.assertEqual(dict(ent)["room"], "C102")
+        self.assertEqual(ent, dict(ent))
+        self.assertFalse(hasattr(ent, "__dict__"))
+
+    def test_constructor_requires_every_field(self):
+        with self.assertRaises(TypeError):
+            ScheduledEntry(sheet="First_Half")
+        with self.assertRaises(TypeError):
+            entry(colour="red")
+
+    def test_frames_pickles_and_store(self):
+        rows = [
+            UnscheduledCourse("First_Half", "CS101", "Intro", "Prof X", "Lecture", 1.5, "1"),
+            UnscheduledCourse("Second_Half", "CS102", "Data", "Prof Y", "Lab", 2, "0"),
+        ]
+        df = pd.DataFrame(rows)
+        self.assertEqual(list(df.columns), list(UnscheduledCourse.__slots__))
+        self.assertEqual(df["remaining_hours"].tolist(), [1.5, 2])
+
+        ent = entry()
+        self.assertEqual(pickle.loads(pickle.dumps(ent)), ent)
+        self.assertEqual(copy.deepcopy(ent), ent)
+
+        store = EntryStore([ent, entry(day="Tuesday", faculty="Prof X / Prof Y")])
+        self.assertTrue(store.has_session("First_Half", "Tuesday", "CS101"))
+        self.assertEqual(len(store.for_faculty("Prof Y")), 1)
+
+    def test_course_has_no_instance_dict(self):
+        course = Course({"Course_Code": "CS101", "L-T-P-S-C": "3-1-0-0-4"})
+        self.assertFalse(hasattr(course, "__dict__"))
+        self.assertEqual((course.L, course.T, course.P), (3, 1, 0))
+
+    def test_records_use_less_memory_than_dicts(self):
+        result = record_memory(2000)
+        self.assertLess(result["record_bytes"], result["dict_bytes"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import random
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+
+import pandas as pd
+
+from timetable_automation.improve import Session
+from timetable_automation.main import Scheduler
+from timetable_automation.repair import LNSRepair
+
+
+class TestLNSRepair(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        root = Path(self.tmp.name)
+        pd.DataFrame(
+            [{"Start_Time": f"{h:02d}:00", "End_Time": f"{h + 1:02d}:00"} for h in range(9, 17)]
+        ).to_csv(root / "slots.csv", index=False)
+        pd.DataFrame(
+            [
+                {"Course_Code": f"CS10{i}", "Course_Title": f"Course {i}", "Faculty": f"Prof {i % 2}", "L-T-P-S-C": ltp, "Semester_Half": "0", "Elective": "0"}
+                for i, ltp in enumerate(["3-1-2-0-4", "3-1-0-0-4", "2-0-2-0-3"])
+            ]
+        ).to_csv(root / "courses.csv", index=False)
+        pd.DataFrame(
+            [{"Room_ID": "C101", "Capacity": 90}, {"Room_ID": "C102", "Capacity": 90}, {"Room_ID": "L101", "Capacity": 40}]
+        ).to_csv(root / "rooms.csv", index=False)
+        os.chdir(root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def scheduler(self, max_attempts=None):
+        sched = Scheduler("slots.csv", "courses.csv", "rooms.csv", {}, dept_name="CSE-1-A", seed=3)
+        if max_attempts is not None:
+            sched.MAX_ATTEMPTS = max_attempts
+        return sched, sched.generate_all_sheets()
+
+    def test_places_every_unscheduled_chunk(self):
+        sched, grids = self.scheduler(max_attempts=0)
+        missing = sum(r["remaining_hours"] for r in sched.unscheduled_courses)
+        stats = LNSRepair([(sched, grids)], time_budget=None, max_iterations=200, rng=random.Random(0)).run()
+        self.assertEqual(stats["initial_hours"], missing)
+        self.assertEqual(stats["remaining_hours"], 0)
+        self.assertEqual(sched.unscheduled_courses, [])
+        rooms = Counter((e["sheet"], e["day"], e["slot"], e["room"]) for e in sched.scheduled_entries)
+        self.assertEqual(max(rooms.values()), 1)
+        labs = Counter({(e["sheet"], e["day"], e["code"]) for e in sched.scheduled_entries if "(Lab" in e["display"]})
+        labs_per_day = Counter((sheet, day) for sheet, day, _ in labs)
+        self.assertEqual(max(labs_per_day.values()), 1)
+        for e in sched.scheduled_entries:
+            self.assertEqual(grids[e["sheet"]].at[e["day"], e["slot"]], e["display"])
+
+    def test_failed_repair_restores_the_neighbourhood(self):
+        sched, grids = self.scheduler()
+        repair = LNSRepair([(sched, grids)], rng=random.Random(0))
+        repair._sync_lists()
+        before = [(s, s.day, s.slots, s.room) for s in repair.sessions]
+        cells = {sheet: list(grid.cells) for sheet, grid in grids.items()}
+        dept = repair.departments[0]
+        target = Session(dept, "First_Half", "CS100", "L", "Prof 0", 100, True, None)
+        repair.sessions.append(target)
+        repair.pending.append(target)
+        for kind in ("section", "faculty", "room"):
+            destroyed = repair._neighbourhood(target, kind)
+            self.assertTrue(all(s.movable for s in destroyed))
+            self.assertFalse(repair._repair(target, destroyed))
+        self.assertEqual([(s, s.day, s.slots, s.room) for s in repair.sessions[:-1]], before)
+        self.assertEqual({sheet: list(grid.cells) for sheet, grid in grids.items()}, cells)
+        self.assertIn(target, repair.pending)
+
+
+if __name__ == "__main__":
+    unittest.main()
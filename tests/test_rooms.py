@@ -0,0 +1,45 @@
+import unittest
+
+from timetable_automation.main import Scheduler
+from timetable_automation.rooms import RoomIndex
+from timetable_automation.symbols import RoomTable
+
+
+class TestRoomIndex(unittest.TestCase):
+    def setUp(self):
+        table = RoomTable(
+            ["C101", "C002", "C004", "C102", "C103", "L105", "L106"],
+            capacity={"C101": 96, "C002": 120, "C004": 240, "C102": 60, "C103": 96, "L105": 40, "L106": 30},
+            compulsory_only={"C002"},
+            non_compulsory_blocked={"C004"},
+        )
+        self.index = RoomIndex(["L105", "L106", "C101", "C002", "C004", "C102", "C103"], table)
+
+    def test_static_filters_and_order(self):
+        self.assertEqual(self.index.candidates(True), ("L106", "L105"))
+        self.assertEqual(self.index.candidates(False), ("C102", "C101", "C103", "C002"))
+        self.assertEqual(self.index.candidates(False, is_compulsory=False), ("C102", "C101", "C103"))
+        self.assertEqual(
+            self.index.candidates(False, is_combined=True), ("C004", "C102", "C101", "C103", "C002")
+        )
+        self.assertEqual(self.index.candidates(False, is_compulsory=False, is_combined=True), ("C102", "C101", "C103"))
+
+    def test_capacity_band(self):
+        self.assertEqual(self.index.candidates(False, min_capacity=96), ("C101", "C103", "C002"))
+        self.assertEqual(self.index.candidates(False, is_combined=True, min_capacity=200), ("C004",))
+        self.assertEqual(self.index.candidates(False, min_capacity=500), ())
+        self.assertIs(self.index.candidates(False, min_capacity=96), self.index.candidates(False, min_capacity=96))
+
+    def test_scheduler_picks_first_free_candidate(self):
+        sched = Scheduler("data/timeslots.csv", "tests/test_data/temp_courses.csv", "data/rooms.csv", {})
+        slot = sched.slots[1]
+        rooms = sched.room_index.candidates(False)
+        self.assertNotIn("C004", rooms)
+        self.assertEqual(sched._pick_room_for_slots("Monday", [slot], "CS101", "L", sheet_name="First_Half"), rooms[0])
+        sched._claim_room("Monday", [slot], rooms[0], "First_Half")
+        self.assertEqual(sched._pick_room_for_slots("Monday", [slot], "CS101", "L", sheet_name="First_Half"), rooms[1])
+        self.assertEqual(sched._pick_room_for_slots("Monday", [slot], "CS101", "L", sheet_name="Second_Half"), rooms[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
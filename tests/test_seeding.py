@@ -0,0 +1,69 @@
+import os
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from timetable_automation.main import generate_all_departments
+from timetable_automation.parallel import generate_all_departments_parallel
+
+
+class TestPerSchedulerSeeding(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        root = Path(self.tmp.name)
+        self.slots_file = str(root / "slots.csv")
+        self.rooms_file = str(root / "rooms.csv")
+        pd.DataFrame(
+            [{"Start_Time": f"{h:02d}:00", "End_Time": f"{h + 1:02d}:00"} for h in range(9, 18)]
+        ).to_csv(self.slots_file, index=False)
+        pd.DataFrame(
+            [{"Room_ID": r, "Capacity": 90} for r in ("C101", "C102")] + [{"Room_ID": "L101", "Capacity": 40}]
+        ).to_csv(self.rooms_file, index=False)
+        # The sections teach in different halves with different faculty, so
+        # they never compete for a room or a lecturer and only the random
+        # stream could make one depend on the other.
+        self.departments = {}
+        for dept, half, faculty in (("CSE-1-A", "1", "Prof A"), ("ECE-3", "2", "Prof E")):
+            path = str(root / f"{dept}.csv")
+            pd.DataFrame(
+                [
+                    {"Course_Code": f"{dept[:2]}{i}01", "Course_Title": "Course", "Faculty": f"{faculty}{i}", "L-T-P-S-C": ltpsc, "Semester_Half": half, "Elective": "0"}
+                    for i, ltpsc in enumerate(("3-1-2-0-4", "2-1-0-0-3", "3-0-0-0-3"))
+                ]
+            ).to_csv(path, index=False)
+            self.departments[dept] = path
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def run_in(self, name, driver, departments, seed=11, **kwargs):
+        out = Path(self.tmp.name) / name
+        out.mkdir()
+        os.chdir(out)
+        try:
+            _, entries = driver(departments, self.rooms_file, self.slots_file, seed=seed, **kwargs)
+        finally:
+            os.chdir(self.cwd)
+        return sorted((e["sheet"], e["day"], e["slot"], e["code"], e["room"]) for e in entries)
+
+    def test_order_and_worker_count_do_not_change_a_timetable(self):
+        expected = self.run_in("forward", generate_all_departments, self.departments)
+        self.assertEqual({row[0] for row in expected}, {"First_Half", "Second_Half"})
+
+        random.seed(123)
+        reordered = dict(reversed(list(self.departments.items())))
+        self.assertEqual(self.run_in("reversed", generate_all_departments, reordered), expected)
+        self.assertEqual(self.run_in("pooled", generate_all_departments_parallel, reordered, workers=2), expected)
+
+    def test_root_seed_changes_the_timetable(self):
+        first = self.run_in("seed11", generate_all_departments, self.departments)
+        self.assertNotEqual(self.run_in("seed12", generate_all_departments, self.departments, seed=12), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
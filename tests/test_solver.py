@@ -0,0 +1,87 @@
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from timetable_automation.main import Scheduler
+
+
+class TestBacktrackingSolver(unittest.TestCase):
+    def setUp(self):
+        self.test_data_dir = Path("tests/test_data")
+        self.slots_file = self.test_data_dir / "solver_slots.csv"
+        self.rooms_file = self.test_data_dir / "solver_rooms.csv"
+        self.courses_file = self.test_data_dir / "solver_courses.csv"
+        self.output_file = self.test_data_dir / "solver_output.xlsx"
+
+        pd.DataFrame(
+            [
+                {"Start_Time": "09:00", "End_Time": "10:00"},
+                {"Start_Time": "10:00", "End_Time": "10:30"},
+                {"Start_Time": "10:30", "End_Time": "10:45"},
+                {"Start_Time": "10:45", "End_Time": "12:00"},
+                {"Start_Time": "12:00", "End_Time": "13:00"},
+                {"Start_Time": "14:00", "End_Time": "15:00"},
+                {"Start_Time": "15:00", "End_Time": "16:00"},
+            ]
+        ).to_csv(self.slots_file, index=False)
+        pd.DataFrame(
+            [
+                {"Room_ID": "C101", "Capacity": 90, "Type": "Classroom"},
+                {"Room_ID": "L101", "Capacity": 45, "Type": "Lab"},
+            ]
+        ).to_csv(self.rooms_file, index=False)
+        pd.DataFrame(
+            [
+                {"Course_Code": "CS101", "Course_Title": "A", "Faculty": "Prof X", "L-T-P-S-C": "3-1-2-0-4", "Semester_Half": "0", "Elective": "0"},
+                {"Course_Code": "CS102", "Course_Title": "B", "Faculty": "Prof X", "L-T-P-S-C": "3-0-2-0-4", "Semester_Half": "0", "Elective": "0"},
+                {"Course_Code": "CS103", "Course_Title": "C", "Faculty": "Prof Y", "L-T-P-S-C": "3-1-0-0-3", "Semester_Half": "0", "Elective": "0"},
+            ]
+        ).to_csv(self.courses_file, index=False)
+
+    def tearDown(self):
+        for f in (self.slots_file, self.rooms_file, self.courses_file, self.output_file):
+            try:
+                Path(f).unlink()
+            except FileNotFoundError:
+                pass
+
+    def test_backtracking_mode_schedules_all_hours_under_hard_rules(self):
+        sched = Scheduler(
+            str(self.slots_file), str(self.courses_file), str(self.rooms_file), {}, solver_mode="backtracking"
+        )
+        with pd.ExcelWriter(self.output_file, engine="openpyxl") as writer:
+            sched.generate_timetable(sched.courses, writer, "First_Half")
+
+        self.assertEqual(sched.unscheduled_courses, [])
+
+        lab_days = {}
+        code_days = {}
+        faculty_slots = set()
+        for ent in sched.scheduled_entries:
+            key = (ent["day"], ent["slot"], ent["faculty"])
+            self.assertNotIn(key, faculty_slots)
+            faculty_slots.add(key)
+            if "(Lab" in ent["display"]:
+                lab_days.setdefault(ent["day"], set()).add(ent["code"])
+            code_days.setdefault(ent["code"], set()).add(ent["day"])
+        for codes in lab_days.values():
+            self.assertEqual(len(codes), 1)
+        # L=3 in 1.5h blocks plus one tutorial and one lab each need distinct days.
+        self.assertEqual(len(code_days["CS101"]), 4)
+        self.assertEqual(len(code_days["CS102"]), 3)
+
+    def test_budget_exhaustion_still_records_unscheduled_hours(self):
+        sched = Scheduler(
+            str(self.slots_file), str(self.courses_file), str(self.rooms_file), {}, solver_mode="backtracking"
+        )
+        sched.solver_node_limit = 0
+        sched.days = ["Monday"]
+        with pd.ExcelWriter(self.output_file, engine="openpyxl") as writer:
+            sched.generate_timetable(sched.courses, writer, "First_Half")
+        self.assertTrue(sched.unscheduled_courses)
+        self.assertTrue(all(r["remaining_hours"] > 0 for r in sched.unscheduled_courses))
+
+
+if __name__ == "__main__":
+    unittest.main()
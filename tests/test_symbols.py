@@ -0,0 +1,58 @@
+import unittest
+
+from timetable_automation.entries import split_faculty
+from timetable_automation.main import Scheduler
+from timetable_automation.symbols import RoomTable, SymbolTable
+
+
+class TestSymbolTables(unittest.TestCase):
+    def test_dense_ids_for_normalised_names(self):
+        table = SymbolTable(["CS101", " cs101 ", "MA102"])
+        self.assertEqual(table.names, ["CS101", "MA102"])
+        self.assertEqual(table.id("cs101"), 0)
+        self.assertEqual(table.id("ma102 "), 1)
+        self.assertEqual(table.id("EE200"), 2)
+        self.assertEqual(table.key(" ee200"), "EE200")
+        self.assertIn("Ma102", table)
+        self.assertEqual(len(table), 3)
+
+    def test_room_profiles(self):
+        rooms = RoomTable(
+            ["C002", "C004", "C101", "L105"],
+            capacity={"C002": 120, "C004": 240, "C101": 96, "L105": 40},
+            compulsory_only={"C002"},
+            non_compulsory_blocked={"C004"},
+        )
+        self.assertTrue(rooms.profile(" c004").is_c004)
+        self.assertTrue(rooms.profile("C004").non_compulsory_blocked)
+        self.assertTrue(rooms.profile("C002").compulsory_only)
+        self.assertTrue(rooms.profile("l105").is_lab)
+        self.assertEqual(rooms.profile("C101").capacity, 96)
+        self.assertEqual(rooms.profile("C999").capacity, 0)
+        self.assertEqual(rooms.id("C999"), 4)
+
+    def test_split_faculty_is_shared(self):
+        names = split_faculty("Dr. A / Dr. B")
+        self.assertEqual(names, ("Dr. A", "Dr. B"))
+        self.assertIs(split_faculty("Dr. A / Dr. B"), names)
+        self.assertEqual(split_faculty(""), ())
+
+    def test_scheduler_room_checks(self):
+        sched = Scheduler("tests/test_data/temp_slots.csv", "tests/test_data/temp_courses.csv", "tests/test_data/temp_rooms.csv", {})
+        sched.room_symbols = RoomTable(
+            ["C004", "C002", "L1"],
+            capacity={"C004": 240, "C002": 120},
+            compulsory_only=sched.compulsory_only_classrooms,
+            non_compulsory_blocked=sched.non_compulsory_blocked_classrooms,
+        )
+        self.assertFalse(sched._room_allowed_for_course(" c004 ", True))
+        self.assertTrue(sched._room_allowed_for_course("C004", True, is_combined_course=True))
+        self.assertFalse(sched._room_allowed_for_course("C002", False))
+        self.assertTrue(sched._room_has_capacity("c004", 200))
+        self.assertFalse(sched._room_has_capacity("C002", 200))
+        self.assertTrue(sched._room_matches_session("L1", "P"))
+        self.assertFalse(sched._room_matches_session("L1", "L"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,3 @@
+from timetable_automation.cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,219 @@
+"""Benchmark harness on synthetic institutes.
+
+For each requested size a synthetic data tree is generated (see
+``synthetic.generate_institute``), every section is scheduled with the
+sequential driver and the exam scheduler is run on the matching exam
+catalogues.  Wall-clock seconds are recorded separately for
+``Scheduler.generate_timetable``, ``Scheduler.run_all_outputs``, the combined
+faculty workbook, ``ExamScheduler.generate`` and ``ExamScheduler.export``,
+together with the share of required teaching hours left unscheduled.
+
+    PYTHONPATH=. python -m timetable_automation.benchmark --sections 13 50 200
+"""
+
+import contextlib
+import datetime
+import glob
+import io
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from timetable_automation.exam import ExamScheduler
+from timetable_automation.main import generate_all_departments, parse_courses
+from timetable_automation.records import ScheduledEntry
+from timetable_automation.synthetic import generate_institute
+
+
+def required_hours(course_files):
+    # Teaching hours generate_timetable has to place: every non-elective once
+    # per sheet it belongs to, plus one placeholder per elective basket.
+    total = 0.0
+    for path in course_files:
+        courses = list(parse_courses(pd.read_csv(path)))
+        for halves in (("1", "0"), ("2", "0")):
+            in_sheet = [c for c in courses if c.semester_half in halves]
+            baskets = {}
+            for c in in_sheet:
+                if c.is_elective:
+                    baskets[c.basket] = max(baskets.get(c.basket, 0), c.L + c.T + c.P)
+                else:
+                    total += c.L + c.T + c.P
+            total += sum(baskets.values())
+    return total
+
+
+def unscheduled_hours(out_dir):
+    total = 0.0
+    for path in glob.glob(os.path.join(out_dir, "*_unscheduled_courses.xlsx")):
+        total += float(pd.read_excel(path)["remaining_hours"].sum())
+    return total
+
+
+def run_benchmark(sections=13, workdir=None, seed=42, solver_mode="greedy", verbose=False, **generator_options):
+    """Generate, schedule and export one synthetic institute; return a result dict."""
+    workdir = workdir or tempfile.mkdtemp(prefix="timetable-bench-")
+    data_dir = os.path.join(workdir, "data")
+    out_dir = os.path.join(workdir, "out")
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = generate_institute(data_dir, sections=sections, seed=seed, **generator_options)
+    departments = manifest["departments"]
+
+    cwd = os.getcwd()
+    log = None if verbose else io.StringIO()
+    phases = {}
+    try:
+        os.chdir(out_dir)
+        with contextlib.redirect_stdout(log) if log is not None else contextlib.nullcontext():
+            timings = {}
+            start = time.perf_counter()
+            generate_all_departments(
+                departments,
+                rooms_file=manifest["rooms"],
+                slots_file=manifest["slots"],
+                solver_mode=solver_mode,
+                seed=seed,
+                timings=timings,
+            )
+            phases["timetables_total"] = time.perf_counter() - start
+            phases["generate_timetable"] = timings["phases"]["timetables"]
+            phases["run_all_outputs"] = sum(d["run_all_outputs"] for d in timings["departments"].values())
+            phases["faculty_export"] = timings["phases"]["faculty_export"]
+
+            exam = ExamScheduler(manifest["exam_rooms"], manifest["exam_departments"], manifest["exam_faculty"])
+            start = time.perf_counter()
+            exam.generate()
+            phases["exam_generate"] = time.perf_counter() - start
+            start = time.perf_counter()
+            exam.export()
+            phases["exam_export"] = time.perf_counter() - start
+    finally:
+        os.chdir(cwd)
+
+    need = required_hours(departments.values())
+    missing = unscheduled_hours(out_dir)
+    return {
+        "sections": sections,
+        "seed": seed,
+        "solver_mode": solver_mode,
+        "generator": dict(generator_options),
+        "courses": sum(len(parse_courses(pd.read_csv(p))) for p in departments.values()),
+        "timings": phases,
+        "required_hours": need,
+        "unscheduled_hours": missing,
+        "unscheduled_ratio": (missing / need) if need else 0.0,
+        "exams_scheduled": len(exam.scheduled),
+        "exams_unscheduled": len(exam.unscheduled),
+        "workdir": workdir,
+    }
+
+
+def _allocated_bytes(build):
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def record_memory(entries=100000):
+    """Bytes held by ``entries`` scheduled entries as dicts vs ScheduledEntry records."""
+    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+    slots = [f"{h:02d}:00-{h + 1:02d}:00" for h in range(9, 18)]
+    fields = [
+        ("First_Half" if i % 2 else "Second_Half", days[i % 5], slots[i % 9], f"CS{i % 400:03d}",
+         f"CS{i % 400:03d} (C{i % 30:03d})", f"Dr. Faculty {i % 150:03d}", f"C{i % 30:03d}")
+        for i in range(entries)
+    ]
+    names = ScheduledEntry.__slots__
+    as_dicts = _allocated_bytes(lambda: [dict(zip(names, f)) for f in fields])
+    as_records = _allocated_bytes(lambda: [ScheduledEntry(*f) for f in fields])
+    return {
+        "entries": entries,
+        "dict_bytes": as_dicts,
+        "record_bytes": as_records,
+        "saving": 1 - as_records / as_dicts if as_dicts else 0.0,
+    }
+
+
+def run_suite(section_counts, output=None, **options):
+    runs = []
+    for count in section_counts:
+        result = run_benchmark(sections=count, **options)
+        runs.append(result)
+        t = result["timings"]
+        print(
+            f"{count:>4} sections: generate_timetable {t['generate_timetable']:.2f}s, "
+            f"run_all_outputs {t['run_all_outputs']:.2f}s, exam {t['exam_generate'] + t['exam_export']:.2f}s, "
+            f"unscheduled {result['unscheduled_ratio']:.1%}"
+        )
+    report = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": runs,
+    }
+    if output:
+        with open(output, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"Benchmark results written to {output}")
+    return report
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the schedulers on synthetic institutes.")
+    parser.add_argument("--sections", type=int, nargs="+", default=[13])
+    parser.add_argument("--departments", type=int, default=3)
+    parser.add_argument("--courses-per-section", type=int, default=6)
+    parser.add_argument("--elective-baskets", type=int, default=2)
+    parser.add_argument("--combined-courses", type=int, default=2)
+    parser.add_argument("--rooms", type=int, default=24)
+    parser.add_argument("--labs", type=int, default=12)
+    parser.add_argument("--slots", type=int, default=9)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--solver", choices=["greedy", "backtracking"], default="greedy")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--verbose", action="store_true", help="Show the schedulers' own output.")
+    parser.add_argument(
+        "--memory",
+        type=int,
+        metavar="N",
+        help="Only compare the memory of N scheduled entries held as dicts vs records.",
+    )
+    args = parser.parse_args(argv)
+    if args.memory:
+        result = record_memory(args.memory)
+        print(
+            f"{result['entries']} entries: dicts {result['dict_bytes'] / 1e6:.1f} MB, "
+            f"records {result['record_bytes'] / 1e6:.1f} MB ({result['saving']:.0%} less)"
+        )
+        return result
+    return run_suite(
+        args.sections,
+        output=args.output,
+        seed=args.seed,
+        solver_mode=args.solver,
+        verbose=args.verbose,
+        departments=args.departments,
+        courses_per_section=args.courses_per_section,
+        elective_baskets=args.elective_baskets,
+        combined_courses=args.combined_courses,
+        rooms=args.rooms,
+        labs=args.labs,
+        slots=args.slots,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""Command-line entry point: ``python -m timetable_automation <command>``.
+
+    generate  department timetables and the combined faculty timetable
+    exam      exam timetable and invigilation duty
+    bench     benchmarks on synthetic institutes (benchmark.py's options)
+    validate  check the config and the headers of every input file
+
+``generate``, ``exam`` and ``validate`` read ``--config FILE`` (see
+config.py) and fall back to the built-in data/ layout without one.  pandas,
+openpyxl and the schedulers are only imported inside the commands, so
+``--help`` and ``validate`` start without them.
+"""
+
+import argparse
+import os
+import sys
+
+from timetable_automation.config import ConfigError, load_config, scheduler_options, validate_config
+from timetable_automation.runstate import CHECKPOINT_FILENAME, STATE_FILENAME
+
+
+def _absolute(config):
+    # The run may chdir into output_dir; pin every input path first.
+    config["departments"] = {name: os.path.abspath(p) for name, p in config["departments"].items()}
+    config["rooms"] = os.path.abspath(config["rooms"])
+    config["slots"] = os.path.abspath(config["slots"])
+    exam = config["exam"]
+    exam["departments"] = {name: os.path.abspath(p) for name, p in exam["departments"].items()}
+    exam["rooms"] = os.path.abspath(exam["rooms"])
+    exam["faculty"] = os.path.abspath(exam["faculty"])
+    return config
+
+
+def _enter_output_dir(path):
+    path = os.path.abspath(path)
+    os.makedirs(path, exist_ok=True)
+    os.chdir(path)
+
+
+def cmd_generate(args, config):
+    from timetable_automation.inputs import configure_input_cache
+    from timetable_automation.main import format_timing_report, generate_all_departments
+
+    configure_input_cache(args.cache_dir or None)
+    departments, rooms_file, slots_file = config["departments"], config["rooms"], config["slots"]
+    options = scheduler_options(config)
+    seed = config["seed"] if args.seed is None else args.seed
+    seeds = config["seeds"] if args.portfolio is None else args.portfolio
+    _enter_output_dir(args.output_dir or config["output_dir"])
+
+    if seeds > 0:
+        from timetable_automation.portfolio import format_portfolio_report, run_portfolio
+
+        report = run_portfolio(
+            departments,
+            rooms_file,
+            slots_file,
+            seeds=seeds,
+            workers=max(args.workers, 1),
+            root_seed=seed,
+            time_budget=args.time_budget,
+            solver_mode=args.solver,
+            improve=args.improve,
+            repair=args.repair,
+            scheduler_options=options,
+        )
+        print(format_portfolio_report(report))
+        return 0
+
+    if args.incremental:
+        from timetable_automation.incremental import format_incremental_report, incremental_run
+
+        plan = incremental_run(
+            departments,
+            rooms_file,
+            slots_file,
+            state_file=args.state_file or STATE_FILENAME,
+            solver_mode=args.solver,
+            seed=seed,
+            scheduler_options=options,
+        )
+        print(format_incremental_report(plan))
+        return 0
+
+    timings = {}
+    if args.workers > 0:
+        from timetable_automation.parallel import generate_all_departments_parallel
+
+        generate_all_departments_parallel(
+            departments,
+            rooms_file,
+            slots_file,
+            workers=args.workers,
+            seed=seed,
+            solver_mode=args.solver,
+            timings=timings,
+            profile=args.profile or None,
+            scheduler_options=options,
+        )
+    else:
+        generate_all_departments(
+            departments,
+            rooms_file=rooms_file,
+            slots_file=slots_file,
+            solver_mode=args.solver,
+            seed=seed,
+            defer_faculty_export=not args.eager_faculty_export,
+            timings=timings,
+            profile=args.profile or None,
+            improve=args.improve,
+            repair=args.repair,
+            state_file=args.state_file,
+            checkpoint_file=args.checkpoint or (CHECKPOINT_FILENAME if args.resume else None),
+            resume=args.resume,
+            scheduler_options=options,
+        )
+    print(format_timing_report(timings))
+    return 0
+
+
+# Options each generate mode does not support; passing one is an error
+# rather than being silently ignored.
+UNSUPPORTED = {
+    "--portfolio": ("--state-file", "--checkpoint", "--resume", "--eager-faculty-export", "--incremental"),
+    "--incremental": ("--improve", "--repair", "--checkpoint", "--resume", "--eager-faculty-export", "--workers"),
+    "--workers": ("--improve", "--repair", "--state-file", "--checkpoint", "--resume", "--eager-faculty-export"),
+}
+
+
+def _given(args, option):
+    value = getattr(args, option.lstrip("-").replace("-", "_"))
+    if option == "--workers":
+        return value > 0
+    return value not in (None, False)
+
+
+def check_generate_options(parser, args, config):
+    seeds = config["seeds"] if args.portfolio is None else args.portfolio
+    if seeds > 0:
+        mode = "--portfolio"
+    elif args.incremental:
+        mode = "--incremental"
+    elif args.workers > 0:
+        mode = "--workers"
+    else:
+        mode = None
+    if mode is not None:
+        for option in UNSUPPORTED[mode]:
+            if _given(args, option):
+                parser.error(f"{option} cannot be combined with {mode}")
+    elif _given(args, "--time-budget"):
+        parser.error("--time-budget only applies to --portfolio")
+    elif (_given(args, "--checkpoint") or _given(args, "--resume")) and (args.improve or args.repair):
+        parser.error("--checkpoint and --resume cannot be combined with --improve or --repair")
+
+
+def cmd_exam(args, config):
+    from timetable_automation.exam import ExamScheduler
+
+    exam = config["exam"]
+    _enter_output_dir(args.output_dir or config["output_dir"])
+    scheduler = ExamScheduler(exam["rooms"], exam["departments"], exam["faculty"], start_date=exam["start_date"])
+    scheduler.generate()
+    scheduler.export()
+    return 0
+
+
+def cmd_bench(args, extra):
+    from timetable_automation.benchmark import main as bench_main
+
+    bench_main(extra)
+    return 0
+
+
+def cmd_validate(args, config):
+    problems = validate_config(config)
+    for problem in problems:
+        print(f"error: {problem}")
+    if problems:
+        print(f"{len(problems)} problem(s) found.")
+        return 1
+    print(
+        f"Config OK: {len(config['departments'])} departments, {len(config['days'])} days,"
+        f" {len(config['exam']['departments'])} exam groups."
+    )
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="timetable", description="Timetable and exam scheduling.")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+
+    def with_config(sub):
+        sub.add_argument("--config", help="JSON, TOML or YAML run configuration (default: built-in data/ layout).")
+        return sub
+
+    gen = with_config(commands.add_parser("generate", help="Generate department and faculty timetables."))
+    gen.add_argument("--solver", choices=["greedy", "backtracking"], default="greedy")
+    gen.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Use the parallel driver with this many worker processes (0 keeps the sequential run).",
+    )
+    gen.add_argument("--seed", type=int, default=None, help="Root seed (overrides the config's seed).")
+    gen.add_argument(
+        "--portfolio",
+        type=int,
+        default=None,
+        help="Run the whole pipeline under this many seeds and keep the best result (overrides the config's seeds).",
+    )
+    gen.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        help="Seconds after which the portfolio starts no further seeds.",
+    )
+    gen.add_argument(
+        "--eager-faculty-export",
+        action="store_true",
+        help="Rewrite the faculty workbook after every department (legacy behaviour).",
+    )
+    gen.add_argument(
+        "--profile",
+        action="store_true",
+        help="Count and time the scheduler hot paths (also TIMETABLE_PROFILE=1).",
+    )
+    gen.add_argument(
+        "--improve",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Spend this long improving the finished timetables with local search before exporting.",
+    )
+    gen.add_argument(
+        "--repair",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Spend up to this long placing unscheduled courses with LNS repair before exporting.",
+    )
+    gen.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Re-solve only the departments affected by course changes since the saved state.",
+    )
+    gen.add_argument(
+        "--state-file",
+        nargs="?",
+        const=STATE_FILENAME,
+        default=None,
+        metavar="PATH",
+        help=f"Save the solved state for later --incremental runs (default PATH: {STATE_FILENAME});"
+        " --incremental always reads and rewrites it.",
+    )
+    gen.add_argument(
+        "--checkpoint",
+        nargs="?",
+        const=CHECKPOINT_FILENAME,
+        default=None,
+        metavar="PATH",
+        help=f"Rewrite a checkpoint after every finished department (default PATH: {CHECKPOINT_FILENAME}).",
+    )
+    gen.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted sequential run from its checkpoint (--checkpoint's PATH or the default).",
+    )
+    gen.add_argument(
+        "--cache-dir",
+        default=".timetable_cache",
+        help="Directory for the parsed-input cache (empty string keeps it in memory only).",
+    )
+    gen.add_argument("--output-dir", help="Write the workbooks here (overrides the config's output_dir).")
+
+    exam = with_config(commands.add_parser("exam", help="Generate the exam timetable and invigilation duty."))
+    exam.add_argument("--output-dir", help="Write the workbooks here (overrides the config's output_dir).")
+
+    commands.add_parser(
+        "bench",
+        help="Benchmark on synthetic institutes; the remaining options go to the benchmark (try bench --help).",
+        add_help=False,
+    )
+
+    with_config(commands.add_parser("validate", help="Check the config and the input files' columns."))
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    if args.command == "bench":
+        return cmd_bench(args, extra)
+    if extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    try:
+        config = _absolute(load_config(args.config))
+    except ConfigError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    if args.command == "validate":
+        return cmd_validate(args, config)
+    problems = validate_config(config, exam=args.command == "exam")
+    if problems:
+        for problem in problems:
+            print(f"error: {problem}", file=sys.stderr)
+        return 2
+    if args.command == "exam":
+        return cmd_exam(args, config)
+    check_generate_options(parser, args, config)
+    return cmd_generate(args, config)
@@ -0,0 +1,280 @@
+"""Run configuration for the command-line entry point.
+
+A config file (JSON, TOML or YAML, picked by extension) overrides any of the
+built-in defaults below:
+
+    departments     {section name: course CSV}
+    rooms, slots    rooms and time-slot CSVs
+    days            teaching days, in order
+    excluded_slots  slots never used for teaching
+    policies        compulsory_only_rooms (e.g. C002/C003) and
+                    combined_only_rooms (e.g. C004)
+    seed, seeds     root seed and the number of portfolio seeds (0 = one run)
+    output_dir      where the workbooks are written
+    exam            departments, rooms, faculty and start_date for the exam
+                    scheduler
+
+Relative paths in a file are taken relative to that file.  Nothing here
+imports pandas or openpyxl; ``validate_config`` reads only CSV headers.
+"""
+
+import copy
+import csv
+import json
+import os
+import re
+
+DEFAULT_DEPARTMENTS = {
+    "CSE-3-A": "data/coursesCSEA-III.csv",
+    "CSE-3-B": "data/coursesCSEB-III.csv",
+    "CSE-1-A": "data/coursesCSEA-I.csv",
+    "CSE-1-B": "data/coursesCSEB-I.csv",
+    "CSE-5-A": "data/coursesCSEA-V.csv",
+    "CSE-5-B": "data/coursesCSEB-V.csv",
+    "7-SEM": "data/courses7.csv",
+    "DSAI-3": "data/coursesDSAI-III.csv",
+    "ECE-3": "data/coursesECE-III.csv",
+    "DSAI-1": "data/coursesDSAI-I.csv",
+    "ECE-1": "data/coursesECE-I.csv",
+    "DSAI-5": "data/coursesDSAI-V.csv",
+    "ECE-5": "data/coursesECE-V.csv",
+}
+DEFAULT_ROOMS_FILE = "data/rooms.csv"
+DEFAULT_SLOTS_FILE = "data/timeslots.csv"
+DEFAULT_DAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday")
+DEFAULT_EXCLUDED_SLOTS = ("07:30-09:00", "13:15-14:00")
+DEFAULT_COMPULSORY_ONLY_ROOMS = ("C002", "C003")
+DEFAULT_COMBINED_ONLY_ROOMS = ("C004",)
+DEFAULT_SEED = 42
+DEFAULT_EXAM_DEPARTMENTS = {
+    "CSE-3": "data/exam_data/CSE_3.csv",
+    "ECE-3": "data/exam_data/ECE_3.csv",
+    "DSAI-3": "data/exam_data/DSAI_3.csv",
+    "CSE-1": "data/exam_data/CSE_1.csv",
+    "ECE-1": "data/exam_data/ECE_1.csv",
+    "DSAI-1": "data/exam_data/DSAI_1.csv",
+    "DSAI-5": "data/exam_data/DSAI_5.csv",
+    "CSE-5": "data/exam_data/CSE_5.csv",
+    "ECE-5": "data/exam_data/ECE_5.csv",
+    "Sem-7": "data/exam_data/DSAI_7.csv",
+}
+DEFAULT_EXAM_ROOMS_FILE = "data/exam_data/rooms.csv"
+DEFAULT_EXAM_FACULTY_FILE = "data/exam_data/Faculty.csv"
+DEFAULT_EXAM_START_DATE = "2025-11-20"
+
+DEFAULTS = {
+    "departments": DEFAULT_DEPARTMENTS,
+    "rooms": DEFAULT_ROOMS_FILE,
+    "slots": DEFAULT_SLOTS_FILE,
+    "days": list(DEFAULT_DAYS),
+    "excluded_slots": list(DEFAULT_EXCLUDED_SLOTS),
+    "policies": {
+        "compulsory_only_rooms": list(DEFAULT_COMPULSORY_ONLY_ROOMS),
+        "combined_only_rooms": list(DEFAULT_COMBINED_ONLY_ROOMS),
+    },
+    "seed": DEFAULT_SEED,
+    "seeds": 0,
+    "output_dir": ".",
+    "exam": {
+        "departments": DEFAULT_EXAM_DEPARTMENTS,
+        "rooms": DEFAULT_EXAM_ROOMS_FILE,
+        "faculty": DEFAULT_EXAM_FACULTY_FILE,
+        "start_date": DEFAULT_EXAM_START_DATE,
+    },
+}
+
+# Columns each input must have, as read by the parsers.
+REQUIRED_COLUMNS = {
+    "courses": ("Course_Code", "L-T-P-S-C"),
+    "rooms": ("Room_ID",),
+    "slots": ("Start_Time", "End_Time"),
+    "exam_courses": ("Course_Code",),
+    "exam_rooms": ("Room_ID", "Type", "Capacity"),
+    "exam_faculty": ("Name",),
+}
+_SLOT_RE = re.compile(r"^\d{1,2}:\d{2}-\d{1,2}:\d{2}$")
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+class ConfigError(ValueError):
+    pass
+
+
+def _read_file(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in (".json", ".toml", ".yaml", ".yml"):
+        raise ConfigError(f"{path}: unknown config format {ext!r} (use .json, .toml, .yaml or .yml)")
+    try:
+        with open(path, "rb") as fh:
+            text = fh.read().decode("utf-8")
+    except (OSError, UnicodeDecodeError) as exc:
+        raise ConfigError(f"{path}: {exc}")
+    if ext == ".json":
+        try:
+            return json.loads(text)
+        except ValueError as exc:
+            raise ConfigError(f"{path}: {exc}")
+    if ext == ".toml":
+        import tomllib
+
+        try:
+            return tomllib.loads(text)
+        except tomllib.TOMLDecodeError as exc:
+            raise ConfigError(f"{path}: {exc}")
+    try:
+        import yaml
+    except ImportError:
+        raise ConfigError(f"{path}: reading YAML needs PyYAML (pip install pyyaml); use JSON or TOML instead")
+    try:
+        return yaml.safe_load(text) or {}
+    except yaml.YAMLError as exc:
+        raise ConfigError(f"{path}: {exc}")
+
+
+def _check_type(name, value, kind):
+    if kind is list:
+        ok = isinstance(value, list) and all(isinstance(v, str) for v in value)
+    elif kind is dict:
+        ok = isinstance(value, dict) and all(isinstance(k, str) and isinstance(v, str) for k, v in value.items())
+    elif kind is int:
+        ok = isinstance(value, int) and not isinstance(value, bool)
+    else:
+        ok = isinstance(value, kind)
+    if not ok:
+        raise ConfigError(f"{name}: expected {'a list of strings' if kind is list else kind.__name__}, got {value!r}")
+
+
+_SCHEMA = {
+    "departments": dict,
+    "rooms": str,
+    "slots": str,
+    "days": list,
+    "excluded_slots": list,
+    "seed": int,
+    "seeds": int,
+    "output_dir": str,
+}
+_SECTIONS = {
+    "policies": {"compulsory_only_rooms": list, "combined_only_rooms": list},
+    "exam": {"departments": dict, "rooms": str, "faculty": str, "start_date": str},
+}
+_PATH_KEYS = ("rooms", "slots", "output_dir")
+
+
+def load_config(path=None):
+    """Return the defaults merged with the config file at ``path``, if any."""
+    config = copy.deepcopy(DEFAULTS)
+    if path is None:
+        return config
+    data = _read_file(path)
+    if not isinstance(data, dict):
+        raise ConfigError(f"{path}: the top level must be a table/mapping")
+    base = os.path.dirname(os.path.abspath(path))
+
+    def resolve(value):
+        return value if os.path.isabs(value) else os.path.normpath(os.path.join(base, value))
+
+    for key, value in data.items():
+        if key in _SCHEMA:
+            _check_type(key, value, _SCHEMA[key])
+            if key in _PATH_KEYS:
+                value = resolve(value)
+            elif key == "departments":
+                value = {name: resolve(p) for name, p in value.items()}
+            config[key] = value
+        elif key in _SECTIONS:
+            if not isinstance(value, dict):
+                raise ConfigError(f"{key}: expected a table/mapping, got {value!r}")
+            for sub, sub_value in value.items():
+                kind = _SECTIONS[key].get(sub)
+                if kind is None:
+                    raise ConfigError(f"{key}.{sub}: unknown setting")
+                _check_type(f"{key}.{sub}", sub_value, kind)
+                if key == "exam" and sub in ("rooms", "faculty"):
+                    sub_value = resolve(sub_value)
+                elif key == "exam" and sub == "departments":
+                    sub_value = {name: resolve(p) for name, p in sub_value.items()}
+                config[key][sub] = sub_value
+        else:
+            raise ConfigError(f"{key}: unknown setting")
+    return config
+
+
+def scheduler_options(config):
+    # Scheduler keyword arguments for the policy settings.
+    return {
+        "days": list(config["days"]),
+        "excluded_slots": list(config["excluded_slots"]),
+        "compulsory_only_rooms": list(config["policies"]["compulsory_only_rooms"]),
+        "combined_only_rooms": list(config["policies"]["combined_only_rooms"]),
+    }
+
+
+def _csv_header(path):
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        return next(csv.reader(fh), [])
+
+
+def _csv_column(path, column):
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        return [row.get(column, "") for row in csv.DictReader(fh)]
+
+
+def _check_csv(problems, label, path, kind):
+    if not os.path.isfile(path):
+        problems.append(f"{label}: file not found: {path}")
+        return False
+    try:
+        header = [h.strip() for h in _csv_header(path)]
+    except (OSError, UnicodeDecodeError, csv.Error) as exc:
+        problems.append(f"{label}: cannot read {path}: {exc}")
+        return False
+    missing = [c for c in REQUIRED_COLUMNS[kind] if c not in header]
+    if missing:
+        problems.append(f"{label}: {path} lacks column(s) {', '.join(missing)}")
+        return False
+    return True
+
+
+def validate_config(config, exam=True):
+    """Return a list of problems with ``config`` and its input files (empty if none)."""
+    problems = []
+    if not config["departments"]:
+        problems.append("departments: no departments configured")
+    for name, path in config["departments"].items():
+        _check_csv(problems, f"departments.{name}", path, "courses")
+        if not re.search(r"\d+", name):
+            problems.append(f"departments.{name}: name has no semester number, so it shares no templates")
+    rooms = set()
+    if _check_csv(problems, "rooms", config["rooms"], "rooms"):
+        rooms = {r.strip().upper() for r in _csv_column(config["rooms"], "Room_ID")}
+    if _check_csv(problems, "slots", config["slots"], "slots"):
+        slots = {
+            f"{row[0].strip()}-{row[1].strip()}"
+            for row in zip(_csv_column(config["slots"], "Start_Time"), _csv_column(config["slots"], "End_Time"))
+        }
+        for slot in config["excluded_slots"]:
+            if slot not in slots:
+                problems.append(f"excluded_slots: {slot} is not a slot in {config['slots']}")
+    for slot in config["excluded_slots"]:
+        if not _SLOT_RE.match(slot):
+            problems.append(f"excluded_slots: {slot!r} is not HH:MM-HH:MM")
+    if not config["days"]:
+        problems.append("days: no teaching days configured")
+    if len(set(config["days"])) != len(config["days"]):
+        problems.append("days: duplicate day names")
+    for key, room_ids in config["policies"].items():
+        for room in room_ids:
+            if rooms and room.strip().upper() not in rooms:
+                problems.append(f"policies.{key}: room {room} is not in {config['rooms']}")
+    if config["seeds"] < 0:
+        problems.append("seeds: must be 0 or more")
+    if exam:
+        cfg = config["exam"]
+        for name, path in cfg["departments"].items():
+            _check_csv(problems, f"exam.departments.{name}", path, "exam_courses")
+        _check_csv(problems, "exam.rooms", cfg["rooms"], "exam_rooms")
+        _check_csv(problems, "exam.faculty", cfg["faculty"], "exam_faculty")
+        if not _DATE_RE.match(cfg["start_date"]):
+            problems.append(f"exam.start_date: {cfg['start_date']!r} is not YYYY-MM-DD")
+    return problems
@@ -0,0 +1,158 @@
+"""Column-oriented course catalogue loading.
+
+``Course(row)`` parses one CSV row at a time.  ``CourseTable`` parses a whole
+catalogue column by column instead (L-T-P-S-C split into integer arrays,
+truthiness flags and student counts coerced in bulk) and only materialises a
+``Course`` object when an entry is first accessed.  The per-column rules
+reproduce ``Course.__init__`` for every well-formed row.
+"""
+
+import numpy as np
+import pandas as pd
+
+TRUTHY = ("1", "true", "yes", "y")
+LTPSC_FIELDS = ("L", "T", "P", "S", "C")
+_LTPSC_RE = r"^\s*([+-]?\d+)\s*-\s*([+-]?\d+)\s*-\s*([+-]?\d+)\s*-\s*([+-]?\d+)\s*-\s*([+-]?\d+)\s*$"
+_INT_RE = r"^\s*[+-]?\d+\s*$"
+
+
+def as_frame(rows):
+    return rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(list(rows))
+
+
+def as_text(values):
+    # str(value) for every cell, like the row parsers (NaN -> "nan",
+    # None -> "None"); numpy's str cast keeps those spellings.
+    return pd.Series(values.to_numpy(dtype=object).astype(str), index=values.index, dtype=object)
+
+
+def text_column(df, name, default=""):
+    if name not in df.columns:
+        return pd.Series([default] * len(df), index=df.index, dtype=object)
+    return as_text(df[name]).str.strip()
+
+
+def first_column(df, names, default=0):
+    for name in names:
+        if name in df.columns:
+            return df[name]
+    return pd.Series([default] * len(df), index=df.index, dtype=object)
+
+
+def flag_column(values, truthy=TRUTHY, lower=True):
+    text = as_text(values).str.strip()
+    if lower:
+        text = text.str.lower()
+    return text.isin(truthy).to_numpy()
+
+
+def float_column(values):
+    # float(str(value).strip()) with failures as NaN.
+    return np.array(pd.to_numeric(as_text(values).str.strip(), errors="coerce"), dtype=float)
+
+
+def int_column(values):
+    # int(float(value)), with anything unparsable counted as 0.
+    nums = float_column(values)
+    nums[~np.isfinite(nums)] = 0
+    return np.trunc(nums).astype(np.int64)
+
+
+def count_column(values):
+    return np.maximum(int_column(values), 0)
+
+
+def strict_int_column(values):
+    # int(str(value)): only plain integer strings parse, anything else is 0.
+    text = as_text(values)
+    ok = text.str.match(_INT_RE).to_numpy(dtype=bool)
+    out = np.zeros(len(text), dtype=np.int64)
+    if ok.any():
+        out[ok] = text[ok].str.strip().astype(np.int64).to_numpy()
+    return out
+
+
+def ltpsc_columns(values):
+    parts = values.str.extract(_LTPSC_RE)
+    ok = parts.notna().all(axis=1).to_numpy(dtype=bool)
+    out = np.zeros((len(values), 5), dtype=np.int64)
+    if ok.any():
+        out[ok] = parts[ok].astype(np.int64).to_numpy()
+    return {name: out[:, i] for i, name in enumerate(LTPSC_FIELDS)}
+
+
+class CourseTable:
+    """Immutable column store of a catalogue with lazily built ``Course`` views."""
+
+    def __init__(self, columns, size, factory):
+        self.columns = columns
+        self.size = size
+        self.factory = factory
+        self._views = [None] * size
+
+    def __len__(self):
+        return self.size
+
+    def record(self, i):
+        return {name: _scalar(col[i]) for name, col in self.columns.items()}
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.size))]
+        if i < 0:
+            i += self.size
+        view = self._views[i]
+        if view is None:
+            view = self._views[i] = self.factory(self.record(i))
+        return view
+
+    def __iter__(self):
+        for i in range(self.size):
+            yield self[i]
+
+    def column(self, name):
+        return self.columns[name]
+
+
+def _scalar(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def load_course_table(rows, factory):
+    """Bulk-parse scheduler catalogue rows (same rules as ``main.Course``)."""
+    df = as_frame(rows)
+    code = text_column(df, "Course_Code")
+    basket = int_column(first_column(df, ["basket"], 0))
+    elective_text = text_column(df, "Elective", "0").str.lower()
+    elective_num = np.array(pd.to_numeric(elective_text, errors="coerce"), dtype=float)
+    elective_word = elective_text.isin(("true", "yes", "y")).to_numpy()
+    parsed = ~np.isnan(elective_num) | (elective_text == "nan").to_numpy() | (elective_text == "").to_numpy()
+    elective = np.where(parsed, np.nan_to_num(elective_num, nan=0.0) > 0, elective_word)
+
+    columns = {
+        "code": code.to_numpy(dtype=object),
+        "basket": basket,
+        "title": (text_column(df, "Course_Title") if "Course_Title" in df.columns else code).to_numpy(dtype=object),
+        "faculty": text_column(df, "Faculty").to_numpy(dtype=object),
+        "ltp": text_column(df, "L-T-P-S-C").to_numpy(dtype=object),
+        "semester_half": text_column(df, "Semester_Half", "0").to_numpy(dtype=object),
+        "is_elective": elective | (basket > 0),
+        "is_combined": flag_column(first_column(df, ["is_combined", "Is_Combined"], 0)),
+        "students": count_column(first_column(df, ["Students", "students"], 0)),
+    }
+    columns.update(ltpsc_columns(text_column(df, "L-T-P-S-C")))
+    return CourseTable(columns, len(df), factory)
+
+
+def load_exam_course_table(rows, group, factory):
+    """Bulk-parse exam catalogue rows (same rules as ``exam.Course``)."""
+    df = as_frame(rows)
+    code = text_column(df, "Course_Code")
+    columns = {
+        "group": np.array([group] * len(df), dtype=object),
+        "code": code.to_numpy(dtype=object),
+        "title": (text_column(df, "Course_Title") if "Course_Title" in df.columns else code).to_numpy(dtype=object),
+        "students": strict_int_column(first_column(df, ["Students"], "0")),
+        "is_elective": flag_column(first_column(df, ["Elective"], "0"), ("1", "true", "True", "YES", "yes"), lower=False),
+    }
+    return CourseTable(columns, len(df), factory)
@@ -0,0 +1,122 @@
+"""Indexed store for Scheduler.scheduled_entries.
+
+The store is still a plain list of entry dicts for exporters and tests, but
+it keeps secondary indexes keyed by (sheet, day, code), (sheet, code),
+faculty and room so the scheduler's lookups no longer rescan every entry.
+"""
+
+import sys
+
+_FACULTY_SPLITS = {}
+
+
+def split_faculty(raw):
+    # "Dr. A / Dr. B" fields repeat across every entry of a course, so each
+    # distinct value is split and its names interned only once.
+    if not raw:
+        return ()
+    names = _FACULTY_SPLITS.get(raw)
+    if names is None:
+        names = _FACULTY_SPLITS[raw] = tuple(sys.intern(p.strip()) for p in str(raw).split("/") if p.strip())
+    return names
+
+
+def session_type_of(entry):
+    # "L", "T" or "P", recovered from the display text _allocate_session wrote.
+    display = entry["display"]
+    if "(Lab" in display:
+        return "P"
+    if display.startswith(f"{entry['code']}T"):
+        return "T"
+    return "L"
+
+
+def session_display(code, session_type, room):
+    if session_type == "P":
+        return f"{code} (Lab-{room})" if room else f"{code} (Lab)"
+    label = f"{code}T" if session_type == "T" else code
+    return f"{label} ({room})" if room else label
+
+
+class EntryStore(list):
+    def __init__(self, entries=()):
+        super().__init__()
+        self._reset_indexes()
+        self.extend(entries)
+
+    def _reset_indexes(self):
+        self._by_sheet_day_code = {}
+        self._by_sheet_code = {}
+        self._by_faculty = {}
+        self._by_room = {}
+
+    def _index(self, entry):
+        sheet, code = entry.get("sheet"), entry.get("code")
+        self._by_sheet_day_code.setdefault((sheet, entry.get("day"), code), []).append(entry)
+        self._by_sheet_code.setdefault((sheet, code), []).append(entry)
+        for name in split_faculty(entry.get("faculty")):
+            self._by_faculty.setdefault(name, []).append(entry)
+        room = entry.get("room")
+        if room:
+            self._by_room.setdefault(room, []).append(entry)
+
+    def _reindex(self):
+        self._reset_indexes()
+        for entry in self:
+            self._index(entry)
+
+    def append(self, entry):
+        super().append(entry)
+        self._index(entry)
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def __iadd__(self, entries):
+        self.extend(entries)
+        return self
+
+    def clear(self):
+        super().clear()
+        self._reset_indexes()
+
+    # Rare mutations just rebuild the indexes.
+    def insert(self, index, entry):
+        super().insert(index, entry)
+        self._reindex()
+
+    def pop(self, index=-1):
+        entry = super().pop(index)
+        self._reindex()
+        return entry
+
+    def remove(self, entry):
+        super().remove(entry)
+        self._reindex()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._reindex()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._reindex()
+
+    def has_session(self, sheet, day, code):
+        return bool(self._by_sheet_day_code.get((sheet, day, code)))
+
+    def for_sheet_day_code(self, sheet, day, code):
+        return list(self._by_sheet_day_code.get((sheet, day, code), ()))
+
+    def for_sheet_code(self, sheet, code):
+        return list(self._by_sheet_code.get((sheet, code), ()))
+
+    def for_faculty(self, name):
+        return list(self._by_faculty.get(str(name).strip(), ()))
+
+    def for_room(self, room):
+        return list(self._by_room.get(room, ()))
+
+    def faculty_names(self):
+        return set(self._by_faculty)
@@ -1,10 +1,10 @@
 import re
 import math
-import pandas as pd
-from openpyxl import load_workbook
-from openpyxl.styles import Alignment, Border, Side, PatternFill
 from datetime import datetime, timedelta
 
+from timetable_automation.config import DEFAULT_EXAM_DEPARTMENTS, DEFAULT_EXAM_FACULTY_FILE, DEFAULT_EXAM_ROOMS_FILE
+from timetable_automation.records import ExamPlacement, InvigilationRow, UnscheduledExam
+
 SLOT_LABELS = ["09:00-12:00", "14:00-17:00"]
 MAX_GLOBAL_EXAMS_PER_DAY = 4
 MAX_EXAMS_PER_GROUP_PER_DAY = 1
@@ -21,6 +21,8 @@ def extract_semester_id(group_name: str) -> str:
     return m.group(1) if m else str(group_name)
 
 class Course:
+    __slots__ = ("group", "code", "title", "students", "is_elective")
+
     def __init__(self, row, group_name):
         self.group = group_name
         self.code = str(row["Course_Code"]).strip()
@@ -32,8 +34,18 @@ class Course:
         flag = str(row.get("Elective", "0")).strip()
         self.is_elective = flag in ("1", "true", "True", "YES", "yes")
 
+    @classmethod
+    def from_record(cls, record):
+        course = cls.__new__(cls)
+        for name, value in record.items():
+            setattr(course, name, value)
+        return course
+
 class ExamScheduler:
     def __init__(self, rooms_file, departments, faculty_file, start_date=DEFAULT_START_DATE):
+        # pandas, numpy and openpyxl load with the first scheduler, not the module.
+        import pandas as pd
+
         self.rooms_df = pd.read_csv(rooms_file)
         self.departments = departments
         self.invig_df = pd.read_csv(faculty_file)
@@ -92,11 +104,18 @@ class ExamScheduler:
         return rooms
 
     def _load_courses(self):
+        import numpy as np
+        import pandas as pd
+
+        from timetable_automation.courses import load_exam_course_table
+
         out = {}
         for g, file in self.departments.items():
-            df = pd.read_csv(file)
-            lst = [Course(r, g) for _, r in df.iterrows() if int(str(r.get("Students", 0))) > 0]
-            lst.sort(key=lambda c: (-c.students, c.code))
+            table = load_exam_course_table(pd.read_csv(file), g, Course.from_record)
+            students = table.column("students")
+            codes = table.column("code")
+            order = sorted(np.flatnonzero(students > 0), key=lambda i: (-students[i], codes[i]))
+            lst = [table[i] for i in order]
             out[g] = lst
         return out
 
@@ -174,15 +193,15 @@ class ExamScheduler:
             self.group_daily[date][g] += 1
         self.global_daily[date] += 1
         alloc_text = "; ".join([f"{rid}:{cnt}" for rid, cnt in sanitized])
-        self.scheduled.append({
-            "Date": date.strftime("%Y-%m-%d"),
-            "Slot": slot,
-            "Groups": ", ".join(sorted(groups_set)),
-            "Course_Code": code,
-            "Course_Title": title,
-            "Students": students,
-            "Allocations": alloc_text
-        })
+        self.scheduled.append(ExamPlacement(
+            Date=date.strftime("%Y-%m-%d"),
+            Slot=slot,
+            Groups=", ".join(sorted(groups_set)),
+            Course_Code=code,
+            Course_Title=title,
+            Students=students,
+            Allocations=alloc_text,
+        ))
         return True
 
     def _plan_electives_by_semester(self):
@@ -237,15 +256,15 @@ class ExamScheduler:
                         per_elec_alloc.append((rid, take))
                         need -= take
                 alloc_text = "; ".join(f"{rid}:{cnt}" for rid, cnt in per_elec_alloc)
-                self.scheduled.append({
-                    "Date": date.strftime("%Y-%m-%d"),
-                    "Slot": slot,
-                    "Groups": c.group,
-                    "Course_Code": c.code,
-                    "Course_Title": c.title,
-                    "Students": c.students,
-                    "Allocations": alloc_text
-                })
+                self.scheduled.append(ExamPlacement(
+                    Date=date.strftime("%Y-%m-%d"),
+                    Slot=slot,
+                    Groups=c.group,
+                    Course_Code=c.code,
+                    Course_Title=c.title,
+                    Students=c.students,
+                    Allocations=alloc_text,
+                ))
             return day + 1
         return day
 
@@ -289,15 +308,15 @@ class ExamScheduler:
                     total_students = sum(c.students for c in block["electives"])
                     alloc_text = "; ".join(f"{rid}:{cnt}" for rid, cnt in sanitized)
 
-                    self.scheduled.append({
-                        "Date": date.strftime("%Y-%m-%d"),
-                        "Slot": slot_used,
-                        "Groups": ", ".join(sorted(groups_set)),
-                        "Course_Code": code,
-                        "Course_Title": block["electives"][0].title,
-                        "Students": total_students,
-                        "Allocations": alloc_text
-                    })
+                    self.scheduled.append(ExamPlacement(
+                        Date=date.strftime("%Y-%m-%d"),
+                        Slot=slot_used,
+                        Groups=", ".join(sorted(groups_set)),
+                        Course_Code=code,
+                        Course_Title=block["electives"][0].title,
+                        Students=total_students,
+                        Allocations=alloc_text,
+                    ))
             involved_groups = set()
             for _, block in course_items:
                 involved_groups.update(block["groups"])
@@ -355,12 +374,12 @@ class ExamScheduler:
 
         if pending:
             for exam in pending:
-                self.unscheduled.append({
-                    "Group": ", ".join(sorted(exam["groups"])),
-                    "Course_Code": exam["code"],
-                    "Course_Title": exam["title"],
-                    "Students": exam["students"]
-                })
+                self.unscheduled.append(UnscheduledExam(
+                    Group=", ".join(sorted(exam["groups"])),
+                    Course_Code=exam["code"],
+                    Course_Title=exam["title"],
+                    Students=exam["students"],
+                ))
 
         self._assign_invigilators()
 
@@ -387,34 +406,31 @@ class ExamScheduler:
                                 if rid == a.split(":")[0]:
                                     exam_names.append(f"{rec['Course_Code']}")
                                     break
-                    self.invig_assignments.append({
-                        "Date": date_str,
-                        "Slot": slot,
-                        "Room_ID": rid,
-                        "Exam": " | ".join(sorted(set(exam_names))),
-                        "Invigilators": ", ".join(picks)
-                    })
-
-    def _fmt(self, file):
-        wb = load_workbook(file)
-        thin = Border(left=Side(style="thin"), right=Side(style="thin"), top=Side(style="thin"), bottom=Side(style="thin"))
-        gray = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")
-        for s in wb.sheetnames:
-            ws = wb[s]
-            for row in ws.iter_rows():
-                for cell in row:
-                    cell.border = thin
-                    if cell.row == 1 or cell.column == 1:
-                        cell.fill = gray
-                    cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-            for col in ws.columns:
-                mx = 12
-                for cell in col:
-                    if cell.value:
-                        mx = max(mx, len(str(cell.value)))
-                ws.column_dimensions[col[0].column_letter].width = min(mx + 4, 70)
-            ws.row_dimensions[1].height = 24
-        wb.save(file)
+                    self.invig_assignments.append(InvigilationRow(
+                        Date=date_str,
+                        Slot=slot,
+                        Room_ID=rid,
+                        Exam=" | ".join(sorted(set(exam_names))),
+                        Invigilators=", ".join(picks),
+                    ))
+
+    def _fmt(self, title, frame, index=False):
+        # Grey header row and first column, every cell boxed, centred and
+        # wrapped; columns 16 to 70 wide and a taller header row.
+        from timetable_automation.export import BREAK_FILL, THIN, WRAP_CENTER, cell_style, frame_layout
+
+        layout = frame_layout(
+            title,
+            frame,
+            index=index,
+            header_style=cell_style(fill=BREAK_FILL, border=THIN, alignment=WRAP_CENTER),
+            body_style=cell_style(border=THIN, alignment=WRAP_CENTER),
+            min_width=12,
+            pad=4,
+            max_width=70,
+        )
+        layout.row_heights[1] = 24
+        return layout
 
     def _parse_alloc(self, s):
         out = {}
@@ -438,6 +454,8 @@ class ExamScheduler:
         return "; ".join(f"{rid}:{cnt}" for rid, cnt in items)
 
     def _build_merged(self):
+        import pandas as pd
+
         rows = self.scheduled
         groups = {}
         title_map = {}
@@ -489,6 +507,8 @@ class ExamScheduler:
 
 
     def _build_grid(self, merged_df):
+        import pandas as pd
+
         dates = sorted(merged_df["Date"].unique())
         grid = pd.DataFrame(index=SLOT_LABELS, columns=dates)
         for d in dates:
@@ -502,35 +522,27 @@ class ExamScheduler:
         return grid
 
     def export(self, out="exam_timetables.xlsx", uns="unscheduled_exams.xlsx", invig="invigilation.xlsx"):
+        import pandas as pd
+
+        from timetable_automation.export import write_workbook
+
         merged_df, legend_df = self._build_merged()
         grid_df = self._build_grid(merged_df)
-        with pd.ExcelWriter(out, engine="openpyxl") as w:
-            merged_df.to_excel(w, sheet_name="Merged", index=False)
-            grid_df.to_excel(w, sheet_name="Grid", index=True)
-            legend_df.to_excel(w, sheet_name="Legend", index=False)
-        self._fmt(out)
+        write_workbook(
+            out,
+            [
+                self._fmt("Merged", merged_df),
+                self._fmt("Grid", grid_df, index=True),
+                self._fmt("Legend", legend_df),
+            ],
+        )
         if self.unscheduled:
             pd.DataFrame(self.unscheduled).to_excel(uns, index=False)
         if self.invig_assignments:
             pd.DataFrame(self.invig_assignments).sort_values(by=["Date", "Slot", "Room_ID"]).to_excel(invig, index=False)
 
 def run_example():
-    departments = {
-        "CSE-3": "data/exam_data/CSE_3.csv",
-        "ECE-3": "data/exam_data/ECE_3.csv",
-        "DSAI-3": "data/exam_data/DSAI_3.csv",
-        "CSE-1": "data/exam_data/CSE_1.csv",
-        "ECE-1": "data/exam_data/ECE_1.csv",
-        "DSAI-1": "data/exam_data/DSAI_1.csv",
-        "DSAI-5": "data/exam_data/DSAI_5.csv",
-        "CSE-5": "data/exam_data/CSE_5.csv",
-        "ECE-5": "data/exam_data/ECE_5.csv",    
-        "Sem-7": "data/exam_data/DSAI_7.csv",
-
-    }
-    rooms = "data/exam_data/rooms.csv"
-    faculty = "data/exam_data/faculty.csv"
-    s = ExamScheduler(rooms, departments, faculty)
+    s = ExamScheduler(DEFAULT_EXAM_ROOMS_FILE, DEFAULT_EXAM_DEPARTMENTS, DEFAULT_EXAM_FACULTY_FILE)
     s.generate()
     s.export()
 
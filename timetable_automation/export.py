@@ -0,0 +1,356 @@
+"""Streaming Excel export for the student, faculty and exam workbooks.
+
+The legacy exporters wrote every grid with pandas, reloaded the workbook with
+openpyxl, styled it cell by cell and saved it again.  Here each sheet is laid
+out once from the schedule model and streamed through an openpyxl write-only
+workbook:
+
+- every cell is put exactly once, with its final value and CellStyle;
+- runs of equal class cells are merged straight from the grid row values
+  (``put_runs``), not by reading cells back;
+- a CellStyle is one shared object per colour and role, and ``StyleSheet``
+  resolves each one against the workbook's style tables only once;
+- column widths are tracked as cells are put.
+
+The cell layout and styling match what the legacy formatters produced.
+"""
+
+from collections import namedtuple
+from copy import copy
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.cell_range import CellRange
+
+from timetable_automation.grid import TimetableGrid
+
+PALETTE = ["FFC7CE", "C6EFCE", "FFEB9C", "BDD7EE", "D9EAD3", "F4CCCC",
+           "D9D2E9", "FCE5CD", "C9DAF8", "EAD1DC"]
+
+THIN = Border(left=Side(style="thin"), right=Side(style="thin"), top=Side(style="thin"), bottom=Side(style="thin"))
+CENTER = Alignment(horizontal="center", vertical="center")
+WRAP_CENTER = Alignment(horizontal="center", vertical="center", wrap_text=True)
+BREAK_FILL = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")
+HEADER_FILL = PatternFill(start_color="D3D3D3", end_color="D3D3D3", fill_type="solid")
+HEADER_FONT = Font(bold=True)
+
+CellStyle = namedtuple("CellStyle", "fill border alignment font", defaults=(None, None, None, None))
+
+_fills = {}
+_styles = {}
+
+
+def solid_fill(color):
+    fill = _fills.get(color)
+    if fill is None:
+        fill = _fills[color] = PatternFill(start_color=color, end_color=color, fill_type="solid")
+    return fill
+
+
+def cell_style(fill=None, border=None, alignment=None, font=None):
+    # Interned, so equal styles are the same object and resolve once.
+    key = CellStyle(fill, border, alignment, font)
+    return _styles.setdefault(key, key)
+
+
+def color_style(color, alignment=None):
+    return cell_style(fill=solid_fill(color), border=THIN, alignment=alignment)
+
+
+BOXED = cell_style(border=THIN)
+BOXED_CENTER = cell_style(border=THIN, alignment=CENTER)
+BREAK_STYLE = cell_style(fill=BREAK_FILL, border=THIN, alignment=CENTER)
+HEADER_STYLE = cell_style(fill=HEADER_FILL, border=THIN, alignment=CENTER, font=HEADER_FONT)
+
+
+def _cell_value(value):
+    # pandas/openpyxl never stored empty strings, they read back as None.
+    if value is None or value == "":
+        return None
+    try:
+        if value != value:
+            return None
+    except Exception:
+        pass
+    return value
+
+
+class ColorMap:
+    """Course code -> palette colour, assigned in order of first appearance."""
+
+    def __init__(self, palette=PALETTE):
+        self.palette = palette
+        self.colors = {}
+
+    def __contains__(self, code):
+        return code in self.colors
+
+    def __iter__(self):
+        return iter(list(self.colors))
+
+    def get(self, code, default=None):
+        return self.colors.get(code, default)
+
+    def color(self, code):
+        if code not in self.colors:
+            self.colors[code] = self.palette[len(self.colors) % len(self.palette)]
+        return self.colors[code]
+
+
+class StyleSheet:
+    """CellStyle -> openpyxl style array for one workbook.
+
+    Assigning fill, border, alignment and font looks each of them up in the
+    workbook's style tables.  That happens once per CellStyle here; every
+    later cell copies the resolved index array.
+    """
+
+    def __init__(self):
+        self.arrays = {}
+
+    def apply(self, cell, style):
+        array = self.arrays.get(style)
+        if array is None:
+            for name, value in zip(CellStyle._fields, style):
+                if value is not None:
+                    setattr(cell, name, value)
+            self.arrays[style] = copy(cell._style)
+        else:
+            cell._style = copy(array)
+
+
+class SheetLayout:
+    """Sparse, 1-based cell grid for one sheet, flushed in a single pass.
+
+    Column widths are the longest value plus ``pad``, at least ``min_width``
+    plus ``pad`` and at most ``max_width``.
+    """
+
+    def __init__(self, title, min_width=0, pad=2, max_width=None):
+        self.title = title
+        self.cells = {}
+        self.merges = []
+        self.max_row = 0
+        self.max_col = 0
+        self.freeze_panes = None
+        self.row_heights = {}
+        self.min_width = min_width
+        self.pad = pad
+        self.max_width = max_width
+        self._longest = {}
+
+    def put(self, row, col, value=None, style=None):
+        value = _cell_value(value)
+        self.cells[(row, col)] = (value, style)
+        if row > self.max_row:
+            self.max_row = row
+        if col > self.max_col:
+            self.max_col = col
+        if value is not None:
+            length = len(str(value))
+            if length > self._longest.get(col, 0):
+                self._longest[col] = length
+
+    def value(self, row, col):
+        cell = self.cells.get((row, col))
+        return cell[0] if cell else None
+
+    def put_row(self, row, first_col, values, style=None):
+        for col, value in enumerate(values, start=first_col):
+            self.put(row, col, value, style)
+
+    def merge(self, row, start_col, end_col):
+        self.merges.append(CellRange(min_row=row, min_col=start_col, max_row=row, max_col=end_col))
+
+    def column_widths(self):
+        widths = {}
+        for col in range(1, self.max_col + 1):
+            width = max(self._longest.get(col, 0), self.min_width) + self.pad
+            widths[col] = min(width, self.max_width) if self.max_width else width
+        return widths
+
+    def write(self, wb, styles=None):
+        styles = styles if styles is not None else StyleSheet()
+        ws = wb.create_sheet(self.title)
+        # Write-only sheets emit <cols> and the sheet view before the first row.
+        for col, width in self.column_widths().items():
+            ws.column_dimensions[get_column_letter(col)].width = width
+        for row, height in self.row_heights.items():
+            ws.row_dimensions[row].height = height
+        if self.freeze_panes:
+            ws.freeze_panes = self.freeze_panes
+        cells = self.cells
+        for row in range(1, self.max_row + 1):
+            out = []
+            for col in range(1, self.max_col + 1):
+                cell = cells.get((row, col))
+                if cell is None:
+                    out.append(None)
+                    continue
+                wc = WriteOnlyCell(ws, value=cell[0])
+                if cell[1] is not None:
+                    styles.apply(wc, cell[1])
+                out.append(wc)
+            ws.append(out)
+        for rng in self.merges:
+            ws.merged_cells.add(rng)
+        return ws
+
+
+def write_workbook(filename, layouts):
+    """Stream ``layouts`` into ``filename``, sharing one StyleSheet."""
+    wb = Workbook(write_only=True)
+    styles = StyleSheet()
+    for layout in layouts:
+        layout.write(wb, styles)
+    wb.save(filename)
+
+
+def put_runs(layout, row, first_col, values, color_map, gray_values=()):
+    # Put one grid row.  Class cells are coloured by course code and equal
+    # neighbours merged into one block; ``gray_values`` (e.g. BREAK) get the
+    # grey break style and everything else a plain border.
+    values = [_cell_value(v) for v in values]
+    i = 0
+    while i < len(values):
+        raw = values[i]
+        val = str(raw).strip() if raw is not None else ""
+        col = first_col + i
+        if val and val != "FREE" and val not in gray_values:
+            color = color_map.color(val.split(" ")[0].rstrip("T"))
+            span = 1
+            while i + span < len(values) and values[i + span] == raw:
+                span += 1
+            # Cells covered by the merge keep the fill but no value, as
+            # openpyxl's merge_cells left them.
+            layout.put(row, col, raw, color_style(color, CENTER))
+            for other in range(col + 1, col + span):
+                layout.put(row, other, None, color_style(color))
+            if span > 1:
+                layout.merge(row, col, col + span - 1)
+            i += span
+        else:
+            layout.put(row, col, raw, BREAK_STYLE if val and val in gray_values else BOXED)
+            i += 1
+
+
+LEGEND_HEADERS = ["S.No", "Course Code", "Course Title", "L-T-P-S-C", "Faculty", "Color"]
+ELECTIVE_HEADERS = ["S.No", "Elective Basket", "Elective Title", "Faculty", "Room", "Color"]
+
+
+def student_sheet_layout(scheduler, sheet_name, timetable, color_map):
+    layout = SheetLayout(sheet_name)
+    grid = TimetableGrid.coerce(timetable)
+    # The grid rows are bordered out to the legend's last column too.
+    width = max(len(grid.slots) + 1, len(LEGEND_HEADERS) + 1)
+    layout.put(1, 1, grid.name)
+    layout.put_row(1, 2, grid.slots)
+    for row, (day, values) in enumerate(grid.rows(), start=2):
+        layout.put(row, 1, day)
+        put_runs(layout, row, 2, values, color_map, gray_values=("BREAK",))
+        for col in range(len(values) + 2, width + 1):
+            layout.put(row, col, None, BOXED)
+
+    courses_by_code = {}
+    for c in scheduler.courses:
+        courses_by_code.setdefault(c.code, c)
+
+    start_row = len(grid.days) + 4
+    layout.put_row(start_row, 2, LEGEND_HEADERS, BOXED_CENTER)
+
+    i = 1
+    for code in color_map:
+        if code.startswith("Elective_"):
+            continue
+        course = courses_by_code.get(code)
+        row = start_row + i
+        layout.put_row(row, 2, [i, code, course.title if course else code], BOXED)
+        layout.put(row, 5, course.ltp if course else "", BOXED_CENTER)
+        layout.put(row, 6, course.faculty if course else "", BOXED)
+        layout.put(row, 7, None, color_style(color_map.get(code)))
+        i += 1
+
+    electives_header_row = start_row + i + 2
+    layout.put_row(electives_header_row, 2, ELECTIVE_HEADERS, BOXED_CENTER)
+
+    chosen_by_basket = {b: e for (b, e) in scheduler.electives_by_sheet.get(sheet_name, [])}
+    rooms = scheduler.elective_room_assignment.get(sheet_name, {})
+    row_ctr = 1
+    for basket in sorted(chosen_by_basket.keys()):
+        elective_code = f"Elective_{basket}"
+        all_electives = [
+            c
+            for c in scheduler.courses
+            if c.is_elective and c.basket == basket and scheduler._course_in_sheet_half(c, sheet_name)
+        ]
+        for e in all_electives:
+            row = electives_header_row + row_ctr
+            layout.put_row(row, 2, [row_ctr, elective_code, e.title, e.faculty], BOXED)
+            layout.put(row, 6, rooms.get(f"{elective_code}||{e.title}", ""), BOXED_CENTER)
+            layout.put(row, 7, None, color_style(color_map.get(elective_code, "FFFFFF")))
+            row_ctr += 1
+
+    layout.freeze_panes = "B2"
+    return layout
+
+
+def write_student_workbook(scheduler, filename, timetables):
+    """Write ``{sheet_name: grid}`` with the colour legend under every sheet."""
+    color_map = ColorMap()
+    write_workbook(
+        filename,
+        [student_sheet_layout(scheduler, name, timetable, color_map) for name, timetable in timetables.items()],
+    )
+
+
+def faculty_sheet_layout(title, halves, slots, color_map):
+    # halves: [("First Half", grid), ("Second Half", grid)], stacked with a
+    # bold header row above each grid and a blank spacer row between them.
+    layout = SheetLayout(title)
+    width = len(slots) + 1
+    row = 1
+    for n, (label, grid) in enumerate(halves):
+        if n:
+            layout.put_row(row, 2, [None] * (width - 1), BOXED)
+            row += 1
+        layout.put(row, 1, label)
+        if n:
+            layout.put_row(row, 2, [None] * (width - 1), BOXED)
+        row += 1
+        layout.put_row(row, 1, ["Day"] + list(slots), HEADER_STYLE)
+        row += 1
+        for day, values in TimetableGrid.coerce(grid).rows():
+            layout.put(row, 1, day)
+            put_runs(layout, row, 2, values, color_map)
+            row += 1
+    layout.freeze_panes = "B2"
+    return layout
+
+
+def write_faculty_workbook(filename, faculty_tables, slots):
+    """Write one sheet per faculty member from ``{name: {half: grid}}``."""
+    color_map = ColorMap()
+    layouts = []
+    for f in sorted(faculty_tables.keys()):
+        halves = [("First Half", faculty_tables[f]["First_Half"]), ("Second Half", faculty_tables[f]["Second_Half"])]
+        layouts.append(faculty_sheet_layout(f[:31], halves, slots, color_map))
+    write_workbook(filename, layouts)
+
+
+def frame_layout(title, frame, index=False, header_style=None, body_style=None, **widths):
+    """Lay out a DataFrame where ``to_excel`` would put it, styled in one pass.
+
+    Every cell of the used range is put, blanks included.  The header row and
+    the first column take ``header_style``, all other cells ``body_style``;
+    ``widths`` are passed on to SheetLayout.
+    """
+    layout = SheetLayout(title, **widths)
+    header = ([frame.index.name] if index else []) + list(frame.columns)
+    layout.put_row(1, 1, header, header_style)
+    rows = frame.itertuples(index=index, name=None)
+    for row, values in enumerate(rows, start=2):
+        layout.put(row, 1, values[0], header_style)
+        layout.put_row(row, 2, values[1:], body_style)
+    return layout
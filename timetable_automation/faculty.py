@@ -0,0 +1,95 @@
+"""Faculty calendar shared by every Scheduler of a run.
+
+Each (half, faculty name, day) owns one busy mask.  The bits are those of the
+run's OccupancyIndex, and the half is decided by ``scope_for_sheet``.  Names
+are normalised through a SymbolTable, and a co-taught "A / B" entry books both
+A and B, so a clash is caught across departments and sections.  Before this,
+only the sheet being generated was checked.
+
+Every booking is held by a ``(department, sheet)`` holder.  Regenerating a
+sheet releases everything its holder booked.  A booking may also carry a
+share key.  Sessions with the same key are one class taught to several
+sections at once: a combined course, or an elective placeholder on its
+semester template.  They may overlap; anything else may not.
+"""
+
+from timetable_automation.entries import split_faculty
+from timetable_automation.occupancy import OccupancyIndex, scope_for_sheet
+from timetable_automation.symbols import SymbolTable
+
+
+class FacultyCalendar:
+    def __init__(self, occupancy=None):
+        self.occupancy = occupancy if occupancy is not None else OccupancyIndex()
+        self.names = SymbolTable()
+        self._busy = {}
+        self._claims = {}
+        self._held = {}
+
+    def _keys(self, faculty, sheet_name, day):
+        scope = scope_for_sheet(sheet_name)
+        return [(scope, self.names.id(name), day) for name in split_faculty(faculty)]
+
+    def _refresh(self, key):
+        claims = self._claims.get(key)
+        mask = 0
+        for held in (claims or {}).values():
+            mask |= held
+        if mask:
+            self._busy[key] = mask
+        else:
+            self._busy.pop(key, None)
+            self._claims.pop(key, None)
+
+    def busy(self, name, sheet_name, day):
+        # Busy mask of one faculty member (not a co-taught "A / B" field).
+        if name not in self.names:
+            return 0
+        return self._busy.get((scope_for_sheet(sheet_name), self.names.id(name), day), 0)
+
+    def clash(self, faculty, sheet_name, day, mask, share=None):
+        for key in self._keys(faculty, sheet_name, day):
+            hit = self._busy.get(key, 0) & mask
+            if not hit:
+                continue
+            if share is None:
+                return True
+            for (_, other), held in self._claims[key].items():
+                if other != share and held & hit:
+                    return True
+        return False
+
+    def claim(self, holder, faculty, sheet_name, day, mask, share=None):
+        for key in self._keys(faculty, sheet_name, day):
+            claims = self._claims.setdefault(key, {})
+            claims[(holder, share)] = claims.get((holder, share), 0) | mask
+            self._busy[key] = self._busy.get(key, 0) | mask
+            self._held.setdefault(holder, set()).add(key)
+
+    def release(self, holder, faculty, sheet_name, day, mask, share=None):
+        for key in self._keys(faculty, sheet_name, day):
+            claims = self._claims.get(key)
+            if not claims or (holder, share) not in claims:
+                continue
+            left = claims[(holder, share)] & ~mask
+            if left:
+                claims[(holder, share)] = left
+            else:
+                del claims[(holder, share)]
+            self._refresh(key)
+
+    def release_holder(self, holder):
+        for key in self._held.pop(holder, ()):
+            claims = self._claims.get(key, {})
+            for claim in [c for c in claims if c[0] == holder]:
+                del claims[claim]
+            self._refresh(key)
+
+    def load(self, slot_hours=None):
+        """Busy slots per (name, half, day); hours instead when ``slot_hours`` maps slot -> hours."""
+        found = {}
+        for (scope, i, day), mask in self._busy.items():
+            slots = self.occupancy.slots_in(mask)
+            value = sum(slot_hours.get(s, 0) for s in slots) if slot_hours is not None else len(slots)
+            found[(self.names.names[i], scope, day)] = value
+        return found
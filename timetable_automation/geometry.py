@@ -0,0 +1,105 @@
+"""Precomputed slot windows for one slot layout.
+
+For a given duration the candidate sessions of a day are always the same
+minimal runs of consecutive teaching slots; only which of them are free
+changes.  SlotGeometry enumerates those runs once per (slots, excluded slots,
+break length) combination and duration, already ordered the way
+``_allocate_session`` tries them (tightest fit first, then earliest start),
+so finding candidates for a day is a filter of the precomputed windows
+against the day's busy bitmask.
+"""
+
+from collections import namedtuple
+
+from timetable_automation.grid import TimetableGrid
+
+SlotWindow = namedtuple("SlotWindow", "slots mask waste start trailing")
+
+_GEOMETRIES = {}
+
+
+def slot_duration(slot):
+    start, end = slot.split("-")
+    h1, m1 = map(int, start.split(":"))
+    h2, m2 = map(int, end.split(":"))
+    return (h2 + m2 / 60) - (h1 + m1 / 60)
+
+
+def slot_geometry(slots, excluded_slots=(), break_length=1):
+    key = (tuple(slots), tuple(excluded_slots), break_length)
+    geometry = _GEOMETRIES.get(key)
+    if geometry is None:
+        geometry = _GEOMETRIES[key] = SlotGeometry(*key)
+    return geometry
+
+
+class SlotGeometry:
+    def __init__(self, slots, excluded_slots=(), break_length=1):
+        self.slots = tuple(slots)
+        self.index = {s: i for i, s in enumerate(self.slots)}
+        self.bit = {s: 1 << i for i, s in enumerate(self.slots)}
+        self.durations = {s: slot_duration(s) for s in self.slots}
+        excluded = set(excluded_slots)
+        self.teaching = tuple(s for s in self.slots if s not in excluded)
+        self.teaching_mask = sum(self.bit[s] for s in self.teaching)
+        # Slot right after each slot (gap marking) and the slots a session
+        # ending there blocks with a BREAK.
+        self.next_slot = {s: self.slots[i + 1] for i, s in enumerate(self.slots[:-1])}
+        self.trailing = {
+            s: self.slots[i + 1:i + 1 + break_length] for i, s in enumerate(self.slots)
+        }
+        self._windows = {}
+
+    def _runs(self, free_mask):
+        runs, run = [], []
+        for s in self.slots:
+            if free_mask & self.bit[s]:
+                run.append(s)
+            elif run:
+                runs.append(run)
+                run = []
+        if run:
+            runs.append(run)
+        return runs
+
+    def windows(self, duration):
+        windows = self._windows.get(duration)
+        if windows is None:
+            windows = []
+            for run in self._runs(self.teaching_mask):
+                for i in range(len(run)):
+                    acc = 0
+                    for j in range(i, len(run)):
+                        acc += self.durations[run[j]]
+                        if acc >= duration:
+                            slots = tuple(run[i:j + 1])
+                            windows.append(
+                                SlotWindow(
+                                    slots,
+                                    sum(self.bit[s] for s in slots),
+                                    acc - duration,
+                                    self.index[run[i]],
+                                    self.trailing[run[j]],
+                                )
+                            )
+                            break
+            windows.sort(key=lambda w: w.waste)
+            self._windows[duration] = windows
+        return windows
+
+    def free_windows(self, duration, busy_mask):
+        return [w for w in self.windows(duration) if not w.mask & busy_mask]
+
+    def free_blocks(self, busy_mask):
+        return self._runs(self.teaching_mask & ~busy_mask)
+
+    def busy_mask(self, timetable, day):
+        if isinstance(timetable, TimetableGrid):
+            columns, values = timetable.slots, timetable.row(day)
+        else:
+            columns, values = timetable.columns, timetable.loc[day].tolist()
+        mask = 0
+        for s, value in zip(columns, values):
+            if value != "":
+                mask |= self.bit.get(s, 0)
+        return mask
@@ -0,0 +1,70 @@
+"""Compact day x slot timetable grid.
+
+Scheduling reads and writes single cells thousands of times per course, which
+is slow through ``DataFrame.at``.  TimetableGrid keeps the cells in one flat
+list indexed by ``day_index * n_slots + slot_index`` and exposes the same
+``grid.at[day, slot]`` accessor plus ``index``/``columns``, so code written
+against the old DataFrame grids keeps working.  ``to_frame()`` builds a
+DataFrame only when one is really needed (``to_excel``), so pandas is
+imported there and not with the module.
+"""
+
+
+class _CellAccess:
+    def __init__(self, grid):
+        self.grid = grid
+
+    def __getitem__(self, key):
+        day, slot = key
+        grid = self.grid
+        return grid.cells[grid.row_offset[day] + grid.col_index[slot]]
+
+    def __setitem__(self, key, value):
+        day, slot = key
+        grid = self.grid
+        grid.cells[grid.row_offset[day] + grid.col_index[slot]] = value
+
+
+class TimetableGrid:
+    def __init__(self, days, slots, fill="", name=None):
+        self.days = list(days)
+        self.slots = list(slots)
+        self.name = name
+        width = len(self.slots)
+        self.row_offset = {d: i * width for i, d in enumerate(self.days)}
+        self.col_index = {s: j for j, s in enumerate(self.slots)}
+        self.cells = [fill] * (len(self.days) * width)
+        self.at = _CellAccess(self)
+
+    @classmethod
+    def from_frame(cls, frame):
+        grid = cls(frame.index, frame.columns, name=frame.index.name)
+        grid.cells = [value for row in frame.itertuples(index=False, name=None) for value in row]
+        return grid
+
+    @classmethod
+    def coerce(cls, timetable):
+        return timetable if isinstance(timetable, cls) else cls.from_frame(timetable)
+
+    @property
+    def index(self):
+        return self.days
+
+    @property
+    def columns(self):
+        return self.slots
+
+    def row(self, day):
+        start = self.row_offset[day]
+        return self.cells[start:start + len(self.slots)]
+
+    def rows(self):
+        for day in self.days:
+            yield day, self.row(day)
+
+    def to_frame(self):
+        import pandas as pd
+
+        frame = pd.DataFrame([self.row(d) for d in self.days], index=self.days, columns=self.slots)
+        frame.index.name = self.name
+        return frame
@@ -0,0 +1,608 @@
+"""Simulated-annealing improvement pass over finished timetables.
+
+``generate_timetable`` commits to the first legal placement it finds, so the
+result can leave hours unscheduled or pile a section's classes onto a few
+days.  LocalSearch takes every department of a finished run (schedulers plus
+their grids, all sharing the same global state) and improves it with local
+moves:
+
+- move    - put one session in another window of any day, keeping its room
+            when possible;
+- swap    - exchange the start slots of two sessions of the same section;
+- room    - give one session a different room at the same time;
+- insert  - place a chunk of an unscheduled course.
+
+Only regular sessions move.  Elective placeholders and combined courses are
+templates shared across departments and stay pinned.  Every placement goes
+through the checks ``_allocate_session`` applies to a regular course (free
+section cells, one session per course and day, one lab per day, faculty and
+room occupancy, room type and policy) plus the backtracking solver's stricter
+rule that a session may not end right before another one.  Faculty members are
+also kept clash-free across departments, and a room is never taken from a
+slot that an elective basket still needs.
+
+Moves are applied, scored on the handful of section-days, faculty-days and
+course room sets they touch, and undone when rejected.  The cost is, in order
+of weight, unscheduled hours, faculty hours above ``FACULTY_DAILY_HOURS`` a
+day, extra rooms per course and the sum of squared teaching hours per section
+and day (an uneven week costs more).  Worse moves are accepted with the usual
+annealing probability, recently moved sessions are tabu unless the move
+reaches a new best, and the best state seen is restored at the end.
+"""
+
+import math
+import random
+import time
+from collections import deque
+
+from timetable_automation.entries import EntryStore, session_display, session_type_of, split_faculty
+from timetable_automation.occupancy import scope_for_sheet
+from timetable_automation.records import ScheduledEntry
+
+FACULTY_DAILY_HOURS = 4
+SESSION_CHUNKS = {"L": 1.5, "T": 1, "P": 2}
+SESSION_TYPES = {"Lecture": "L", "Tutorial": "T", "Lab": "P"}
+
+
+class Session:
+    __slots__ = (
+        "dept", "sheet", "code", "kind", "faculty", "names", "hours", "movable", "order",
+        "day", "slots", "room", "display", "entries", "origin",
+    )
+
+    def __init__(self, dept, sheet, code, kind, faculty, hours, movable, order):
+        self.dept = dept
+        self.sheet = sheet
+        self.code = code
+        self.kind = kind
+        self.faculty = faculty
+        self.names = split_faculty(faculty)
+        self.hours = hours
+        self.movable = movable
+        self.order = order
+        self.day = None
+        self.slots = ()
+        self.room = ""
+        self.display = ""
+        self.entries = ()
+        self.origin = None
+
+
+class _Department:
+    def __init__(self, index, scheduler, timetables):
+        self.index = index
+        self.scheduler = scheduler
+        self.timetables = timetables
+        self.courses = {}
+        for course in scheduler.courses:
+            self.courses.setdefault(course.code, course)
+
+
+class _DayState:
+    __slots__ = ("sessions", "classes", "busy", "hours")
+
+    def __init__(self):
+        self.sessions = []
+        self.classes = 0
+        self.busy = 0
+        self.hours = 0.0
+
+
+def session_hours(course, kind, slot_hours):
+    # The duration the retry loop asked for: a full chunk or the remainder,
+    # whichever a window of these slots is the minimal fit for.
+    total = {"L": course.L, "T": course.T, "P": course.P}[kind]
+    chunk = SESSION_CHUNKS[kind]
+    candidates = {min(chunk, total), total % chunk}
+    fits = [h for h in candidates if h > 0 and sum(slot_hours[:-1]) < h <= sum(slot_hours) + 1e-9]
+    return max(fits) if fits else sum(slot_hours)
+
+
+class LocalSearch:
+    W_UNSCHEDULED = 100.0
+    W_OVERLOAD = 4.0
+    W_CHURN = 1.0
+    W_SPREAD = 1.0
+    TABU_TENURE = 8
+
+    def __init__(
+        self,
+        departments,
+        time_budget=5.0,
+        max_moves=None,
+        rng=None,
+        start_temperature=2.0,
+        end_temperature=0.05,
+        faculty_daily_hours=FACULTY_DAILY_HOURS,
+    ):
+        # departments: (scheduler, {sheet_name: grid}) per department, in run order.
+        self.departments = [_Department(i, sch, grids) for i, (sch, grids) in enumerate(departments)]
+        self.time_budget = time_budget
+        self.max_moves = max_moves
+        self.rng = rng if rng is not None else random
+        self.start_temperature = start_temperature
+        self.end_temperature = end_temperature
+        self.faculty_daily_hours = faculty_daily_hours
+        self.day_states = {}
+        self.faculty_hours = {}
+        self.faculty_slots = {}
+        self.course_rooms = {}
+        self.elective_demand = {}
+        self.sessions = []
+        self.pending = []
+        self._shapes = {}
+        self._starts = {}
+        self._next_order = 0
+        for dept in self.departments:
+            self._load(dept)
+
+    # ------------------------------------------------------------------ loading
+
+    def _load(self, dept):
+        sch = dept.scheduler
+        groups = {}
+        for i, ent in enumerate(sch.scheduled_entries):
+            groups.setdefault((ent["sheet"], ent["day"], ent["code"]), []).append((i, ent))
+        baskets = {}
+        for course in sch.courses:
+            if course.is_elective:
+                for sheet in dept.timetables:
+                    if sch._course_in_sheet_half(course, sheet):
+                        key = (sheet, f"Elective_{course.basket}")
+                        baskets[key] = baskets.get(key, 0) + 1
+
+        for (sheet, day, code), items in groups.items():
+            ents = [ent for _, ent in items]
+            first = ents[0]
+            kind = session_type_of(first)
+            slots = tuple(ent["slot"] for ent in ents)
+            course = dept.courses.get(code)
+            movable = bool(course is not None and not course.is_elective and not course.is_combined and first["room"])
+            slot_hours = [sch.slot_durations[s] for s in slots]
+            hours = session_hours(course, kind, slot_hours) if movable else sum(slot_hours)
+            sess = Session(dept, sheet, code, kind, first["faculty"], hours, movable, items[0][0])
+            sess.day, sess.slots, sess.room, sess.display = day, slots, first["room"], first["display"]
+            sess.entries = ents
+            sess.origin = (day, slots, first["room"])
+            self._index(sess)
+            demand = baskets.get((sheet, code), 0)
+            if demand > 1:
+                for slot in slots:
+                    key = (scope_for_sheet(sheet), day, slot)
+                    self.elective_demand[key] = max(self.elective_demand.get(key, 0), demand)
+            if movable:
+                self.sessions.append(sess)
+        self._next_order = max(self._next_order, len(sch.scheduled_entries))
+
+        for row in sch.unscheduled_courses:
+            kind = SESSION_TYPES.get(row["type"])
+            course = dept.courses.get(row["course_code"])
+            if kind is None or course is None or course.is_elective or course.is_combined:
+                continue
+            remaining = row["remaining_hours"]
+            while remaining > 0:
+                hours = min(SESSION_CHUNKS[kind], remaining)
+                sess = Session(dept, row["sheet"], course.code, kind, row["faculty"], hours, True, None)
+                sess.origin = row
+                self.sessions.append(sess)
+                self.pending.append(sess)
+                remaining -= hours
+
+        for (d, sheet, day), state in self.day_states.items():
+            if d is dept:
+                self._redraw(d, sheet, day, state)
+
+    def _index(self, sess):
+        dept, sheet, day = sess.dept, sess.sheet, sess.day
+        state = self.day_states.get((dept, sheet, day))
+        if state is None:
+            state = self.day_states[(dept, sheet, day)] = _DayState()
+        state.sessions.append(sess)
+        state.hours += sess.hours
+        self._add_faculty(sess, 1)
+        if sess.room and sess.movable:
+            rooms = self.course_rooms.setdefault((dept, sess.code), {})
+            rooms[sess.room] = rooms.get(sess.room, 0) + 1
+
+    def _add_faculty(self, sess, sign):
+        geo = sess.dept.scheduler.geometry
+        for name in sess.names:
+            key = (name, sess.sheet, sess.day)
+            self.faculty_hours[key] = self.faculty_hours.get(key, 0.0) + sign * sess.hours
+            counts = self.faculty_slots.setdefault(key, {})
+            for slot in sess.slots:
+                b = geo.bit[slot]
+                counts[b] = counts.get(b, 0) + sign
+                if not counts[b]:
+                    del counts[b]
+
+    def _faculty_busy(self, name, sheet, day):
+        # Keys are the distinct slot bits still held by someone, so their sum is the mask.
+        counts = self.faculty_slots.get((name, sheet, day))
+        return sum(counts) if counts else 0
+
+    # ----------------------------------------------------------------- geometry
+
+    def _shape(self, geo, occupancy, slots):
+        # (grid mask, trailing grid mask, occupancy mask) of a slot tuple.
+        key = (id(geo), slots)
+        shape = self._shapes.get(key)
+        if shape is None:
+            mask = sum(geo.bit[s] for s in slots)
+            trailing = sum(geo.bit[s] for s in geo.trailing[slots[-1]]) & geo.teaching_mask
+            shape = self._shapes[key] = (mask, trailing, occupancy.mask_for(slots))
+        return shape
+
+    def _window_at(self, geo, hours, start):
+        key = (id(geo), hours)
+        starts = self._starts.get(key)
+        if starts is None:
+            starts = self._starts[key] = {}
+            for window in geo.windows(hours):
+                starts.setdefault(window.start, window)
+        return starts.get(start)
+
+    def _redraw(self, dept, sheet, day, state):
+        # Class cells, then a BREAK after every session where nothing else is.
+        geo = dept.scheduler.geometry
+        occupancy = dept.scheduler.occupancy
+        classes = trailing = 0
+        for sess in state.sessions:
+            mask, after, _ = self._shape(geo, occupancy, sess.slots)
+            classes |= mask
+            trailing |= after
+        busy = classes | (trailing & ~classes)
+        changed = state.busy | busy
+        state.classes, state.busy = classes, busy
+        if not changed:
+            return
+        grid = dept.timetables[sheet]
+        for slot in geo.slots:
+            b = geo.bit[slot]
+            if changed & b:
+                grid.at[day, slot] = "BREAK" if busy & b else ""
+        for sess in state.sessions:
+            for slot in sess.slots:
+                grid.at[day, slot] = sess.display
+
+    # ------------------------------------------------------------ place/remove
+
+    def _remove(self, sess):
+        dept, sheet, day = sess.dept, sess.sheet, sess.day
+        sch = dept.scheduler
+        state = self.day_states[(dept, sheet, day)]
+        state.sessions.remove(sess)
+        state.hours -= sess.hours
+        self._add_faculty(sess, -1)
+        _, _, occ_mask = self._shape(sch.geometry, sch.occupancy, sess.slots)
+        scope = scope_for_sheet(sheet)
+        sch.occupancy.release("room", scope, sess.room, day, occ_mask)
+        room_usage = sch._sheet_scoped_usage(sch.global_room_usage, sheet).get(day, {})
+        for slot in sess.slots:
+            rooms = room_usage.get(slot)
+            if rooms and sess.room in rooms:
+                rooms.remove(sess.room)
+        if sess.faculty:
+            sch.faculty_calendar.release((sch.dept_name, sheet), sess.faculty, sheet, day, occ_mask)
+        rooms = self.course_rooms[(dept, sess.code)]
+        rooms[sess.room] -= 1
+        if not rooms[sess.room]:
+            del rooms[sess.room]
+        self._redraw(dept, sheet, day, state)
+        sess.day = None
+
+    def _place(self, sess, day, slots, room):
+        dept, sheet = sess.dept, sess.sheet
+        sch = dept.scheduler
+        sess.day, sess.slots, sess.room = day, slots, room
+        sess.display = session_display(sess.code, sess.kind, room)
+        self._index(sess)
+        _, _, occ_mask = self._shape(sch.geometry, sch.occupancy, slots)
+        sch.occupancy.occupy("room", scope_for_sheet(sheet), room, day, occ_mask)
+        room_usage = sch._sheet_scoped_usage(sch.global_room_usage, sheet).setdefault(day, {})
+        for slot in slots:
+            rooms = room_usage.setdefault(slot, [])
+            if room not in rooms:
+                rooms.append(room)
+        if sess.faculty:
+            sch.faculty_calendar.claim((sch.dept_name, sheet), sess.faculty, sheet, day, occ_mask)
+        self._redraw(dept, sheet, day, self.day_states[(dept, sheet, day)])
+
+    # ------------------------------------------------------------------- rules
+
+    def _slots_ok(self, sess, day, slots):
+        # Everything except the room, with sess itself already removed.
+        dept, sheet = sess.dept, sess.sheet
+        sch = dept.scheduler
+        mask, trailing, occ_mask = self._shape(sch.geometry, sch.occupancy, slots)
+        state = self.day_states.get((dept, sheet, day))
+        if state is not None:
+            if mask & state.busy or trailing & state.classes:
+                return False
+            for other in state.sessions:
+                if other.code == sess.code or (sess.kind == "P" and other.kind == "P"):
+                    return False
+        if sess.faculty and sch.faculty_calendar.clash(sess.faculty, sheet, day, occ_mask):
+            return False
+        for name in sess.names:
+            if self._faculty_busy(name, sheet, day) & mask:
+                return False
+        return True
+
+    def _room_ok(self, sess, day, slots, room):
+        sch = sess.dept.scheduler
+        profile = sch.room_symbols.profile(room)
+        if profile.is_lab != (sess.kind == "P") or profile.is_c004:
+            return False
+        scope = scope_for_sheet(sess.sheet)
+        _, _, occ_mask = self._shape(sch.geometry, sch.occupancy, slots)
+        if sch.occupancy.busy("room", scope, room, day) & occ_mask:
+            return False
+        elective_rooms = sch._sheet_scoped_usage(sch.global_elective_room_usage, sess.sheet).get(day, {})
+        room_usage = sch._sheet_scoped_usage(sch.global_room_usage, sess.sheet).get(day, {})
+        for slot in slots:
+            if room in elective_rooms.get(slot, ()):
+                return False
+            need = self.elective_demand.get((scope, day, slot))
+            if need and len(sch.all_rooms) - len(room_usage.get(slot, ())) - 1 < need:
+                return False
+        return True
+
+    def _pick_room(self, sess, day, slots, tries=3):
+        sch = sess.dept.scheduler
+        for room in (sess.room, sch.course_room_map.get(sess.code)):
+            if room and self._room_ok(sess, day, slots, room):
+                return room
+        pool = sch.labs if sess.kind == "P" else sch.classrooms
+        for _ in range(min(tries, len(pool))):
+            room = self.rng.choice(pool)
+            if self._room_ok(sess, day, slots, room):
+                return room
+        return ""
+
+    # -------------------------------------------------------------------- cost
+
+    def _local_cost(self, sessions, days):
+        # Cost of every key the sessions touch on the given days.
+        cost = 0.0
+        seen = set()
+        for sess in sessions:
+            for day in days:
+                key = (sess.dept, sess.sheet, day)
+                if key not in seen:
+                    seen.add(key)
+                    state = self.day_states.get(key)
+                    if state is not None:
+                        cost += self.W_SPREAD * state.hours * state.hours
+                for name in sess.names:
+                    fkey = (name, sess.sheet, day)
+                    if fkey not in seen:
+                        seen.add(fkey)
+                        over = self.faculty_hours.get(fkey, 0.0) - self.faculty_daily_hours
+                        if over > 0:
+                            cost += self.W_OVERLOAD * over
+            rkey = (sess.dept, sess.code)
+            if rkey not in seen:
+                seen.add(rkey)
+                rooms = self.course_rooms.get(rkey)
+                if rooms:
+                    cost += self.W_CHURN * (len(rooms) - 1)
+        return cost
+
+    def cost(self):
+        total = self.W_UNSCHEDULED * sum(s.hours for s in self.pending)
+        total += self.W_SPREAD * sum(s.hours * s.hours for s in self.day_states.values())
+        total += self.W_OVERLOAD * sum(
+            h - self.faculty_daily_hours for h in self.faculty_hours.values() if h > self.faculty_daily_hours
+        )
+        total += self.W_CHURN * sum(len(r) - 1 for r in self.course_rooms.values() if r)
+        return total
+
+    # ------------------------------------------------------------------- moves
+
+    def _random_window(self, sess):
+        geo = sess.dept.scheduler.geometry
+        windows = geo.windows(sess.hours)
+        if not windows:
+            return None, None
+        return self.rng.choice(sess.dept.scheduler.days), self.rng.choice(windows).slots
+
+    def _relocate(self, moves):
+        # moves: [(session, day, slots, room or None)]; all are lifted first,
+        # then placed in order.  Returns the undo list, or None if illegal.
+        lifted = []
+        for sess, _, _, _ in moves:
+            if sess.day is not None:
+                lifted.append((sess, sess.day, sess.slots, sess.room))
+                self._remove(sess)
+        placed = []
+        for sess, day, slots, room in moves:
+            if self._slots_ok(sess, day, slots):
+                room = room if room and self._room_ok(sess, day, slots, room) else self._pick_room(sess, day, slots)
+                if room:
+                    self._place(sess, day, slots, room)
+                    placed.append(sess)
+                    continue
+            for p in placed:
+                self._remove(p)
+            for s, d, sl, r in lifted:
+                self._place(s, d, sl, r)
+            return None
+        return lifted
+
+    def _undo(self, moves, lifted):
+        for sess, _, _, _ in moves:
+            if sess.day is not None:
+                self._remove(sess)
+        for sess, day, slots, room in lifted:
+            self._place(sess, day, slots, room)
+
+    def _propose(self):
+        rng = self.rng
+        roll = rng.random()
+        if self.pending and roll < 0.1:
+            sess = rng.choice(self.pending)
+            day, slots = self._random_window(sess)
+            return ([(sess, day, slots, None)] if day else None), -self.W_UNSCHEDULED * sess.hours
+        if not self.placed:
+            return None, 0.0
+        sess = rng.choice(self.placed)
+        if roll < 0.55:
+            day, slots = self._random_window(sess)
+            if day is None or (day, slots) == (sess.day, sess.slots):
+                return None, 0.0
+            return [(sess, day, slots, sess.room)], 0.0
+        if roll < 0.8:
+            state = self.day_states.get((sess.dept, sess.sheet, rng.choice(sess.dept.scheduler.days)))
+            partners = [s for s in state.sessions if s.movable and s is not sess] if state else ()
+            if not partners:
+                return None, 0.0
+            other = rng.choice(partners)
+            geo = sess.dept.scheduler.geometry
+            a = self._window_at(geo, sess.hours, geo.index[other.slots[0]])
+            b = self._window_at(geo, other.hours, geo.index[sess.slots[0]])
+            if a is None or b is None:
+                return None, 0.0
+            return [(sess, other.day, a.slots, sess.room), (other, sess.day, b.slots, other.room)], 0.0
+        sch = sess.dept.scheduler
+        pool = sch.labs if sess.kind == "P" else sch.classrooms
+        room = rng.choice(pool) if pool else ""
+        if not room or room == sess.room:
+            return None, 0.0
+        return [(sess, sess.day, sess.slots, room)], 0.0
+
+    # --------------------------------------------------------------------- run
+
+    def _snapshot(self):
+        return [(s, s.day, s.slots, s.room) for s in self.sessions]
+
+    def _restore(self, snapshot):
+        for sess in self.sessions:
+            if sess.day is not None:
+                self._remove(sess)
+        for sess, day, slots, room in snapshot:
+            if day is not None:
+                self._place(sess, day, slots, room)
+        self._sync_lists()
+
+    def _sync_lists(self):
+        self.placed = [s for s in self.sessions if s.day is not None]
+        self.pending = [s for s in self.sessions if s.day is None]
+
+    def run(self):
+        start = time.perf_counter()
+        self._sync_lists()
+        initial = current = best = self.cost()
+        best_snapshot = None
+        tabu = deque(maxlen=self.TABU_TENURE)
+        stats = {"moves": 0, "accepted": 0, "illegal": 0}
+        temperature = self.start_temperature
+        ratio = self.end_temperature / self.start_temperature
+        while True:
+            if self.max_moves is not None and stats["moves"] >= self.max_moves:
+                break
+            if not stats["moves"] & 255:
+                elapsed = time.perf_counter() - start
+                if self.time_budget is not None and elapsed >= self.time_budget:
+                    break
+                if self.time_budget:
+                    progress = elapsed / self.time_budget
+                elif self.max_moves:
+                    progress = stats["moves"] / self.max_moves
+                else:
+                    progress = 0.0
+                temperature = self.start_temperature * ratio ** progress
+            stats["moves"] += 1
+            moves, bonus = self._propose()
+            if not moves:
+                stats["illegal"] += 1
+                continue
+            touched = [m[0] for m in moves]
+            days = list(dict.fromkeys([m[1] for m in moves] + [s.day for s in touched if s.day is not None]))
+            before = self._local_cost(touched, days)
+            lifted = self._relocate(moves)
+            if lifted is None:
+                stats["illegal"] += 1
+                continue
+            delta = self._local_cost(touched, days) - before + bonus
+            is_tabu = any(s in tabu for s in touched)
+            if (is_tabu and current + delta >= best - 1e-9) or (
+                delta > 1e-9 and self.rng.random() >= math.exp(-delta / temperature)
+            ):
+                self._undo(moves, lifted)
+                continue
+            if delta > 1e-9 and current <= best + 1e-9 and best_snapshot is None:
+                # Leaving the best state seen so far: remember it as it was
+                # before this move.
+                prior = {s: (s, d, sl, r) for s, d, sl, r in lifted}
+                best_snapshot = [
+                    prior.get(snap[0], (snap[0], None, (), "")) if snap[0] in touched else snap
+                    for snap in self._snapshot()
+                ]
+            stats["accepted"] += 1
+            current += delta
+            tabu.extend(touched)
+            if bonus:
+                self._sync_lists()
+            if current < best - 1e-9:
+                best = current
+                best_snapshot = None
+        if best_snapshot is not None and current > best + 1e-9:
+            self._restore(best_snapshot)
+            current = best
+        self._sync_lists()
+        stats.update(
+            initial_cost=initial,
+            final_cost=self.cost(),
+            inserted_hours=sum(s.hours for s in self.placed if s.order is None),
+        )
+        self._write_back()
+        stats["seconds"] = time.perf_counter() - start
+        return stats
+
+    def _write_back(self):
+        # Rebuild each department's entry store in the original order and
+        # shrink the unscheduled rows by whatever was inserted.
+        for dept in self.departments:
+            sch = dept.scheduler
+            sessions = []
+            for (d, _, _), state in self.day_states.items():
+                if d is dept:
+                    sessions.extend(state.sessions)
+            for sess in sessions:
+                if sess.order is None:
+                    sess.order = self._next_order
+                    self._next_order += 1
+                    row = sess.origin
+                    row["remaining_hours"] -= sess.hours
+                    sess.origin = (None, (), "")
+                    if not sch.course_room_map.get(sess.code):
+                        sch.course_room_map[sess.code] = sess.room
+            sessions.sort(key=lambda s: s.order)
+            entries = []
+            for sess in sessions:
+                if (sess.day, sess.slots, sess.room) != sess.origin:
+                    sess.entries = [
+                        ScheduledEntry(
+                            sheet=sess.sheet,
+                            day=sess.day,
+                            slot=slot,
+                            code=sess.code,
+                            display=sess.display,
+                            faculty=sess.faculty,
+                            room=sess.room,
+                        )
+                        for slot in sess.slots
+                    ]
+                    sess.origin = (sess.day, sess.slots, sess.room)
+                entries.extend(sess.entries)
+            sch.scheduled_entries = EntryStore(entries)
+            sch.unscheduled_courses = [r for r in sch.unscheduled_courses if r["remaining_hours"] > 1e-9]
+
+
+def format_improvement_report(stats):
+    return (
+        f"Improvement pass: {stats['moves']} moves ({stats['accepted']} accepted) in {stats['seconds']:.1f}s,"
+        f" cost {stats['initial_cost']:.1f} -> {stats['final_cost']:.1f},"
+        f" {stats['inserted_hours']:.1f}h of unscheduled courses placed"
+    )
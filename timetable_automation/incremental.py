@@ -0,0 +1,268 @@
+"""Incremental re-scheduling after course files change.
+
+A sequential run saves its solved state (see runstate.py).
+``incremental_run`` diffs the current inputs against that state and decides
+what to re-solve:
+
+- a changed rooms or slots file, or no usable state, means a full run;
+- a department whose course file changed is re-solved;
+- a changed elective drops its basket's slot, representative and room
+  templates for the semester, so every section of that semester with the
+  basket is re-solved;
+- a changed combined course drops its templates for the semester and
+  cluster, so every section sharing it is re-solved.
+
+Every other department is pinned.  Its saved entries are replayed into a
+fresh shared state: room claims, combined room owners and elective slot
+usage.  The affected departments are then solved around them in the usual
+order.  Only their workbooks and the combined faculty workbook are
+rewritten.
+"""
+
+import os
+import re
+import time
+
+from timetable_automation.entries import EntryStore, split_faculty
+from timetable_automation.inputs import default_cache as default_input_cache
+from timetable_automation.main import (
+    Course,
+    Scheduler,
+    _resolve_combined_cluster_from_dept,
+    generate_all_departments,
+    new_global_state,
+    parse_courses,
+    write_combined_faculty_workbook,
+)
+from timetable_automation.records import ScheduledEntry, UnscheduledCourse
+from timetable_automation.runstate import (
+    STATE_FILENAME,
+    course_signatures,
+    department_snapshot,
+    file_digest,
+    load_run_state,
+    save_run_state,
+    unpack_records,
+)
+from timetable_automation.symbols import upper_key
+
+
+def semester_group(dept_name):
+    match = re.search(r"\d+", str(dept_name).strip())
+    return match.group(0) if match else "UNKNOWN"
+
+
+_FIELD = {name: i for i, name in enumerate(Course.__slots__)}
+
+
+def plan_incremental(saved, departments, rooms_file, slots_file):
+    """Return what changed since ``saved``, or None when a full run is needed."""
+    if saved is None:
+        return None
+    if saved["rooms"] != file_digest(rooms_file) or saved["slots"] != file_digest(slots_file):
+        return None
+    old_departments = saved["departments"]
+    changed_departments = []
+    elective_templates = set()
+    combined_templates = set()
+    faculty = set()
+    for dept_name in list(departments) + [d for d in old_departments if d not in departments]:
+        old = old_departments.get(dept_name)
+        course_file = departments.get(dept_name)
+        if old is not None and course_file is not None and old["digest"] == file_digest(course_file):
+            continue
+        changed_departments.append(dept_name)
+        old_courses = old["courses"] if old is not None else {}
+        new_courses = course_signatures(default_input_cache.parsed(course_file, parse_courses)) if course_file is not None else {}
+        sem = semester_group(dept_name)
+        cluster = _resolve_combined_cluster_from_dept(dept_name)
+        for code in set(old_courses) | set(new_courses):
+            old_rows, new_rows = old_courses.get(code, ()), new_courses.get(code, ())
+            if old_rows == new_rows:
+                continue
+            for row in old_rows + new_rows:
+                faculty.update(split_faculty(row[_FIELD["faculty"]]))
+                if row[_FIELD["is_elective"]]:
+                    elective_templates.add((sem, row[_FIELD["basket"]]))
+                elif row[_FIELD["is_combined"]]:
+                    combined_templates.add((sem, cluster, code))
+
+    affected = []
+    for dept_name, course_file in departments.items():
+        sem = semester_group(dept_name)
+        cluster = _resolve_combined_cluster_from_dept(dept_name)
+        rows = [r for rs in course_signatures(default_input_cache.parsed(course_file, parse_courses)).values() for r in rs]
+        old = old_departments.get(dept_name)
+        if old is not None:
+            rows += [r for rs in old["courses"].values() for r in rs]
+        uses_template = any(
+            (sem, r[_FIELD["basket"]]) in elective_templates
+            if r[_FIELD["is_elective"]]
+            else (r[_FIELD["is_combined"]] and (sem, cluster, r[_FIELD["code"]]) in combined_templates)
+            for r in rows
+        )
+        if dept_name in changed_departments or uses_template:
+            affected.append(dept_name)
+    return {
+        "changed": changed_departments,
+        "affected": affected,
+        "elective_templates": elective_templates,
+        "combined_templates": combined_templates,
+        "faculty": faculty,
+    }
+
+
+def _kept_templates(saved, plan):
+    # Copy the saved templates minus those of changed electives and combined courses.
+    saved_state = saved["state"]
+    electives = plan["elective_templates"]
+    combined = plan["combined_templates"]
+    elective_codes = {
+        (semester_group(dept_name), upper_key(row[_FIELD["code"]]))
+        for dept_name, snapshot in saved["departments"].items()
+        for rows in snapshot["courses"].values()
+        for row in rows
+        if row[_FIELD["is_elective"]] and (semester_group(dept_name), row[_FIELD["basket"]]) in electives
+    }
+
+    def elective_owner_dropped(key):
+        # (sem, sheet, "__CODE__", code) or the legacy (sem, sheet, basket, title).
+        if key[2] == "__CODE__":
+            return (key[0], key[3]) in elective_codes
+        return (key[0], key[2]) in electives
+
+    kept = {
+        "global_elective_slots": {
+            k: v for k, v in saved_state["global_elective_slots"].items() if (k[0], k[2]) not in electives
+        },
+        "global_elective_representatives": {
+            k: v for k, v in saved_state["global_elective_representatives"].items() if (k[0], k[2]) not in electives
+        },
+        "global_elective_room_templates": {
+            k: v for k, v in saved_state["global_elective_room_templates"].items() if not elective_owner_dropped(k)
+        },
+        "global_combined_slots": {
+            k: v for k, v in saved_state["global_combined_slots"].items() if (k[0], k[1], k[3]) not in combined
+        },
+    }
+    usage = {}
+    for sheet, days in saved_state["global_elective_room_usage"].items():
+        for day, slots in days.items():
+            for slot, rooms in slots.items():
+                for room, owner in rooms.items():
+                    if not elective_owner_dropped(owner):
+                        usage.setdefault(sheet, {}).setdefault(day, {}).setdefault(slot, {})[room] = owner
+    kept["global_elective_room_usage"] = usage
+    return kept
+
+
+def incremental_run(
+    departments,
+    rooms_file,
+    slots_file,
+    state_file=STATE_FILENAME,
+    faculty_filename="faculty_timetable.xlsx",
+    solver_mode="greedy",
+    seed=None,
+    scheduler_options=None,
+):
+    """Re-solve only what changed since ``state_file``; return the plan used.
+
+    Falls back to a full run (plan ``None``) when there is no usable state or
+    the rooms or slots changed.  The new state is saved either way.
+    """
+    options = scheduler_options or {}
+    saved = load_run_state(state_file)
+    plan = plan_incremental(saved, departments, rooms_file, slots_file)
+    if plan is None:
+        generate_all_departments(
+            departments,
+            rooms_file=rooms_file,
+            slots_file=slots_file,
+            faculty_filename=faculty_filename,
+            solver_mode=solver_mode,
+            seed=seed,
+            state_file=state_file,
+            scheduler_options=options,
+        )
+        return None
+
+    start = time.perf_counter()
+    state = new_global_state(departments)
+    state.update(_kept_templates(saved, plan))
+    schedulers = {}
+    for dept_name, course_file in departments.items():
+        if dept_name in plan["affected"]:
+            continue
+        snapshot = saved["departments"][dept_name]
+        scheduler = Scheduler(slots_file, course_file, rooms_file, dept_name=dept_name, **state, **options)
+        scheduler.restore_entries(unpack_records(snapshot["entries"], ScheduledEntry))
+        scheduler.course_room_map = dict(snapshot["course_room_map"])
+        scheduler.unscheduled_courses = unpack_records(snapshot["unscheduled"], UnscheduledCourse)
+        schedulers[dept_name] = scheduler
+
+    for dept_name, course_file in departments.items():
+        if dept_name not in plan["affected"]:
+            continue
+        print(f"\nRe-generating student timetable for {dept_name}...")
+        stale = f"{dept_name}_unscheduled_courses.xlsx"
+        if os.path.exists(stale):
+            os.remove(stale)
+        scheduler = Scheduler(
+            slots_file,
+            course_file,
+            rooms_file,
+            dept_name=dept_name,
+            solver_mode=solver_mode,
+            seed=seed,
+            **state,
+            **options,
+        )
+        scheduler.run_all_outputs(
+            dept_name_prefix=dept_name,
+            student_filename=f"{dept_name}_timetable.xlsx",
+            defer_faculty_export=True,
+        )
+        schedulers[dept_name] = scheduler
+
+    all_scheduled_entries = EntryStore()
+    snapshots = {}
+    for dept_name, course_file in departments.items():
+        scheduler = schedulers[dept_name]
+        all_scheduled_entries.extend(scheduler.scheduled_entries)
+        for k, v in scheduler.course_room_map.items():
+            state["global_room_usage"].setdefault("MAPPING", {})[k] = v
+        snapshots[dept_name] = department_snapshot(course_file, scheduler)
+    write_combined_faculty_workbook(
+        departments,
+        slots_file,
+        rooms_file,
+        state,
+        all_scheduled_entries,
+        faculty_filename,
+        scheduler_options=options,
+    )
+    save_run_state(state_file, rooms_file, slots_file, state, snapshots)
+    plan["seconds"] = time.perf_counter() - start
+    return plan
+
+
+def format_incremental_report(plan):
+    if plan is None:
+        return "Incremental: no usable saved state (or rooms/slots changed); ran every department."
+    if not plan["affected"]:
+        return f"Incremental: no course changes; nothing re-solved ({plan['seconds']:.1f}s)."
+    lines = [
+        f"Incremental: re-solved {len(plan['affected'])} department(s) in {plan['seconds']:.1f}s:"
+        f" {', '.join(plan['affected'])}",
+        f"  changed course files: {', '.join(plan['changed'])}",
+    ]
+    if plan["elective_templates"]:
+        baskets = ", ".join(f"sem {s} basket {b}" for s, b in sorted(plan["elective_templates"]))
+        lines.append(f"  elective templates reset: {baskets}")
+    if plan["combined_templates"]:
+        combined = ", ".join(f"sem {s} {c} {code}" for s, c, code in sorted(plan["combined_templates"]))
+        lines.append(f"  combined templates reset: {combined}")
+    if plan["faculty"]:
+        lines.append(f"  faculty with changed courses: {', '.join(sorted(plan['faculty']))}")
+    return "\n".join(lines)
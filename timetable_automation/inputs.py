@@ -0,0 +1,106 @@
+"""Parse-once cache for the input CSV files.
+
+Every Scheduler used to re-read the slot, room and course CSVs with pandas and
+the combined-strength and faculty-workbook helpers read each course file
+again.  ``InputCache`` parses a file once and hands out the same immutable
+result (tuples of records or of objects built from them) to every caller.
+
+Entries are keyed by absolute path, modification time and a SHA-1 of the file
+contents: an unchanged ``(path, mtime)`` skips re-hashing, and any edit to the
+file produces a new key.  With a ``cache_dir`` the parsed rows are also pickled
+to disk under their path and content hash, so a repeat run with the same
+inputs does not touch pandas at all.
+"""
+
+import hashlib
+import os
+import pickle
+
+CACHE_FORMAT = 1
+
+
+class InputCache:
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self._digests = {}
+        self._rows = {}
+        self._parsed = {}
+        self.parses = 0
+        self.disk_hits = 0
+
+    def key(self, path):
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        known = self._digests.get(path)
+        if known is None or known[0] != stamp:
+            with open(path, "rb") as fh:
+                known = (stamp, hashlib.sha1(fh.read()).hexdigest())
+            self._digests[path] = known
+        return (path, st.st_mtime_ns, known[1])
+
+    def _disk_path(self, key):
+        path, _, digest = key
+        name = hashlib.sha1(path.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{name}-{digest}.pkl")
+
+    def _load_disk(self, key):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "rb") as fh:
+                payload = pickle.load(fh)
+        except (OSError, EOFError, pickle.PickleError, AttributeError, ValueError):
+            return None
+        if payload.get("format") != CACHE_FORMAT or payload.get("digest") != key[2]:
+            return None
+        return payload["rows"]
+
+    def _save_disk(self, key, rows):
+        if not self.cache_dir:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        target = self._disk_path(key)
+        tmp = f"{target}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as fh:
+            pickle.dump({"format": CACHE_FORMAT, "path": key[0], "digest": key[2], "rows": rows}, fh)
+        os.replace(tmp, target)
+
+    def rows(self, path):
+        """Return the CSV rows as a tuple of ``{column: value}`` dicts."""
+        key = self.key(path)
+        rows = self._rows.get(key)
+        if rows is None:
+            rows = self._load_disk(key)
+            if rows is None:
+                import pandas as pd
+
+                self.parses += 1
+                rows = tuple(pd.read_csv(path).to_dict("records"))
+                self._save_disk(key, rows)
+            else:
+                self.disk_hits += 1
+            self._rows[key] = rows
+        return rows
+
+    def parsed(self, path, build):
+        """Return ``build(rows)`` for ``path``, computed once per file version."""
+        key = self.key(path) + (build.__qualname__,)
+        result = self._parsed.get(key)
+        if result is None:
+            result = self._parsed[key] = build(self.rows(path))
+        return result
+
+    def clear(self):
+        self._digests.clear()
+        self._rows.clear()
+        self._parsed.clear()
+
+
+default_cache = InputCache()
+
+
+def configure_input_cache(cache_dir=None):
+    """Point the shared cache at ``cache_dir`` (None keeps it in memory only)."""
+    default_cache.cache_dir = os.path.abspath(cache_dir) if cache_dir else None
+    return default_cache
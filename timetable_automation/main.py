@@ -1,12 +1,51 @@
-import pandas as pd
+import os
 import random
 import re
-from openpyxl import load_workbook
-from openpyxl.styles import Alignment, Border, Side, PatternFill, Font
+import time
+from timetable_automation.config import (
+    DEFAULT_COMBINED_ONLY_ROOMS,
+    DEFAULT_COMPULSORY_ONLY_ROOMS,
+    DEFAULT_DAYS,
+    DEFAULT_DEPARTMENTS,
+    DEFAULT_EXCLUDED_SLOTS,
+    DEFAULT_ROOMS_FILE,
+    DEFAULT_SLOTS_FILE,
+)
+from timetable_automation.entries import EntryStore, session_type_of, split_faculty
+from timetable_automation.faculty import FacultyCalendar
+from timetable_automation.geometry import slot_geometry
+from timetable_automation.grid import TimetableGrid
+from timetable_automation.inputs import default_cache as default_input_cache
+from timetable_automation.occupancy import OccupancyIndex, scope_for_sheet
+from timetable_automation.profiling import PROFILE_FILENAME, Profiler, profiling_enabled
+from timetable_automation.records import ScheduledEntry, UnscheduledCourse
+from timetable_automation.rooms import RoomIndex
+from timetable_automation.runstate import (
+    department_snapshot,
+    load_checkpoint,
+    save_checkpoint,
+    save_run_state,
+    unpack_records,
+)
+from timetable_automation.solver import SESSION_LABELS, BacktrackingSolver
+from timetable_automation.symbols import RoomTable, SymbolTable, upper_key
+# pandas, numpy and openpyxl are imported only where CSVs are parsed or
+# workbooks read and written, so importing this module stays cheap.  Nothing
+# is seeded on import: every Scheduler draws from its own generator.
 RANDOM_SEED = 42
-random.seed(RANDOM_SEED)
+
+
+def stream_seed(seed, *parts):
+    # String seeds are hashed the same way in every process (unlike hash()),
+    # so a (root seed, department, half) stream is reproducible anywhere.
+    return ":".join([str(seed)] + [str(p) for p in parts])
 
 class Course:
+    __slots__ = (
+        "code", "basket", "title", "faculty", "ltp", "semester_half",
+        "is_elective", "is_combined", "students", "L", "T", "P", "S", "C",
+    )
+
     def __init__(self, row):
         self.code = str(row["Course_Code"]).strip()
         self.basket = int(row.get("basket", 0))
@@ -34,6 +73,35 @@ class Course:
         except Exception:
             self.L, self.T, self.P = 0, 0, 0
 
+    @classmethod
+    def from_record(cls, record):
+        # View over one CourseTable row; the record is already parsed.
+        course = cls.__new__(cls)
+        for name, value in record.items():
+            setattr(course, name, value)
+        return course
+
+
+def parse_slots(rows):
+    return tuple(f"{row['Start_Time'].strip()}-{row['End_Time'].strip()}" for row in rows)
+
+
+def parse_courses(rows):
+    from timetable_automation.courses import load_course_table
+
+    return load_course_table(rows, Course.from_record)
+
+
+def parse_rooms(rows):
+    rooms = []
+    for row in rows:
+        try:
+            cap = max(0, int(float(str(row.get("Capacity", 0)).strip())))
+        except Exception:
+            cap = 0
+        rooms.append((str(row["Room_ID"]).strip(), cap))
+    return tuple(rooms)
+
 
 class Scheduler:
     def __init__(
@@ -52,26 +120,29 @@ class Scheduler:
         global_combined_room_usage=None,
         global_combined_strength=None,
         global_c004_reserved_slots=None,
+        global_occupancy=None,
+        global_faculty_calendar=None,
+        solver_mode="greedy",
+        input_cache=None,
+        profiler=None,
+        seed=None,
+        days=None,
+        excluded_slots=None,
+        compulsory_only_rooms=None,
+        combined_only_rooms=None,
     ):
-        df = pd.read_csv(slots_file)
-        self.slots = [f"{row['Start_Time'].strip()}-{row['End_Time'].strip()}" for _, row in df.iterrows()]
+        input_cache = input_cache if input_cache is not None else default_input_cache
+        self.slots = list(input_cache.parsed(slots_file, parse_slots))
         self.slot_durations = {s: self._slot_duration(s) for s in self.slots}
 
-        courses_df = pd.read_csv(courses_file)
-        self.courses = [Course(row) for _, row in courses_df.iterrows()]
+        self.courses = list(input_cache.parsed(courses_file, parse_courses))
 
-        rooms_df = pd.read_csv(rooms_file)
         self.classrooms = []
         self.labs = []
         self.all_rooms = []
         self.room_capacity = {}
-        for _, row in rooms_df.iterrows():
-            room_id = str(row["Room_ID"]).strip()
+        for room_id, cap in input_cache.parsed(rooms_file, parse_rooms):
             self.all_rooms.append(room_id)
-            try:
-                cap = max(0, int(float(str(row.get("Capacity", 0)).strip())))
-            except Exception:
-                cap = 0
             self.room_capacity[room_id.upper()] = cap
             if room_id.upper().startswith("L"):
                 self.labs.append(room_id)
@@ -79,22 +150,48 @@ class Scheduler:
                 self.classrooms.append(room_id)
             else:
                 continue
-        # Room policy:
+        # Room policy (overridable from the run config):
         # - C002/C003 are reserved for compulsory courses.
         # - C004 is reserved for combined courses only.
-        self.compulsory_only_classrooms = {"C002", "C003"}
-        self.non_compulsory_blocked_classrooms = {"C004"}
+        if compulsory_only_rooms is None:
+            compulsory_only_rooms = DEFAULT_COMPULSORY_ONLY_ROOMS
+        if combined_only_rooms is None:
+            combined_only_rooms = DEFAULT_COMBINED_ONLY_ROOMS
+        self.compulsory_only_classrooms = {upper_key(r) for r in compulsory_only_rooms}
+        self.non_compulsory_blocked_classrooms = {upper_key(r) for r in combined_only_rooms}
+        # Room ids and course codes are normalised once into symbol tables
+        # instead of at every check.
+        self.room_symbols = RoomTable(
+            self.all_rooms,
+            capacity=self.room_capacity,
+            compulsory_only=self.compulsory_only_classrooms,
+            non_compulsory_blocked=self.non_compulsory_blocked_classrooms,
+        )
+        self.room_index = RoomIndex(self.labs + self.classrooms, self.room_symbols)
+        self.code_symbols = SymbolTable(c.code for c in self.courses)
 
-        self.days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-        self.excluded_slots = ["07:30-09:00", "13:15-14:00"]
+        self.days = list(days if days is not None else DEFAULT_DAYS)
+        self.excluded_slots = list(excluded_slots if excluded_slots is not None else DEFAULT_EXCLUDED_SLOTS)
         self.MAX_ATTEMPTS = 2000
+        # Root seed of this run; generate_timetable draws from a generator
+        # seeded with (seed, department, sheet), so a sheet's timetable does
+        # not depend on what was scheduled before it or in which process.
+        self.seed = RANDOM_SEED if seed is None else seed
+        self.rng = random.Random(stream_seed(self.seed, dept_name))
+        # "greedy" keeps the random-retry loops; "backtracking" hands every
+        # non-template session of a sheet to BacktrackingSolver.
+        self.solver_mode = solver_mode
+        self.solver_time_limit = 5.0
+        self.solver_node_limit = 50000
         self.unscheduled_courses = []
         self.course_room_map = {}
         self.global_room_usage = global_room_usage
-        self.scheduled_entries = []
+        self.scheduled_entries = EntryStore()
         self.electives_by_sheet = {}
         self.elective_room_assignment = {}
         self.break_length_slots = 1
+        # Candidate windows per duration, shared by every Scheduler on the same slot file.
+        self.geometry = slot_geometry(self.slots, self.excluded_slots, self.break_length_slots)
         self.global_elective_slots = global_elective_slots if global_elective_slots is not None else {}
         self.dept_name = str(dept_name).strip()
         match = re.search(r"\d+", self.dept_name)
@@ -119,11 +216,37 @@ class Scheduler:
         self.global_c004_reserved_slots = (
             global_c004_reserved_slots if global_c004_reserved_slots is not None else {}
         )
+        # Bitmask mirror of global_room_usage. Schedulers that run side by side on
+        # the same usage dicts must share one index; otherwise seed a private one.
+        if global_occupancy is None:
+            global_occupancy = OccupancyIndex(self.slots)
+            global_occupancy.load_room_usage(self.global_room_usage)
+        self.occupancy = global_occupancy
+        # Faculty bookings of every department, on the same slot bits.
+        if global_faculty_calendar is None:
+            global_faculty_calendar = FacultyCalendar(self.occupancy)
+        self.faculty_calendar = global_faculty_calendar
+        self._lecturer_busy = None
         self.dept_prefix = self.dept_name.split("-")[0].strip().upper() if self.dept_name else ""
         self.combined_cluster_id = self._resolve_combined_cluster()
         # Soft constraint: prefer avoiding cross-sem elective overlap, but relax if needed.
         self.relax_cross_sem_elective_block = True
         self._bootstrap_c004_reserved_slots_from_templates()
+        # Drivers pass one shared Profiler; a standalone Scheduler makes its own
+        # when TIMETABLE_PROFILE is set and dumps it from run_all_outputs.
+        self._owns_profiler = profiler is None and profiling_enabled()
+        self.profiler = Profiler() if self._owns_profiler else profiler
+        if self.profiler is not None:
+            self.profiler.instrument(self)
+
+    @property
+    def scheduled_entries(self):
+        return self._scheduled_entries
+
+    @scheduled_entries.setter
+    def scheduled_entries(self, entries):
+        # Plain lists assigned by callers are wrapped so the indexes stay valid.
+        self._scheduled_entries = entries if isinstance(entries, EntryStore) else EntryStore(entries)
 
     def _elective_template_key(self, basket_id, session_type, sheet_name):
         # Share elective templates across all branches of the same semester.
@@ -149,12 +272,12 @@ class Scheduler:
         saved = self.global_elective_representatives.get(key)
 
         if isinstance(saved, dict):
-            code = str(saved.get("code", "")).strip().upper()
+            code = self.code_symbols.key(saved.get("code", ""))
             title = str(saved.get("title", "")).strip().lower()
             ltp = str(saved.get("ltp", "")).strip()
             if code:
                 for candidate in ordered:
-                    if str(candidate.code).strip().upper() == code:
+                    if self.code_symbols.key(candidate.code) == code:
                         return candidate
             if title:
                 for candidate in ordered:
@@ -206,29 +329,28 @@ class Scheduler:
         entries.append({"day": day, "slots": list(slots), "room": room})
 
     def _room_matches_session(self, room_id, session_type):
-        room_upper = room_id.upper()
         if session_type == "P":
-            return room_upper.startswith("L")
-        return not room_upper.startswith("L")
+            return self.room_symbols.profile(room_id).is_lab
+        return not self.room_symbols.profile(room_id).is_lab
 
     def _room_allowed_for_course(self, room_id, is_compulsory, is_combined_course=False):
-        room_upper = str(room_id).strip().upper()
+        room = self.room_symbols.profile(room_id)
         # Hard rule: C004 can only be used by combined courses.
-        if room_upper == "C004" and not is_combined_course:
+        if room.is_c004 and not is_combined_course:
             return False
-        if room_upper in self.compulsory_only_classrooms and not is_compulsory:
+        if room.compulsory_only and not is_compulsory:
             return False
-        if room_upper in self.non_compulsory_blocked_classrooms and not is_compulsory:
+        if room.non_compulsory_blocked and not is_compulsory:
             return False
         return True
 
     def _room_has_capacity(self, room_id, min_capacity_needed):
         if not min_capacity_needed or min_capacity_needed <= 0:
             return True
-        return self.room_capacity.get(str(room_id).strip().upper(), 0) >= min_capacity_needed
+        return self.room_symbols.profile(room_id).capacity >= min_capacity_needed
 
     def _combined_strength_key(self, code):
-        return (self.semester_group, self.combined_cluster_id, str(code).strip().upper())
+        return (self.semester_group, self.combined_cluster_id, self.code_symbols.key(code))
 
     def _required_capacity_for_course(self, course, is_elective, is_combined):
         if is_elective or not is_combined:
@@ -249,8 +371,7 @@ class Scheduler:
             if str(key[0]) != str(self.semester_group):
                 continue
             for ent in entries:
-                room = str(ent.get("room", "")).strip().upper()
-                if room != "C004":
+                if not self.room_symbols.profile(ent.get("room", "")).is_c004:
                     continue
                 day = ent.get("day")
                 for slot in ent.get("slots", []):
@@ -262,24 +383,54 @@ class Scheduler:
             sem_slots.add((day, slot))
 
     def _is_c004_available_for_course_slots(self, day, slots, room_id, is_combined_course):
-        if str(room_id).strip().upper() != "C004":
+        if not self.room_symbols.profile(room_id).is_c004:
             return True
         return bool(is_combined_course)
 
     def _is_room_available(self, day, slots, room_id, combined_key=None, sheet_name=None):
-        room_usage = self._sheet_scoped_usage(self.global_room_usage, sheet_name)
+        scope = scope_for_sheet(sheet_name)
+        clash = self.occupancy.busy("room", scope, room_id, day) & self.occupancy.mask_for(slots)
+        if not clash:
+            return True
+        if not combined_key:
+            return False
+        # Only slots already held by the same combined template may be shared.
         combined_room_usage = self._sheet_scoped_usage(self.global_combined_room_usage, sheet_name)
-        for slot in slots:
-            used_rooms = room_usage.get(day, {}).get(slot, [])
-            if room_id not in used_rooms:
-                continue
-            if not combined_key:
-                return False
+        for slot in self.occupancy.slots_in(clash):
             owner = combined_room_usage.get(day, {}).get(slot, {}).get(room_id)
             if owner != combined_key:
                 return False
         return True
 
+    def _claim_room(self, day, slots, room_id, sheet_name, combined_key=None):
+        room_usage = self._sheet_scoped_usage(self.global_room_usage, sheet_name)
+        combined_room_usage = self._sheet_scoped_usage(self.global_combined_room_usage, sheet_name)
+        for s in slots:
+            day_slots = room_usage.setdefault(day, {}).setdefault(s, [])
+            if room_id not in day_slots:
+                day_slots.append(room_id)
+            if combined_key:
+                combined_room_usage.setdefault(day, {}).setdefault(s, {})[room_id] = combined_key
+        self.occupancy.occupy("room", scope_for_sheet(sheet_name), room_id, day, self.occupancy.mask_for(slots))
+        if combined_key and self.room_symbols.profile(room_id).is_c004:
+            self._reserve_c004_slots(day, slots)
+
+    def _faculty_share_key(self, code, is_elective, combined_key, sheet_name):
+        # Sections taught together may book the same faculty slots.
+        if combined_key:
+            return combined_key
+        if is_elective:
+            return (self.semester_group, sheet_name, code)
+        return None
+
+    def _faculty_clash(self, lecturer_busy, day, faculty, slots, sheet_name, share=None):
+        if lecturer_busy is self._lecturer_busy:
+            return self.faculty_calendar.clash(faculty, sheet_name, day, self.occupancy.mask_for(slots), share)
+        day_busy = lecturer_busy.get(day, {})
+        if isinstance(day_busy, dict):
+            return any(faculty in day_busy.get(s, []) for s in slots)
+        return faculty in day_busy
+
     def _combined_day_order(self):
         sem = str(self.semester_group).strip()
         if sem == "1":
@@ -296,6 +447,38 @@ class Scheduler:
             return usage_map.setdefault(sheet_name, {})
         return usage_map
 
+    def _room_ok_for_session(
+        self,
+        room_id,
+        day,
+        slots,
+        session_type,
+        sheet_name=None,
+        combined_key=None,
+        is_compulsory=True,
+        min_capacity_needed=None,
+        is_combined_course=False,
+    ):
+        return (
+            self._room_matches_session(room_id, session_type)
+            and self._room_allowed_for_course(
+                room_id,
+                is_compulsory,
+                is_combined_course=is_combined_course,
+            )
+            and self._room_has_capacity(room_id, min_capacity_needed)
+            and self._is_c004_available_for_course_slots(
+                day, slots, room_id, is_combined_course
+            )
+            and self._is_room_available(
+                day,
+                slots,
+                room_id,
+                combined_key=combined_key,
+                sheet_name=sheet_name,
+            )
+        )
+
     def _pick_room_for_slots(
         self,
         day,
@@ -310,53 +493,57 @@ class Scheduler:
         is_combined_course=False,
     ):
         def room_ok(room_id):
-            return (
-                self._room_matches_session(room_id, session_type)
-                and self._room_allowed_for_course(
-                    room_id,
-                    is_compulsory,
-                    is_combined_course=is_combined_course,
-                )
-                and self._room_has_capacity(room_id, min_capacity_needed)
-                and self._is_c004_available_for_course_slots(
-                    day, slots, room_id, is_combined_course
-                )
-                and self._is_room_available(
-                    day,
-                    slots,
-                    room_id,
-                    combined_key=combined_key,
-                    sheet_name=sheet_name,
-                )
+            return self._room_ok_for_session(
+                room_id,
+                day,
+                slots,
+                session_type,
+                sheet_name=sheet_name,
+                combined_key=combined_key,
+                is_compulsory=is_compulsory,
+                min_capacity_needed=min_capacity_needed,
+                is_combined_course=is_combined_course,
             )
 
         if preferred_room and room_ok(preferred_room):
             return preferred_room
 
         # For combined lecture/tutorial sessions, prefer C004 first.
-        if is_combined_course and session_type != "P":
-            c004_room = next(
-                (r for r in self.classrooms if str(r).strip().upper() == "C004"),
-                "",
+        if is_combined_course and is_compulsory and session_type != "P":
+            room_id = self._first_free_room(
+                self.room_index.combined_only(False, min_capacity_needed),
+                day,
+                slots,
+                sheet_name=sheet_name,
+                combined_key=combined_key,
             )
-            if c004_room and room_ok(c004_room):
-                return c004_room
+            if room_id:
+                return room_id
 
         mapped = self.course_room_map.get(code)
         if mapped and room_ok(mapped):
             return mapped
 
-        possible_rooms = self.labs if session_type == "P" else self.classrooms
-        room_candidates = possible_rooms.copy()
-        if is_combined_course and session_type != "P":
-            c004_exact = [r for r in room_candidates if str(r).strip().upper() == "C004"]
-            others = [r for r in room_candidates if str(r).strip().upper() != "C004"]
-            random.shuffle(others)
-            room_candidates = c004_exact + others
-        else:
-            random.shuffle(room_candidates)
-        for room_id in room_candidates:
-            if room_ok(room_id):
+        candidates = self.room_index.candidates(
+            session_type == "P",
+            is_compulsory=is_compulsory,
+            is_combined=is_combined_course,
+            min_capacity=min_capacity_needed,
+        )
+        return self._first_free_room(candidates, day, slots, sheet_name=sheet_name, combined_key=combined_key)
+
+    def _first_free_room(self, candidates, day, slots, sheet_name=None, combined_key=None):
+        # candidates already satisfy the static rules (RoomIndex); only the
+        # occupancy masks are left to check.
+        scope = scope_for_sheet(sheet_name)
+        mask = self.occupancy.mask_for(slots)
+        busy = self.occupancy.busy
+        for room_id in candidates:
+            if not busy("room", scope, room_id, day) & mask:
+                return room_id
+            if combined_key and self._is_room_available(
+                day, slots, room_id, combined_key=combined_key, sheet_name=sheet_name
+            ):
                 return room_id
         return ""
 
@@ -380,17 +567,12 @@ class Scheduler:
         return (h2 + m2 / 60) - (h1 + m1 / 60)
 
     def _get_free_blocks(self, timetable, day):
-        free_blocks, block = [], []
-        for slot in self.slots:
-            if timetable.at[day, slot] == "" and slot not in self.excluded_slots:
-                block.append(slot)
-            else:
-                if block:
-                    free_blocks.append(block)
-                    block = []
-        if block:
-            free_blocks.append(block)
-        return free_blocks
+        return self.geometry.free_blocks(self.geometry.busy_mask(timetable, day))
+
+    def _free_windows(self, timetable, day, duration_hours):
+        # Minimal windows of free teaching slots covering duration_hours,
+        # tightest fit first.
+        return self.geometry.free_windows(duration_hours, self.geometry.busy_mask(timetable, day))
 
     def _allocate_session(
         self,
@@ -411,12 +593,9 @@ class Scheduler:
         preferred_room=None,
         min_capacity_needed=None,
     ):
-       
-        for entry in self.scheduled_entries:
-            if entry["day"] == day and entry["code"] == code and entry["sheet"] == sheet_name:
-                return None
-       
-        
+        if self.scheduled_entries.has_session(sheet_name, day, code):
+            return None
+
         if session_type == "P" and labs_scheduled[day]:
             return None
 
@@ -424,7 +603,7 @@ class Scheduler:
         valid_slots_found = None
         room_to_use = ""
         room_usage = self._sheet_scoped_usage(self.global_room_usage, sheet_name)
-        combined_room_usage = self._sheet_scoped_usage(self.global_combined_room_usage, sheet_name)
+        share = self._faculty_share_key(code, is_elective, combined_key, sheet_name)
 
         if force_slots:
             # FORCE MODE: Check if provided slots are free in local timetable
@@ -439,13 +618,8 @@ class Scheduler:
             
             if not conflict:
                 # Check faculty busy
-                if faculty:
-                    day_busy = lecturer_busy.get(day, {})
-                    if isinstance(day_busy, dict):
-                        if any(faculty in day_busy.get(s, []) for s in force_slots):
-                            conflict = True
-                    elif faculty in day_busy:
-                        conflict = True
+                if faculty and self._faculty_clash(lecturer_busy, day, faculty, force_slots, sheet_name, share):
+                    conflict = True
                 
             if not conflict:
                 valid_slots_found = force_slots
@@ -455,48 +629,14 @@ class Scheduler:
                          valid_slots_found = None
 
         else:
-            # SEARCH MODE: Find all candidate sub-blocks that fit the duration
-            free_blocks = self._get_free_blocks(timetable, day)
-            candidates = []
-
-            for block in free_blocks:
-                # Sliding window over the block
-                for i in range(len(block)):
-                    dur_accum = 0
-                    current_slots = []
-                    for j in range(i, len(block)):
-                        s = block[j]
-                        current_slots.append(s)
-                        dur_accum += self.slot_durations[s]
-                        
-                        if dur_accum >= duration_hours:
-                            # Found a valid sub-block
-                            waste = dur_accum - duration_hours
-                            candidates.append({
-                                'slots': current_slots,
-                                'waste': waste,
-                                'start_idx': i # mainly for stability if needed
-                            })
-                            # Once we reach required duration, we can stop extending strictly for "minimum fit"
-                            # But if the next slot creates a "better" fit (unlikely if duration increases), we'd continue.
-                            # Since slot durations are positive, adding more slots only increases waste. 
-                            # So we stop this inner extension loop.
-                            break 
-            
-            # Sort candidates by waste (ascending) to prefer tight fits
-            candidates.sort(key=lambda x: x['waste'])
+            # SEARCH MODE: free precomputed windows that fit the duration,
+            # already sorted by waste (tight fits first)
+            for window in self._free_windows(timetable, day, duration_hours):
+                current_slots = list(window.slots)
 
-            for cand in candidates:
-                current_slots = cand['slots']
-                
                 # Check faculty availability
-                if faculty:
-                    day_busy = lecturer_busy.get(day, {})
-                    if isinstance(day_busy, dict):
-                        if any(faculty in day_busy.get(s, []) for s in current_slots):
-                            continue
-                    elif faculty in day_busy:
-                        continue
+                if faculty and self._faculty_clash(lecturer_busy, day, faculty, current_slots, sheet_name, share):
+                    continue
 
                 # Check room capacity for electives
                 if is_elective and min_rooms_needed > 1:
@@ -548,7 +688,7 @@ class Scheduler:
                 return None
         if (
             not is_elective
-            and str(room_to_use).strip().upper() == "C004"
+            and self.room_symbols.profile(room_to_use).is_c004
             and not combined_key
         ):
             return None
@@ -561,14 +701,7 @@ class Scheduler:
                  self.course_room_map[code] = room_to_use
             
             if room_to_use:
-                for s in slots_to_use:
-                     day_slots = room_usage.setdefault(day, {}).setdefault(s, [])
-                     if room_to_use not in day_slots:
-                         day_slots.append(room_to_use)
-                     if combined_key:
-                         combined_room_usage.setdefault(day, {}).setdefault(s, {})[room_to_use] = combined_key
-                if combined_key and str(room_to_use).strip().upper() == "C004":
-                    self._reserve_c004_slots(day, slots_to_use)
+                self._claim_room(day, slots_to_use, room_to_use, sheet_name, combined_key)
 
         for i, s in enumerate(slots_to_use):
             if session_type == "L":
@@ -584,26 +717,28 @@ class Scheduler:
             timetable.at[day, s] = display_text
 
             self.scheduled_entries.append(
-                {
-                    "sheet": sheet_name,
-                    "day": day,
-                    "slot": s,
-                    "code": code,
-                    "display": display_text,
-                    "faculty": faculty,
-                    "room": room_to_use,
-                }
+                ScheduledEntry(
+                    sheet=sheet_name,
+                    day=day,
+                    slot=s,
+                    code=code,
+                    display=display_text,
+                    faculty=faculty,
+                    room=room_to_use,
+                )
             )
 
             # Mark gap slot if applies
             if i < len(slots_to_use) - 1:
-                idx = self.slots.index(s)
-                if idx + 1 < len(self.slots):
-                    gap_slot = self.slots[idx + 1]
-                    if timetable.at[day, gap_slot] == "" and self.slot_durations[gap_slot] == 0.25:
-                        timetable.at[day, gap_slot] = "FREE"
+                gap_slot = self.geometry.next_slot.get(s)
+                if gap_slot and self.slot_durations[gap_slot] == 0.25 and timetable.at[day, gap_slot] == "":
+                    timetable.at[day, gap_slot] = "FREE"
 
-        if faculty:
+        if faculty and lecturer_busy is self._lecturer_busy:
+            self.faculty_calendar.claim(
+                (self.dept_name, sheet_name), faculty, sheet_name, day, self.occupancy.mask_for(slots_to_use), share
+            )
+        elif faculty:
             day_busy = lecturer_busy.get(day, {})
             if isinstance(day_busy, dict):
                 day_busy = lecturer_busy.setdefault(day, {})
@@ -621,23 +756,36 @@ class Scheduler:
             labs_scheduled[day] = True
         
         # Add break
-        last_slot = slots_to_use[-1]
-        idx = self.slots.index(last_slot)
-        for extra in range(1, self.break_length_slots + 1):
-            if idx + extra < len(self.slots):
-                next_slot = self.slots[idx + extra]
-                if timetable.at[day, next_slot] == "":
-                    # Keep break as a local pacing constraint for this sheet only.
-                    # Do not reserve rooms globally for break slots.
-                    timetable.at[day, next_slot] = "BREAK"
+        for next_slot in self.geometry.trailing[slots_to_use[-1]]:
+            if timetable.at[day, next_slot] == "":
+                # Keep break as a local pacing constraint for this sheet only.
+                # Do not reserve rooms globally for break slots.
+                timetable.at[day, next_slot] = "BREAK"
 
         return slots_to_use
 
 
     def generate_timetable(self, courses_to_allocate, writer, sheet_name):
-        timetable = pd.DataFrame("", index=self.days, columns=self.slots)
-        lecturer_busy = {day: {slot: [] for slot in self.slots} for day in self.days}
+        # writer may be None when the caller exports the returned grid itself.
+        timetable = TimetableGrid(self.days, self.slots)
+        # Faculty bookings live in faculty_calendar; lecturer_busy only marks
+        # this sheet's calls and keeps the per-day lookups of the retry loops.
+        lecturer_busy = {day: {} for day in self.days}
+        self._lecturer_busy = lecturer_busy
+        self.faculty_calendar.release_holder((self.dept_name, sheet_name))
+        self.rng = random.Random(stream_seed(self.seed, self.dept_name, sheet_name))
         labs_scheduled = {day: False for day in self.days}
+        solver = None
+        if self.solver_mode == "backtracking":
+            solver = BacktrackingSolver(
+                self,
+                timetable,
+                lecturer_busy,
+                labs_scheduled,
+                sheet_name,
+                time_limit=self.solver_time_limit,
+                node_limit=self.solver_node_limit,
+            )
         self.course_room_map = {}
 
         electives = [c for c in courses_to_allocate if c.is_elective]
@@ -761,12 +909,18 @@ class Scheduler:
                             room = self.scheduled_entries[-1].get("room", "") if self.scheduled_entries else ""
                             self._record_combined_slots(combined_key_L, day, res, room)
             
+            if solver is not None:
+                remaining = self._defer_to_solver(
+                    solver, course, "L", remaining, 1.5, is_elective, min_rooms,
+                    combined_key_L, None if has_template_L else elective_key_L, required_capacity_lt_t,
+                )
+
             # Standard stochastic scheduling (runs if not fully scheduled by force)
             attempts = 0
             while remaining > 0 and attempts < self.MAX_ATTEMPTS:
                 attempts += 1
                 days_to_try = self.days.copy()
-                random.shuffle(days_to_try)
+                self.rng.shuffle(days_to_try)
                 for day in days_to_try:
                     if remaining <= 0 or (faculty and faculty in lecturer_busy[day]):
                         continue
@@ -816,16 +970,18 @@ class Scheduler:
                             self._record_combined_slots(combined_key_L, day, allocated_slots, room)
                         break
 
+            if self.profiler is not None:
+                self.profiler.record_attempts(self.dept_name, sheet_name, code, "L", attempts, remaining)
             if remaining > 0:
-                self.unscheduled_courses.append({
-                    "sheet": sheet_name,
-                    "course_code": code,
-                    "course_title": course.title,
-                    "faculty": faculty,
-                    "type": "Lecture",
-                    "remaining_hours": remaining,
-                    "semester_half": course.semester_half
-                })
+                self.unscheduled_courses.append(UnscheduledCourse(
+                    sheet=sheet_name,
+                    course_code=code,
+                    course_title=course.title,
+                    faculty=faculty,
+                    type="Lecture",
+                    remaining_hours=remaining,
+                    semester_half=course.semester_half,
+                ))
 
             # --- Tutorial Scheduling ---
             forced_allocations_T = []
@@ -885,11 +1041,17 @@ class Scheduler:
                             room = self.scheduled_entries[-1].get("room", "") if self.scheduled_entries else ""
                             self._record_combined_slots(combined_key_T, day, res, room)
 
+            if solver is not None:
+                remaining = self._defer_to_solver(
+                    solver, course, "T", remaining, 1, is_elective, min_rooms,
+                    combined_key_T, None if has_template_T else elective_key_T, required_capacity_lt_t,
+                )
+
             attempts = 0
             while remaining > 0 and attempts < self.MAX_ATTEMPTS:
                 attempts += 1
                 days_to_try = self.days.copy()
-                random.shuffle(days_to_try)
+                self.rng.shuffle(days_to_try)
                 for day in days_to_try:
                     if remaining <= 0 or (faculty and faculty in lecturer_busy[day]):
                         continue
@@ -938,16 +1100,18 @@ class Scheduler:
                             self._record_combined_slots(combined_key_T, day, allocated_slots, room)
                         break
 
+            if self.profiler is not None:
+                self.profiler.record_attempts(self.dept_name, sheet_name, code, "T", attempts, remaining)
             if remaining > 0:
-                self.unscheduled_courses.append({
-                    "sheet": sheet_name,
-                    "course_code": code,
-                    "course_title": course.title,
-                    "faculty": faculty,
-                    "type": "Tutorial",
-                    "remaining_hours": remaining,
-                    "semester_half": course.semester_half
-                })
+                self.unscheduled_courses.append(UnscheduledCourse(
+                    sheet=sheet_name,
+                    course_code=code,
+                    course_title=course.title,
+                    faculty=faculty,
+                    type="Tutorial",
+                    remaining_hours=remaining,
+                    semester_half=course.semester_half,
+                ))
 
             # --- Lab Scheduling ---
             forced_allocations_P = []
@@ -1007,13 +1171,19 @@ class Scheduler:
                         if is_combined:
                             room = self.scheduled_entries[-1].get("room", "") if self.scheduled_entries else ""
                             self._record_combined_slots(combined_key_P, day, res, room)
-            
+
+            if solver is not None:
+                remaining = self._defer_to_solver(
+                    solver, course, "P", remaining, 2, is_elective, min_rooms,
+                    combined_key_P, None if has_template_P else elective_key_P, None,
+                )
+
             attempts = 0
             while remaining > 0 and attempts < self.MAX_ATTEMPTS:
                 attempts += 1
                 days_without_labs = [d for d in self.days if not labs_scheduled[d]]
                 days_to_try = days_without_labs.copy()
-                random.shuffle(days_to_try)
+                self.rng.shuffle(days_to_try)
                 for day in days_to_try:
                     if remaining <= 0 or (faculty and faculty in lecturer_busy[day]):
                         continue
@@ -1063,25 +1233,148 @@ class Scheduler:
                             self._record_combined_slots(combined_key_P, day, allocated_slots, room)
                         break
 
+            if self.profiler is not None:
+                self.profiler.record_attempts(self.dept_name, sheet_name, code, "P", attempts, remaining)
             if remaining > 0:
-                self.unscheduled_courses.append({
-                    "sheet": sheet_name,
-                    "course_code": code,
-                    "course_title": course.title,
-                    "faculty": faculty,
-                    "type": "Lab",
-                    "remaining_hours": remaining,
-                    "semester_half": course.semester_half
-                })
+                self.unscheduled_courses.append(UnscheduledCourse(
+                    sheet=sheet_name,
+                    course_code=code,
+                    course_title=course.title,
+                    faculty=faculty,
+                    type="Lab",
+                    remaining_hours=remaining,
+                    semester_half=course.semester_half,
+                ))
+
+        if solver is not None:
+            self._commit_solver_sessions(solver, timetable, lecturer_busy, labs_scheduled, sheet_name)
 
         for day in self.days:
             for slot in self.excluded_slots:
                 if slot in timetable.columns:
                     timetable.at[day, slot] = ""
 
-        timetable.to_excel(writer, sheet_name=sheet_name, index=True)
-        print(f"Saved timetable to sheet '{sheet_name}'")
+        if writer is not None:
+            timetable.to_frame().to_excel(writer, sheet_name=sheet_name, index=True)
+            print(f"Saved timetable to sheet '{sheet_name}'")
+        return timetable
+
 
+    def _defer_to_solver(
+        self,
+        solver,
+        course,
+        session_type,
+        remaining,
+        chunk,
+        is_elective,
+        min_rooms,
+        combined_key,
+        elective_key,
+        min_capacity_needed,
+    ):
+        # Split the leftover hours the same way the retry loops would.
+        options = {
+            "code": course.code,
+            "faculty": course.faculty,
+            "is_elective": is_elective,
+            "min_rooms_needed": min_rooms,
+            "combined_key": combined_key,
+            "elective_key": elective_key,
+            "min_capacity_needed": min_capacity_needed,
+        }
+        while remaining > 0:
+            duration = min(chunk, remaining)
+            solver.add_session(course, session_type, duration, options)
+            remaining -= duration
+        return 0
+
+    def _place_solver_session(
+        self, var, timetable, lecturer_busy, labs_scheduled, sheet_name, day, slots=None, room=None, relaxed=False
+    ):
+        opts = var.options
+        if slots:
+            relax_modes = [relaxed]
+        elif opts["is_elective"] and self.relax_cross_sem_elective_block:
+            relax_modes = [False, True]
+        else:
+            relax_modes = [False]
+        res = None
+        for relax in relax_modes:
+            res = self._allocate_session(
+                timetable,
+                lecturer_busy,
+                labs_scheduled,
+                day,
+                var.faculty,
+                var.code,
+                var.duration,
+                var.session_type,
+                opts["is_elective"],
+                sheet_name,
+                force_slots=list(slots) if slots else None,
+                min_rooms_needed=opts["min_rooms_needed"],
+                relax_elective_block=relax,
+                combined_key=opts["combined_key"],
+                preferred_room=room or None,
+                min_capacity_needed=opts["min_capacity_needed"],
+            )
+            if res:
+                break
+        if not res:
+            return None
+        if opts["elective_key"]:
+            self.global_elective_slots.setdefault(opts["elective_key"], []).append({
+                'day': day,
+                'slots': res
+            })
+        if opts["combined_key"]:
+            placed_room = self.scheduled_entries[-1].get("room", "") if self.scheduled_entries else ""
+            self._record_combined_slots(opts["combined_key"], day, res, placed_room)
+        return res
+
+    def _commit_solver_sessions(self, solver, timetable, lecturer_busy, labs_scheduled, sheet_name):
+        assignment, unplaced = solver.solve()
+        leftovers = list(unplaced)
+        for var, value in sorted(assignment.items(), key=lambda kv: (kv[1].day_index, kv[1].start_idx)):
+            placed = self._place_solver_session(
+                var,
+                timetable,
+                lecturer_busy,
+                labs_scheduled,
+                sheet_name,
+                value.day,
+                slots=value.slots,
+                room=value.room,
+                relaxed=value.relaxed,
+            )
+            if not placed:
+                leftovers.append(var)
+
+        # Whatever the search could not place gets one deterministic greedy pass.
+        missing = {}
+        for var in sorted(leftovers, key=lambda v: v.index):
+            if any(
+                self._place_solver_session(var, timetable, lecturer_busy, labs_scheduled, sheet_name, day)
+                for day in self.days
+            ):
+                continue
+            key = (var.code, var.session_type)
+            if key not in missing:
+                missing[key] = [var, 0]
+            missing[key][1] += var.duration
+
+        for var, hours in missing.values():
+            course = var.course
+            self.unscheduled_courses.append(UnscheduledCourse(
+                sheet=sheet_name,
+                course_code=var.code,
+                course_title=course.title,
+                faculty=var.faculty,
+                type=SESSION_LABELS[var.session_type],
+                remaining_hours=hours,
+                semester_half=course.semester_half,
+            ))
 
     def _compute_elective_room_assignments_legally(self, sheet_name):
         electives_representatives = self.electives_by_sheet.get(sheet_name, [])
@@ -1091,14 +1384,17 @@ class Scheduler:
 
         active_baskets = set(b for b, _ in electives_representatives)
         assigned = {}
-        room_usage = self._sheet_scoped_usage(self.global_room_usage, sheet_name)
         elective_room_usage = self._sheet_scoped_usage(self.global_elective_room_usage, sheet_name)
         
         # Local usage tracker for electives in this sheet: day -> slot -> set of rooms used
         local_room_usage = {} 
 
+        room_scope = scope_for_sheet(sheet_name)
+
         def is_display_room_free(day, slot, room, owner_key, check_non_elective_usage=True):
-            if check_non_elective_usage and room in room_usage.get(day, {}).get(slot, []):
+            if check_non_elective_usage and not self.occupancy.is_free(
+                "room", room_scope, room, day, self.occupancy.bit(slot)
+            ):
                 return False
             used_by = elective_room_usage.get(day, {}).get(slot, {}).get(room)
             if used_by is not None and used_by != owner_key:
@@ -1116,12 +1412,11 @@ class Scheduler:
             # Get slots for this basket
             lecture_slots = []
             lab_slots = []
-            for ent in self.scheduled_entries:
-                if ent["sheet"] == sheet_name and ent["code"] == basket_code:
-                    if "(Lab" in ent["display"]: 
-                         lab_slots.append((ent["day"], ent["slot"]))
-                    else:
-                         lecture_slots.append((ent["day"], ent["slot"]))
+            for ent in self.scheduled_entries.for_sheet_code(sheet_name, basket_code):
+                if "(Lab" in ent["display"]:
+                    lab_slots.append((ent["day"], ent["slot"]))
+                else:
+                    lecture_slots.append((ent["day"], ent["slot"]))
             
             # Prioritize lecture slots for room assignment (Classrooms). 
             # If no lecture slots (pure lab), use lab slots.
@@ -1161,7 +1456,7 @@ class Scheduler:
                     basket,
                     elective.title.strip().lower(),
                 )
-                code_key = str(getattr(elective, "code", "")).strip().upper()
+                code_key = self.code_symbols.key(getattr(elective, "code", ""))
                 code_template_key = (
                     self.semester_group,
                     sheet_name,
@@ -1300,174 +1595,41 @@ class Scheduler:
         self.elective_room_assignment[sheet_name] = assigned
 
     def format_student_timetable_with_legend(self, filename):
-        wb = load_workbook(filename)
-        thin_border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
-        )
-
-        color_map = {}
-        palette = ["FFC7CE", "C6EFCE", "FFEB9C", "BDD7EE", "D9EAD3", "F4CCCC",
-                "D9D2E9", "FCE5CD", "C9DAF8", "EAD1DC"]
-        color_index = 0
-
-        for sheet_name in wb.sheetnames:
-            self._compute_elective_room_assignments_legally(sheet_name)
-
-        for sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-
-            for row in range(2, ws.max_row + 1):
-                start_col = 2
-                while start_col <= ws.max_column:
-                    cell = ws.cell(row=row, column=start_col)
-                    val = str(cell.value).strip() if cell.value is not None else ""
-
-                    if val and val not in ["FREE", "BREAK"]:
-                        raw_code = val.split(" ")[0]
-                        code = raw_code.rstrip("T")
-                        if code not in color_map:
-                            color_map[code] = palette[color_index % len(palette)]
-                            color_index += 1
-                        fill = PatternFill(start_color=color_map[code], end_color=color_map[code], fill_type="solid")
-                        cell.fill = fill
-
-                        merge_count = 0
-                        for col in range(start_col + 1, ws.max_column + 1):
-                            next_cell = ws.cell(row=row, column=col)
-                            if next_cell.value == cell.value:
-                                next_cell.fill = fill
-                                merge_count += 1
-                            else:
-                                break
-                        if merge_count > 0:
-                            ws.merge_cells(start_row=row, start_column=start_col, end_row=row, end_column=start_col + merge_count)
-
-                        cell.alignment = Alignment(horizontal="center", vertical="center")
-                        for col_idx in range(start_col, start_col + merge_count + 1):
-                            ws.cell(row=row, column=col_idx).border = thin_border
-                        start_col += merge_count + 1
-                    elif val == "BREAK":
-                        cell.fill = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")
-                        cell.alignment = Alignment(horizontal="center", vertical="center")
-                        cell.border = thin_border
-                        start_col += 1
-                    else:
-                        cell.border = thin_border
-                        start_col += 1
-
-            start_row = ws.max_row + 3
-            headers = ["S.No", "Course Code", "Course Title", "L-T-P-S-C", "Faculty", "Color"]
-            for idx, header in enumerate(headers, start=2):
-                ws.cell(start_row, idx, header).border = thin_border
-                ws.cell(start_row, idx).alignment = Alignment(horizontal="center", vertical="center")
-
-
-            i = 1
-            for code in color_map:
-                if code.startswith("Elective_"):
-                    continue
-                ws.cell(start_row + i, 2, i).border = thin_border
-                ws.cell(start_row + i, 3, code).border = thin_border
-                course_name = next((c.title for c in self.courses if c.code == code), code)
-                faculty = next((c.faculty for c in self.courses if c.code == code), "")
-                ltpsc = next((c.ltp for c in self.courses if c.code == code), "")
-                ws.cell(start_row + i, 4, course_name).border = thin_border
-                ws.cell(start_row + i, 5, ltpsc).border = thin_border
-                ws.cell(start_row + i, 5).alignment = Alignment(horizontal="center", vertical="center")
-                ws.cell(start_row + i, 6, faculty).border = thin_border
-                ws.cell(start_row + i, 7, "").fill = PatternFill(
-                    start_color=color_map[code],
-                    end_color=color_map[code],
-                    fill_type="solid"
-                )
-                ws.cell(start_row + i, 7).border = thin_border
-
-                i += 1
-
-            electives_header_row = start_row + i + 2
-            e_headers = ["S.No", "Elective Basket", "Elective Title", "Faculty", "Room", "Color"]
-            for idx, header in enumerate(e_headers, start=2):
-                ws.cell(electives_header_row, idx, header).border = thin_border
-                ws.cell(electives_header_row, idx).alignment = Alignment(horizontal="center", vertical="center")
-
-            chosen_by_basket = {b: e for (b, e) in self.electives_by_sheet.get(sheet_name, [])}
-            row_ctr = 1
-
-            for basket in sorted(chosen_by_basket.keys()):
-                elective_code = f"Elective_{basket}"
-                chosen_e = chosen_by_basket[basket]
-
-                all_electives = [
-                    c
-                    for c in self.courses
-                    if c.is_elective and c.basket == basket and self._course_in_sheet_half(c, sheet_name)
-                ]
-
-                for idx_e, e in enumerate(all_electives):
-                    ws.cell(electives_header_row + row_ctr, 2, row_ctr).border = thin_border
-                    ws.cell(electives_header_row + row_ctr, 3, elective_code).border = thin_border
-                    ws.cell(electives_header_row + row_ctr, 4, e.title).border = thin_border
-                    ws.cell(electives_header_row + row_ctr, 5, e.faculty).border = thin_border
-                    
-                    key = f"{elective_code}||{e.title}"
-                    room = self.elective_room_assignment.get(sheet_name, {}).get(key, "")
-                    ws.cell(electives_header_row + row_ctr, 6, room).border = thin_border
-                    ws.cell(electives_header_row + row_ctr, 6).alignment = Alignment(horizontal="center", vertical="center")
-
-                    ws.cell(electives_header_row + row_ctr, 7, "").fill = PatternFill(
-                        start_color=color_map.get(elective_code, "FFFFFF"),
-                        end_color=color_map.get(elective_code, "FFFFFF"),
-                        fill_type="solid"
-                    )
-                    ws.cell(electives_header_row + row_ctr, 7).border = thin_border
-
-                    row_ctr += 1
-
-            timetable_max_row = len(self.days) + 1
-            timetable_max_col = ws.max_column
-            for row in ws.iter_rows(min_row=2, max_row=timetable_max_row, min_col=2, max_col=timetable_max_col):
-                for cell in row:
-                    cell.border = thin_border
-            ws.freeze_panes = "B2"
-
+        # Re-render a workbook whose grids were already written with
+        # generate_timetable(writer=...): read the grids back and stream them
+        # out again with colours, merges and the legend.
+        import pandas as pd
 
-            for col in ws.columns:
-                max_length = 0
-                try:
-                    column_letter = col[0].column_letter
-                except Exception:
-                    continue
-                for cell in col:
-                    if cell.value is not None:
-                        max_length = max(max_length, len(str(cell.value)))
-                ws.column_dimensions[column_letter].width = max_length + 2
-
-        wb.save(filename)
+        sheets = pd.read_excel(filename, sheet_name=None, index_col=0)
+        for default in ["Sheet", "Sheet1"]:
+            if default in sheets and len(sheets) > 1:
+                del sheets[default]
+        timetables = {name: grid.astype(object).where(grid.notna(), "") for name, grid in sheets.items()}
+        self._write_student_workbook(filename, timetables)
+
+    def _write_student_workbook(self, filename, timetables):
+        for sheet_name in timetables:
+            if sheet_name not in self.elective_room_assignment:
+                self._compute_elective_room_assignments_legally(sheet_name)
+        from timetable_automation.export import write_student_workbook
+
+        write_student_workbook(self, filename, timetables)
         print(f"Formatted student timetable saved in {filename}")
 
-
-
     def _generate_faculty_workbook(self, faculty_filename):
         faculty_set = set()
+        courses_by_code = {}
         for c in self.courses:
-            raw = c.faculty
-            if raw:
-                for p in [x.strip() for x in raw.split("/") if x.strip()]:
-                    faculty_set.add(p)
-        for ent in self.scheduled_entries:
-            fstr = ent.get("faculty")
-            if fstr:
-                for p in [x.strip() for x in fstr.split("/") if x.strip()]:
-                    faculty_set.add(p)
+            faculty_set.update(split_faculty(c.faculty))
+            courses_by_code.setdefault(c.code, []).append(c)
+        faculty_set.update(self.scheduled_entries.faculty_names())
+        basket_courses_cache = {}
 
         faculty_tables = {}
         for f in faculty_set:
             faculty_tables[f] = {
-                "First_Half": pd.DataFrame("    ", index=self.days, columns=self.slots),
-                "Second_Half": pd.DataFrame("    ", index=self.days, columns=self.slots)
+                "First_Half": TimetableGrid(self.days, self.slots, fill="    "),
+                "Second_Half": TimetableGrid(self.days, self.slots, fill="    "),
             }
 
         for ent in self.scheduled_entries:
@@ -1482,14 +1644,17 @@ class Scheduler:
             if code.startswith("Elective_"):
                 try:
                     basket = int(code.split("_")[1])
-                    basket_courses = [
-                        c for c in self.courses 
-                        if c.is_elective and c.basket == basket and self._course_in_sheet_half(c, sheet)
-                    ]
+                    basket_courses = basket_courses_cache.get((basket, sheet))
+                    if basket_courses is None:
+                        basket_courses = [
+                            c for c in self.courses
+                            if c.is_elective and c.basket == basket and self._course_in_sheet_half(c, sheet)
+                        ]
+                        basket_courses_cache[(basket, sheet)] = basket_courses
                     
                     if basket_courses:
                         for course in basket_courses:
-                            current_faculties = [p.strip() for p in course.faculty.split("/") if p.strip()] if course.faculty else []
+                            current_faculties = split_faculty(course.faculty)
                             
                             course_display = base_display.replace(code, course.code) if code in base_display else base_display
 
@@ -1502,13 +1667,11 @@ class Scheduler:
 
             # Standard Logic (Fallback)
             if ent.get("faculty"):
-                faculties = [p.strip() for p in ent["faculty"].split("/") if p.strip()]
+                faculties = split_faculty(ent["faculty"])
             else:
-                matched = [c for c in self.courses if c.code == code]
                 faculties = []
-                for m in matched:
-                    if m.faculty:
-                        faculties.extend([p.strip() for p in m.faculty.split("/") if p.strip()])
+                for m in courses_by_code.get(code, []):
+                    faculties.extend(split_faculty(m.faculty))
 
             faculties = list(set(faculties))
             
@@ -1516,153 +1679,97 @@ class Scheduler:
                 if f in faculty_tables:
                     faculty_tables[f][sheet].at[day, slot] = base_display
 
-        with pd.ExcelWriter(faculty_filename, engine="openpyxl") as writer:
-            for f in sorted(faculty_tables.keys()):
-                safe = f[:31]
-                df_first = faculty_tables[f]["First_Half"]
-                df_second = faculty_tables[f]["Second_Half"]
-
-                cols = ["Day"] + list(df_first.columns)
-
-                # Helper to create single-row DF
-                def make_row(values):
-                    return pd.DataFrame([values], columns=cols)
-
-                # Components
-                title1 = make_row(["First Half"] + [""] * (len(cols) - 1))
-                title2 = make_row(["Second Half"] + [""] * (len(cols) - 1))
-                header = make_row(cols)
-                spacer = make_row([""] * len(cols))
-
-                d1 = df_first.reset_index()
-                d1.columns = cols
-                d2 = df_second.reset_index()
-                d2.columns = cols
-
-                # Assemble: Title1 -> Header -> Data1 -> Spacer -> Title2 -> Header -> Data2
-                final = pd.concat([title1, header, d1, spacer, title2, header, d2], ignore_index=True)
-                
-                final.to_excel(writer, sheet_name=safe, index=False, header=False)
-
-        wb = load_workbook(faculty_filename)
-        thin = Border(left=Side(style="thin"), right=Side(style="thin"), top=Side(style="thin"), bottom=Side(style="thin"))
-        palette = ["FFC7CE","C6EFCE","FFEB9C","BDD7EE","D9EAD3","F4CCCC","D9D2E9","FCE5CD","C9DAF8","EAD1DC"]
-        color_map = {}
-        color_index = 0
-
-        for sheet in wb.sheetnames:
-            ws = wb[sheet]
-            header_fill = PatternFill(start_color="D3D3D3", end_color="D3D3D3", fill_type="solid")
-            header_font = Font(bold=True)
-
-            for row in range(1, ws.max_row + 1):
-                # Check for header row
-                first_cell_val = str(ws.cell(row, 1).value).strip() if ws.cell(row, 1).value else ""
-                
-                if first_cell_val == "Day":
-                    # Apply header style
-                    for col in range(1, ws.max_column + 1):
-                        cell = ws.cell(row, col)
-                        cell.fill = header_fill
-                        cell.font = header_font
-                        cell.alignment = Alignment(horizontal="center", vertical="center")
-                        cell.border = thin
-                    continue
-
-                if row == 1: 
-                    # Probably "First Half" title or spacer/title
-                    # We can style titles if we want, but user asked about timeslots (headers)
-                    # Just ensuring we don't process row 1 as data if it's a title
-                    continue
-                
-                start_col = 2
-                while start_col <= ws.max_column:
-                    cell = ws.cell(row=row, column=start_col)
-                    val = str(cell.value).strip() if cell.value else ""
-                    
-                    if val and val not in ["FREE", ""]:
-                        raw_code = val.split(" ")[0].rstrip("T")
-                        if raw_code not in color_map:
-                            color_map[raw_code] = palette[color_index % len(palette)]
-                            color_index += 1
-                        fill = PatternFill(start_color=color_map[raw_code], end_color=color_map[raw_code], fill_type="solid")
-                        cell.fill = fill
-                        merge_count = 0
-                        for col in range(start_col + 1, ws.max_column + 1):
-                            next_cell = ws.cell(row=row, column=col)
-                            if next_cell.value == cell.value:
-                                next_cell.fill = fill
-                                merge_count += 1
-                            else:
-                                break
-                        if merge_count > 0:
-                            ws.merge_cells(start_row=row, start_column=start_col, end_row=row, end_column=start_col + merge_count)
-                        cell.alignment = Alignment(horizontal="center", vertical="center")
-                        for col_idx in range(start_col, start_col + merge_count + 1):
-                            ws.cell(row=row, column=col_idx).border = thin
-                        start_col += merge_count + 1
-                    else:
-                        cell.border = thin
-                        start_col += 1
-
-                        
-            for row in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=2, max_col=ws.max_column):
-                for cell in row:
-                    cell.border = thin
-
-            ws.freeze_panes = "B2"
+        from timetable_automation.export import write_faculty_workbook
 
-
-            for col in ws.columns:
-                max_length = 0
-                try:
-                    column = col[0].column_letter
-                except:
-                    continue
-                for cell in col:
-                    if cell.value is not None:
-                        max_length = max(max_length, len(str(cell.value)))
-                ws.column_dimensions[column].width = max_length + 2
-
-        wb.save(faculty_filename)
+        write_faculty_workbook(faculty_filename, faculty_tables, self.slots)
         print(f"Saved faculty timetables to {faculty_filename}")
 
-    def run_all_outputs(self, dept_name_prefix="CSE", student_filename=None, faculty_filename="faculty_timetable.xlsx"):
-        
+    def generate_all_sheets(self):
+        # Both halves from scratch; returns {sheet_name: grid} without writing anything.
+        self.scheduled_entries = EntryStore()
+        self.electives_by_sheet = {}
+        self.elective_room_assignment = {}
+        self.last_run_timings = {"timetables": 0.0, "student_export": 0.0, "faculty_export": 0.0}
+
+        start = time.perf_counter()
+        timetables = {
+            "First_Half": self.generate_timetable([c for c in self.courses if c.semester_half in ["1", "0"]], None, "First_Half"),
+            "Second_Half": self.generate_timetable([c for c in self.courses if c.semester_half in ["2", "0"]], None, "Second_Half"),
+        }
+        self.last_run_timings["timetables"] = time.perf_counter() - start
+        return timetables
+
+    def restore_entries(self, entries):
+        # Pins a saved run's placements: the rooms, combined-room owners,
+        # faculty slots and elective slot usage they held are claimed again
+        # without re-solving.
+        self.scheduled_entries = EntryStore(entries)
+        combined_codes = {c.code for c in self.courses if c.is_combined and not c.is_elective}
+        sessions = {}
+        for ent in self.scheduled_entries:
+            sessions.setdefault((ent["sheet"], ent["day"], ent["code"], ent["room"]), []).append(ent)
+        for (sheet, day, code, room), session in sessions.items():
+            slots = [ent["slot"] for ent in session]
+            is_elective = code.startswith("Elective_")
+            combined_key = None
+            if not is_elective and code in combined_codes:
+                combined_key = self._combined_template_key(code, session_type_of(session[0]), sheet)
+            if is_elective:
+                self._reserve_elective_slots(day, slots)
+            elif room:
+                self._claim_room(day, slots, room, sheet, combined_key)
+            if session[0]["faculty"]:
+                self.faculty_calendar.claim(
+                    (self.dept_name, sheet),
+                    session[0]["faculty"],
+                    sheet,
+                    day,
+                    self.occupancy.mask_for(slots),
+                    self._faculty_share_key(code, is_elective, combined_key, sheet),
+                )
+
+    def run_all_outputs(
+        self,
+        dept_name_prefix="CSE",
+        student_filename=None,
+        faculty_filename="faculty_timetable.xlsx",
+        defer_faculty_export=False,
+    ):
+        # With defer_faculty_export the caller builds one combined faculty
+        # workbook after all departments instead of one per department.
         if not student_filename:
             student_filename = f"{dept_name_prefix}_timetable.xlsx"
 
-        
-        self.scheduled_entries = []
-        self.electives_by_sheet = {}
-        self.elective_room_assignment = {}
+        timetables = self.generate_all_sheets()
 
-        with pd.ExcelWriter(student_filename, engine="openpyxl") as writer:
-           
-            self.generate_timetable([c for c in self.courses if c.semester_half in ["1", "0"]], writer, "First_Half")
-            self.generate_timetable([c for c in self.courses if c.semester_half in ["2", "0"]], writer, "Second_Half")
+        start = time.perf_counter()
+        self.export_student_outputs(dept_name_prefix, student_filename, timetables=timetables)
+        self.last_run_timings["student_export"] = time.perf_counter() - start
 
+        if not defer_faculty_export:
+            start = time.perf_counter()
+            self._generate_faculty_workbook(faculty_filename)
+            self.last_run_timings["faculty_export"] = time.perf_counter() - start
+
+        if self._owns_profiler:
+            self.profiler.dump(f"{dept_name_prefix}_profile.json")
+
+    def export_student_outputs(self, dept_name_prefix, student_filename, timetables=None):
+        # timetables maps sheet name -> grid; without it the grids are read
+        # back from a workbook already written by generate_timetable(writer=...).
         if self.unscheduled_courses:
+            import pandas as pd
+
             unsched_file = f"{dept_name_prefix}_unscheduled_courses.xlsx"
             df_unsched = pd.DataFrame(self.unscheduled_courses)
             df_unsched.to_excel(unsched_file, index=False)
             print(f"Some courses couldn't be scheduled. See '{unsched_file}' for details.")
             print(df_unsched.to_string(index=False))
-        wb = load_workbook(student_filename)
-        for default in ["Sheet", "Sheet1"]:
-            if default in wb.sheetnames and len(wb.sheetnames) > 1:
-                wb.remove(wb[default])
-        wb.save(student_filename)
-
-        
-        for sheet in wb.sheetnames:
-            self._compute_elective_room_assignments_legally(sheet)
 
-        
-        self.format_student_timetable_with_legend(student_filename)
-
-        
-        self._generate_faculty_workbook(faculty_filename)
+        if timetables is None:
+            self.format_student_timetable_with_legend(student_filename)
+        else:
+            self._write_student_workbook(student_filename, timetables)
 
 
 def _resolve_combined_cluster_from_dept(dept_name):
@@ -1707,8 +1814,7 @@ def _build_global_combined_strength(departments):
         match = re.search(r"\d+", str(dept_name))
         semester_group = match.group(0) if match else "UNKNOWN"
         cluster_id = _resolve_combined_cluster_from_dept(dept_name)
-        df = pd.read_csv(course_file)
-        for _, row in df.iterrows():
+        for row in default_input_cache.rows(course_file):
             if not _is_truthy_flag(row.get("is_combined", row.get("Is_Combined", 0))):
                 continue
             if _is_elective_row(row):
@@ -1722,84 +1828,227 @@ def _build_global_combined_strength(departments):
     return totals
 
 
-if __name__ == "__main__":
-   
-    departments = {
-        "CSE-3-A": "data/coursesCSEA-III.csv",
-        "CSE-3-B": "data/coursesCSEB-III.csv",
-        "CSE-1-A": "data/coursesCSEA-I.csv",
-        "CSE-1-B": "data/coursesCSEB-I.csv",
-        "CSE-5-A": "data/coursesCSEA-V.csv",
-        "CSE-5-B": "data/coursesCSEB-V.csv",
-        "7-SEM": "data/courses7.csv",
-        "DSAI-3": "data/coursesDSAI-III.csv",
-        "ECE-3": "data/coursesECE-III.csv",
-        "DSAI-1": "data/coursesDSAI-I.csv",
-        "ECE-1": "data/coursesECE-I.csv",
-        "DSAI-5": "data/coursesDSAI-V.csv",
-        "ECE-5": "data/coursesECE-V.csv",
+
+
+def new_global_state(departments):
+    # Everything the departments share; keys match the Scheduler keyword arguments.
+    occupancy = OccupancyIndex()
+    return {
+        "global_room_usage": {},
+        "global_elective_slots": {},
+        "global_elective_slot_usage": {},
+        "global_elective_room_templates": {},
+        "global_elective_room_usage": {},
+        "global_elective_representatives": {},
+        "global_combined_slots": {},
+        "global_combined_room_usage": {},
+        "global_combined_strength": _build_global_combined_strength(departments),
+        "global_c004_reserved_slots": {},
+        "global_occupancy": occupancy,
+        "global_faculty_calendar": FacultyCalendar(occupancy),
     }
-    rooms_file = "data/rooms.csv"
-    slots_file = "data/timeslots.csv"
-    global_room_usage = {}
-    combined_faculty_filename = "faculty_timetable.xlsx"
-    
-    global_elective_slots = {}
-    global_elective_slot_usage = {}
-    global_elective_room_templates = {}
-    global_elective_room_usage = {}
-    global_elective_representatives = {}
-    global_combined_slots = {}
-    global_combined_room_usage = {}
-    global_combined_strength = _build_global_combined_strength(departments)
-    global_c004_reserved_slots = {}
-    all_scheduled_entries = []
 
+
+def write_combined_faculty_workbook(
+    departments,
+    slots_file,
+    rooms_file,
+    state,
+    all_scheduled_entries,
+    faculty_filename,
+    profiler=None,
+    scheduler_options=None,
+):
+    combined_courses = []
     for dept_name, course_file in departments.items():
+        combined_courses.extend(default_input_cache.parsed(course_file, parse_courses))
+    helper = Scheduler(
+        slots_file,
+        departments[list(departments.keys())[0]],
+        rooms_file,
+        profiler=profiler,
+        **state,
+        **(scheduler_options or {}),
+    )
+    helper.courses = combined_courses
+    helper.scheduled_entries = all_scheduled_entries
+    helper._generate_faculty_workbook(faculty_filename)
+
+
+def format_timing_report(timings):
+    lines = ["Timing report:"]
+    for phase, seconds in timings["phases"].items():
+        lines.append(f"  {phase:<24}{seconds:8.2f}s")
+    lines.append(f"  {'total':<24}{sum(timings['phases'].values()):8.2f}s")
+    lines.append(
+        f"  faculty workbook writes: {timings['faculty_writes']}"
+        f" ({timings['faculty_writes_skipped']} per-department writes skipped)"
+    )
+    return "\n".join(lines)
+
+
+def generate_all_departments(
+    departments=None,
+    rooms_file=DEFAULT_ROOMS_FILE,
+    slots_file=DEFAULT_SLOTS_FILE,
+    faculty_filename="faculty_timetable.xlsx",
+    solver_mode="greedy",
+    defer_faculty_export=True,
+    timings=None,
+    profile=None,
+    seed=None,
+    on_department=None,
+    improve=None,
+    repair=None,
+    state_file=None,
+    checkpoint_file=None,
+    resume=False,
+    scheduler_options=None,
+):
+    # timings, when given, is filled with per-phase wall-clock seconds (summed and
+    # per department). profile defaults to the TIMETABLE_PROFILE variable.
+    # on_department(dept_name, scheduler) is called after each department's outputs.
+    # state_file, when given, receives the solved state for incremental runs.
+    # checkpoint_file is rewritten after every finished department and removed
+    # at the end; with resume a matching checkpoint is picked up first.
+    # scheduler_options are extra Scheduler keyword arguments (days, room policy).
+    # seed is the root seed every department and half derives its generator from.
+    departments = departments or DEFAULT_DEPARTMENTS
+    seed = RANDOM_SEED if seed is None else seed
+    profiler = Profiler() if (profiling_enabled() if profile is None else profile) else None
+    timings = timings if timings is not None else {}
+    timings.update(
+        {
+            "phases": {"timetables": 0.0, "student_export": 0.0, "faculty_export": 0.0},
+            "departments": {},
+            "faculty_writes": 0,
+            "faculty_writes_skipped": 0,
+        }
+    )
+    state = new_global_state(departments)
+    all_scheduled_entries = EntryStore()
+    snapshots = {}
+    # With repair or improve (seconds), every department is scheduled first,
+    # LNSRepair and LocalSearch work on all of them together and only then are
+    # the workbooks written.  Nothing is finished before that, so there is
+    # nothing to checkpoint.
+    solved = []
+    checkpointing = bool(checkpoint_file) and not (improve or repair)
+    if checkpointing and resume:
+        saved = load_checkpoint(checkpoint_file, departments, rooms_file, slots_file)
+        if saved is not None:
+            state = saved["state"]
+            snapshots = saved["departments"]
+            for snapshot in snapshots.values():
+                all_scheduled_entries.extend(unpack_records(snapshot["entries"], ScheduledEntry))
+            seed = saved["seed"]
+            print(f"Resuming after {len(snapshots)} finished department(s): {', '.join(snapshots)}")
+
+    def finish_department(dept_name, scheduler, seconds):
+        timings["departments"][dept_name] = dict(scheduler.last_run_timings, run_all_outputs=seconds)
+        for phase, phase_seconds in scheduler.last_run_timings.items():
+            timings["phases"][phase] += phase_seconds
+        if defer_faculty_export:
+            timings["faculty_writes_skipped"] += 1
+        else:
+            timings["faculty_writes"] += 1
+        if on_department is not None:
+            on_department(dept_name, scheduler)
+        if state_file or checkpointing:
+            snapshots[dept_name] = department_snapshot(departments[dept_name], scheduler)
+
+        all_scheduled_entries.extend(scheduler.scheduled_entries)
+        for k, v in scheduler.course_room_map.items():
+            state["global_room_usage"].setdefault("MAPPING", {})[k] = v
+        if checkpointing:
+            save_checkpoint(checkpoint_file, rooms_file, slots_file, state, snapshots, seed)
+
+    for dept_name, course_file in departments.items():
+        if dept_name in snapshots:
+            continue
         print(f"\nGenerating student timetable for {dept_name}...")
         scheduler = Scheduler(
             slots_file,
             course_file,
             rooms_file,
-            global_room_usage,
-            global_elective_slots,
             dept_name=dept_name,
-            global_elective_slot_usage=global_elective_slot_usage,
-            global_elective_room_templates=global_elective_room_templates,
-            global_elective_room_usage=global_elective_room_usage,
-            global_elective_representatives=global_elective_representatives,
-            global_combined_slots=global_combined_slots,
-            global_combined_room_usage=global_combined_room_usage,
-            global_combined_strength=global_combined_strength,
-            global_c004_reserved_slots=global_c004_reserved_slots,
+            solver_mode=solver_mode,
+            profiler=profiler,
+            seed=seed,
+            **state,
+            **(scheduler_options or {}),
+        )
+        start = time.perf_counter()
+        if improve or repair:
+            solved.append((dept_name, scheduler, scheduler.generate_all_sheets(), time.perf_counter() - start))
+            continue
+        scheduler.run_all_outputs(
+            dept_name_prefix=dept_name,
+            student_filename=f"{dept_name}_timetable.xlsx",
+            faculty_filename=faculty_filename,
+            defer_faculty_export=defer_faculty_export,
         )
-        student_file = f"{dept_name}_timetable.xlsx"
-        scheduler.run_all_outputs(dept_name_prefix=dept_name, student_filename=student_file, faculty_filename=combined_faculty_filename)
+        finish_department(dept_name, scheduler, time.perf_counter() - start)
 
-        all_scheduled_entries.extend(scheduler.scheduled_entries)
-        for k, v in scheduler.course_room_map.items():    
-            global_room_usage.setdefault("MAPPING", {})[k] = v    
-    combined_courses = []
-    for dept_name, course_file in departments.items():
-        df = pd.read_csv(course_file)
-        for _, row in df.iterrows():
-            combined_courses.append(Course(row))
-    helper = Scheduler(
+    if repair:
+        from timetable_automation.repair import LNSRepair, format_repair_report
+
+        start = time.perf_counter()
+        search = LNSRepair(
+            [(sch, grids) for _, sch, grids, _ in solved],
+            time_budget=repair,
+            rng=random.Random(stream_seed(seed, "repair")),
+        )
+        print(format_repair_report(search.run()))
+        timings["phases"]["repair"] = time.perf_counter() - start
+    if improve:
+        from timetable_automation.improve import LocalSearch, format_improvement_report
+
+        start = time.perf_counter()
+        search = LocalSearch(
+            [(sch, grids) for _, sch, grids, _ in solved],
+            time_budget=improve,
+            rng=random.Random(stream_seed(seed, "improve")),
+        )
+        print(format_improvement_report(search.run()))
+        timings["phases"]["improve"] = time.perf_counter() - start
+    for dept_name, scheduler, timetables, seconds in solved:
+        start = time.perf_counter()
+        scheduler.export_student_outputs(dept_name, f"{dept_name}_timetable.xlsx", timetables=timetables)
+        scheduler.last_run_timings["student_export"] = time.perf_counter() - start
+        if not defer_faculty_export:
+            faculty_start = time.perf_counter()
+            scheduler._generate_faculty_workbook(faculty_filename)
+            scheduler.last_run_timings["faculty_export"] = time.perf_counter() - faculty_start
+        finish_department(dept_name, scheduler, seconds + time.perf_counter() - start)
+
+    start = time.perf_counter()
+    write_combined_faculty_workbook(
+        departments,
         slots_file,
-        departments[list(departments.keys())[0]],
         rooms_file,
-        global_room_usage,
-        global_elective_slots,
-        global_elective_slot_usage=global_elective_slot_usage,
-        global_elective_room_templates=global_elective_room_templates,
-        global_elective_room_usage=global_elective_room_usage,
-        global_elective_representatives=global_elective_representatives,
-        global_combined_slots=global_combined_slots,
-        global_combined_room_usage=global_combined_room_usage,
-        global_combined_strength=global_combined_strength,
-        global_c004_reserved_slots=global_c004_reserved_slots,
+        state,
+        all_scheduled_entries,
+        faculty_filename,
+        profiler=profiler,
+        scheduler_options=scheduler_options,
     )
-    helper.courses = combined_courses
-    helper.scheduled_entries = all_scheduled_entries 
-    helper._generate_faculty_workbook(combined_faculty_filename)
+    timings["phases"]["faculty_export"] += time.perf_counter() - start
+    timings["faculty_writes"] += 1
+    if state_file:
+        save_run_state(state_file, rooms_file, slots_file, state, snapshots)
+    if checkpointing and os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+    if profiler is not None:
+        profiler.dump(PROFILE_FILENAME)
     print("\nAll done. Student timetables and combined faculty timetable generated.")
+    return state, all_scheduled_entries
+
+
+if __name__ == "__main__":
+    import sys
+
+    from timetable_automation.cli import main as cli_main
+
+    # Same options as ``python -m timetable_automation generate``.
+    raise SystemExit(cli_main(["generate", *sys.argv[1:]]))
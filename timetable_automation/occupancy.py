@@ -0,0 +1,91 @@
+"""Bitmask occupancy state shared by all schedulers.
+
+Each (kind, scope, key, day) tuple owns one integer in which bit ``i`` is set
+when slot ``i`` is taken.  ``kind`` is "room" for the schedulers (faculty
+bookings live in faculty.FacultyCalendar, on the same slot bits); ``scope``
+mirrors the First_Half/Second_Half split done by ``_sheet_scoped_usage``.
+Asking whether N contiguous slots are free for a room is then a couple of AND
+operations instead of list membership tests.
+"""
+
+HALF_SCOPES = ("First_Half", "Second_Half")
+
+
+def scope_for_sheet(sheet_name):
+    # Same rule as Scheduler._sheet_scoped_usage: only the two halves get
+    # their own namespace, every other sheet shares the root one.
+    return sheet_name if sheet_name in HALF_SCOPES else ""
+
+
+class OccupancyIndex:
+    def __init__(self, slots=()):
+        self.slots = []
+        self.slot_bit = {}
+        for slot in slots:
+            self.bit(slot)
+        self._masks = {}
+
+    def bit(self, slot):
+        # Slots are registered lazily so schedulers built from different
+        # slot files can still share one index.
+        b = self.slot_bit.get(slot)
+        if b is None:
+            b = 1 << len(self.slots)
+            self.slot_bit[slot] = b
+            self.slots.append(slot)
+        return b
+
+    def mask_for(self, slots):
+        m = 0
+        for slot in slots:
+            m |= self.bit(slot)
+        return m
+
+    def slots_in(self, mask):
+        return [s for s in self.slots if mask & self.slot_bit[s]]
+
+    def busy(self, kind, scope, key, day):
+        return self._masks.get((kind, scope, key, day), 0)
+
+    def is_free(self, kind, scope, key, day, mask):
+        return not (self._masks.get((kind, scope, key, day), 0) & mask)
+
+    def occupy(self, kind, scope, key, day, mask):
+        k = (kind, scope, key, day)
+        self._masks[k] = self._masks.get(k, 0) | mask
+
+    def release(self, kind, scope, key, day, mask):
+        k = (kind, scope, key, day)
+        left = self._masks.get(k, 0) & ~mask
+        if left:
+            self._masks[k] = left
+        else:
+            self._masks.pop(k, None)
+
+    def clear(self, kind, scope=None):
+        for k in [k for k in self._masks if k[0] == kind and (scope is None or k[1] == scope)]:
+            del self._masks[k]
+
+    def keys(self, kind, scope=None):
+        return sorted({k[2] for k in self._masks if k[0] == kind and (scope is None or k[1] == scope)})
+
+    def load_room_usage(self, usage_map):
+        # Seed from the legacy nested dict: root level is day -> slot -> [rooms],
+        # plus one such dict per half under the "First_Half"/"Second_Half" keys.
+        # Anything else (e.g. the "MAPPING" course->room table) is ignored.
+        for key, value in usage_map.items():
+            if key in HALF_SCOPES and isinstance(value, dict):
+                self._load_day_map(value, key)
+            elif isinstance(value, dict):
+                self._load_day_map({key: value}, "")
+
+    def _load_day_map(self, day_map, scope):
+        for day, slot_map in day_map.items():
+            if not isinstance(slot_map, dict):
+                continue
+            for slot, rooms in slot_map.items():
+                if not isinstance(rooms, list):
+                    continue
+                b = self.bit(slot)
+                for room in rooms:
+                    self.occupy("room", scope, room, day, b)
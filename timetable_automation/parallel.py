@@ -0,0 +1,391 @@
+"""Parallel multi-department driver.
+
+The sequential driver lets every department mutate the shared ``global_*``
+maps in turn.  Here the run is split into phases so the expensive part can be
+fanned out to a process pool:
+
+1. plan      - sequentially place each cross-department template once (one
+               elective placeholder per basket, one copy of each combined
+               course per cluster) so the elective slot, combined slot and
+               C004 templates are fixed up front;
+2. solve     - every department is scheduled in its own worker against a
+               private copy of the planned state;
+3. merge     - results are folded back in department order, each room booking
+               is re-validated against the merged occupancy and a clashing
+               session is moved to another legal room.  A regular session
+               with no legal room, or whose faculty an earlier department
+               already booked, is re-placed through ``_allocate_session``
+               against the merged state; whatever still does not fit goes
+               to LNSRepair, which may shift other sessions to make room;
+4. export    - student workbooks are written by the pool, the combined faculty
+               workbook once at the end.
+
+Every Scheduler draws from its own generator, seeded from the root seed, the
+department and the half, and results are always merged in department order,
+so the output for a given seed does not depend on the worker count.
+"""
+
+import copy
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from timetable_automation.main import (
+    Scheduler,
+    new_global_state,
+    stream_seed,
+    write_combined_faculty_workbook,
+)
+from timetable_automation.entries import EntryStore, session_type_of
+from timetable_automation.profiling import PROFILE_FILENAME, Profiler, profiling_enabled
+from timetable_automation.records import UnscheduledCourse
+from timetable_automation.repair import LNSRepair
+
+SHEET_HALVES = (("First_Half", ("1", "0")), ("Second_Half", ("2", "0")))
+SESSION_TYPES = {"L": "Lecture", "T": "Tutorial", "P": "Lab"}
+# LNS iterations per session the merge could not re-place directly.
+MERGE_REPAIR_ITERATIONS = 50
+
+
+def _map(func, tasks, workers):
+    if workers <= 1 or len(tasks) <= 1:
+        # Same code path as the pool, but on private copies of the inputs.
+        return [func(copy.deepcopy(t)) for t in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, tasks))
+
+
+def _template_key(scheduler, course, sheet_name):
+    # The slot template a shared course follows: one per elective basket of a
+    # semester, one per combined course of a cluster.
+    if course.is_elective:
+        return scheduler._elective_representative_key(course.basket, sheet_name)
+    return scheduler._combined_template_key(course.code, None, sheet_name)
+
+
+def plan_templates(
+    departments, slots_file, rooms_file, state, seed, solver_mode="greedy", profiler=None, scheduler_options=None
+):
+    # Only the first department that owns a template key places it; the rest
+    # follow the template during the solve phase.
+    planned = set()
+    for dept_name, course_file in departments.items():
+        scheduler = Scheduler(
+            slots_file,
+            course_file,
+            rooms_file,
+            dept_name=dept_name,
+            solver_mode=solver_mode,
+            profiler=profiler,
+            seed=stream_seed(seed, "plan"),
+            **state,
+            **(scheduler_options or {}),
+        )
+        for sheet_name, halves in SHEET_HALVES:
+            shared = [
+                c
+                for c in scheduler.courses
+                if c.semester_half in halves
+                and (c.basket > 0 if c.is_elective else c.is_combined)
+                and _template_key(scheduler, c, sheet_name) not in planned
+            ]
+            if shared:
+                scheduler.generate_timetable(shared, None, sheet_name)
+                planned.update(_template_key(scheduler, c, sheet_name) for c in shared)
+    return state
+
+
+def _solve_department(task):
+    dept_name, course_file, slots_file, rooms_file, state, seed, solver_mode, profile, options = task
+    profiler = Profiler() if profile else None
+    scheduler = Scheduler(
+        slots_file,
+        course_file,
+        rooms_file,
+        dept_name=dept_name,
+        solver_mode=solver_mode,
+        profiler=profiler,
+        seed=seed,
+        **state,
+        **options,
+    )
+    timetables = {}
+    for sheet_name, halves in SHEET_HALVES:
+        courses = [c for c in scheduler.courses if c.semester_half in halves]
+        timetables[sheet_name] = scheduler.generate_timetable(courses, None, sheet_name)
+    return {
+        "dept_name": dept_name,
+        "entries": list(scheduler.scheduled_entries),
+        "unscheduled": scheduler.unscheduled_courses,
+        "electives_by_sheet": scheduler.electives_by_sheet,
+        "course_room_map": scheduler.course_room_map,
+        "timetables": timetables,
+        "profile": profiler.summary() if profiler is not None else None,
+    }
+
+
+def _relabel(entry, old_room, new_room):
+    if f"(Lab-{old_room})" in entry["display"]:
+        return entry["display"].replace(f"(Lab-{old_room})", f"(Lab-{new_room})")
+    return entry["display"].replace(f"({old_room})", f"({new_room})")
+
+
+def _unscheduled(course, code, faculty, sheet_name, session_type, hours):
+    return UnscheduledCourse(
+        sheet=sheet_name,
+        course_code=code,
+        course_title=course.title if course else code,
+        faculty=faculty,
+        type=SESSION_TYPES[session_type],
+        remaining_hours=hours,
+        semester_half=course.semester_half if course else "",
+    )
+
+
+def _merge_department(scheduler, result):
+    # Re-validate every room booking of one department against the merged
+    # state, then re-place the sessions that lost their room or faculty.
+    sessions = {}
+    for ent in result["entries"]:
+        sessions.setdefault((ent["sheet"], ent["day"], ent["code"]), []).append(ent)
+
+    courses_by_code = {c.code: c for c in scheduler.courses}
+    timetables = result["timetables"]
+    dropped = set()
+    retry = []
+    for (sheet_name, day, code), ents in sessions.items():
+        room = ents[0]["room"]
+        slots = [e["slot"] for e in ents]
+        session_type = session_type_of(ents[0])
+        course = courses_by_code.get(code)
+        is_elective = code.startswith("Elective_")
+        combined_key = None
+        if course is not None and course.is_combined and not course.is_elective:
+            combined_key = scheduler._combined_template_key(code, session_type, sheet_name)
+        faculty = ents[0]["faculty"]
+        share = scheduler._faculty_share_key(code, is_elective, combined_key, sheet_name)
+        mask = scheduler.occupancy.mask_for(slots)
+        # Workers saw the other departments' planned templates but not their
+        # regular courses, so a regular session whose faculty is now busy is
+        # dropped like one without a legal room.
+        new_room = room
+        if share is None and faculty and scheduler.faculty_calendar.clash(faculty, sheet_name, day, mask):
+            new_room = ""
+        elif room and not scheduler._is_room_available(
+            day, slots, room, combined_key=combined_key, sheet_name=sheet_name
+        ):
+            need = scheduler._required_capacity_for_course(course, False, bool(combined_key)) if course else None
+            pool = scheduler.room_index.candidates(
+                session_type == "P",
+                is_combined=bool(combined_key),
+                min_capacity=need if session_type != "P" else None,
+            )
+            new_room = scheduler._first_free_room(
+                pool, day, slots, sheet_name=sheet_name, combined_key=combined_key
+            )
+        if room and not new_room:
+            dropped.add((sheet_name, day, code))
+            for ent in ents:
+                timetables[sheet_name].at[day, ent["slot"]] = ""
+            hours = sum(scheduler.slot_durations[s] for s in slots)
+            if share is None:
+                retry.append((sheet_name, code, course, faculty, session_type, hours))
+            else:
+                # Combined sessions must stay on their template's slots.
+                scheduler.unscheduled_courses.append(
+                    _unscheduled(course, code, faculty, sheet_name, session_type, hours)
+                )
+            continue
+        if faculty:
+            scheduler.faculty_calendar.claim((scheduler.dept_name, sheet_name), faculty, sheet_name, day, mask, share)
+        if not room:
+            continue
+        if new_room != room:
+            for ent in ents:
+                ent["display"] = _relabel(ent, room, new_room)
+                ent["room"] = new_room
+                timetables[sheet_name].at[day, ent["slot"]] = ent["display"]
+            if result["course_room_map"].get(code) == room:
+                result["course_room_map"][code] = new_room
+            room = new_room
+        scheduler._claim_room(day, slots, room, sheet_name, combined_key)
+
+    scheduler.scheduled_entries = [
+        ent for ent in result["entries"] if (ent["sheet"], ent["day"], ent["code"]) not in dropped
+    ]
+    scheduler.course_room_map = result["course_room_map"]
+    failed = []
+    for sheet_name, code, course, faculty, session_type, hours in retry:
+        if not _replace_session(scheduler, timetables[sheet_name], sheet_name, code, course, faculty, session_type, hours):
+            failed.append(_unscheduled(course, code, faculty, sheet_name, session_type, hours))
+    scheduler.unscheduled_courses.extend(failed)
+    return failed
+
+
+def _replace_session(scheduler, timetable, sheet_name, code, course, faculty, session_type, hours):
+    # Same allocation path as generate_timetable, now against the merged
+    # rooms and faculty calendar; the least loaded day is tried first.
+    lecturer_busy = {day: {} for day in scheduler.days}
+    scheduler._lecturer_busy = lecturer_busy
+    labs_scheduled = {day: False for day in scheduler.days}
+    load = {day: 0 for day in scheduler.days}
+    for ent in scheduler.scheduled_entries:
+        if ent["sheet"] != sheet_name:
+            continue
+        load[ent["day"]] += 1
+        if session_type_of(ent) == "P":
+            labs_scheduled[ent["day"]] = True
+    need = scheduler._required_capacity_for_course(course, False, False) if course and session_type != "P" else None
+    for day in sorted(scheduler.days, key=lambda d: load[d]):
+        placed = scheduler._allocate_session(
+            timetable,
+            lecturer_busy,
+            labs_scheduled,
+            day,
+            faculty,
+            code,
+            hours,
+            session_type,
+            sheet_name=sheet_name,
+            min_capacity_needed=need,
+        )
+        if placed:
+            return True
+    return False
+
+
+def _export_department(task):
+    dept_name, course_file, slots_file, rooms_file, merged, profile, options = task
+    profiler = Profiler() if profile else None
+    scheduler = Scheduler(slots_file, course_file, rooms_file, {}, dept_name=dept_name, profiler=profiler, **options)
+    scheduler.scheduled_entries = merged["entries"]
+    scheduler.unscheduled_courses = merged["unscheduled"]
+    scheduler.electives_by_sheet = merged["electives_by_sheet"]
+    scheduler.elective_room_assignment = merged["elective_room_assignment"]
+    scheduler.export_student_outputs(dept_name, f"{dept_name}_timetable.xlsx", timetables=merged["timetables"])
+    return profiler.summary() if profiler is not None else None
+
+
+def generate_all_departments_parallel(
+    departments,
+    rooms_file,
+    slots_file,
+    workers=2,
+    seed=42,
+    faculty_filename="faculty_timetable.xlsx",
+    solver_mode="greedy",
+    timings=None,
+    profile=None,
+    scheduler_options=None,
+):
+    # scheduler_options are extra Scheduler keyword arguments (days, room policy).
+    options = dict(scheduler_options or {})
+    timings = timings if timings is not None else {}
+    profile = profiling_enabled() if profile is None else profile
+    profiler = Profiler() if profile else None
+    phases = {}
+    timings.update({"phases": phases, "faculty_writes": 1, "faculty_writes_skipped": len(departments)})
+
+    start = time.perf_counter()
+    state = new_global_state(departments)
+    plan_templates(
+        departments, slots_file, rooms_file, state, seed, solver_mode=solver_mode, profiler=profiler, scheduler_options=options
+    )
+    phases["plan"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tasks = [
+        (dept_name, course_file, slots_file, rooms_file, state, seed, solver_mode, profile, options)
+        for dept_name, course_file in departments.items()
+    ]
+    results = _map(_solve_department, tasks, workers)
+    phases["timetables"] = time.perf_counter() - start
+
+    # Keep the planned templates but start room bookings from scratch: every
+    # department re-claims its own rooms, in order, during the merge.
+    start = time.perf_counter()
+    planned = state
+    state = new_global_state(departments)
+    for key in (
+        "global_elective_slots",
+        "global_elective_slot_usage",
+        "global_elective_representatives",
+        "global_combined_slots",
+        "global_c004_reserved_slots",
+    ):
+        state[key] = planned[key]
+    merged = []
+    failed = []
+    for result in results:
+        dept_name = result["dept_name"]
+        scheduler = Scheduler(
+            slots_file, departments[dept_name], rooms_file, dept_name=dept_name, profiler=profiler, **state, **options
+        )
+        scheduler.unscheduled_courses = list(result["unscheduled"])
+        failed.extend(_merge_department(scheduler, result))
+        scheduler.electives_by_sheet = result["electives_by_sheet"]
+        merged.append((scheduler, result))
+        if result["profile"] is not None:
+            profiler.merge(result["profile"])
+    if failed:
+        # Sessions no single free window could take back: let LNS repair
+        # make room for them across all departments.
+        LNSRepair(
+            [(scheduler, result["timetables"]) for scheduler, result in merged],
+            time_budget=None,
+            max_iterations=MERGE_REPAIR_ITERATIONS * len(failed),
+            rng=random.Random(stream_seed(seed, "merge")),
+            rows=failed,
+        ).run()
+
+    all_scheduled_entries = EntryStore()
+    exports = []
+    for scheduler, result in merged:
+        dept_name = scheduler.dept_name
+        for sheet_name, _ in SHEET_HALVES:
+            scheduler._compute_elective_room_assignments_legally(sheet_name)
+        all_scheduled_entries.extend(scheduler.scheduled_entries)
+        for k, v in scheduler.course_room_map.items():
+            state["global_room_usage"].setdefault("MAPPING", {})[k] = v
+        exports.append(
+            (
+                dept_name,
+                departments[dept_name],
+                slots_file,
+                rooms_file,
+                {
+                    "entries": list(scheduler.scheduled_entries),
+                    "unscheduled": scheduler.unscheduled_courses,
+                    "electives_by_sheet": scheduler.electives_by_sheet,
+                    "elective_room_assignment": scheduler.elective_room_assignment,
+                    "timetables": result["timetables"],
+                },
+                profile,
+                options,
+            )
+        )
+
+    phases["merge"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for summary in _map(_export_department, exports, workers):
+        if summary is not None:
+            profiler.merge(summary)
+    phases["student_export"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    write_combined_faculty_workbook(
+        departments,
+        slots_file,
+        rooms_file,
+        state,
+        all_scheduled_entries,
+        faculty_filename,
+        profiler=profiler,
+        scheduler_options=options,
+    )
+    phases["faculty_export"] = time.perf_counter() - start
+    if profiler is not None:
+        profiler.dump(PROFILE_FILENAME)
+    print("\nAll done. Student timetables and combined faculty timetable generated.")
+    return state, all_scheduled_entries
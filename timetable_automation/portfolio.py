@@ -0,0 +1,192 @@
+"""Multi-seed portfolio driver.
+
+The greedy scheduler's result depends heavily on its random seed.  The
+portfolio runs the whole sequential multi-department pipeline once per seed,
+each run in its own worker process and output directory under its own root
+seed, scores every finished run and keeps the best one:
+
+1. unscheduled teaching hours (lower is better);
+2. room churn - extra rooms a course uses beyond its first one, per section;
+3. faculty overload - hours above ``FACULTY_DAILY_HOURS`` a faculty member
+   teaches on one day of one half, read from the shared faculty calendar (a
+   class taught to several sections at once counts once).
+
+Runs are compared on that tuple in order, ties go to the earlier seed.  New
+seeds stop being started once the time budget is spent or a run leaves
+nothing unscheduled; runs already in progress are allowed to finish.  The
+winner's workbooks are copied into the output directory.
+"""
+
+import glob
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from timetable_automation.improve import FACULTY_DAILY_HOURS
+from timetable_automation.main import generate_all_departments
+
+
+class RunScore:
+    def __init__(self):
+        self.unscheduled_hours = 0.0
+        self.room_churn = 0
+        self._faculty_calendar = None
+        self._slot_hours = {}
+
+    def add_department(self, dept_name, scheduler):
+        self.unscheduled_hours += sum(r["remaining_hours"] for r in scheduler.unscheduled_courses)
+        rooms_by_code = {}
+        for ent in scheduler.scheduled_entries:
+            if ent["room"]:
+                rooms_by_code.setdefault(ent["code"], set()).add(ent["room"])
+        self.room_churn += sum(len(rooms) - 1 for rooms in rooms_by_code.values())
+        # Every department books the run's one faculty calendar.
+        self._faculty_calendar = scheduler.faculty_calendar
+        self._slot_hours.update(scheduler.slot_durations)
+
+    @property
+    def faculty_overload(self):
+        if self._faculty_calendar is None:
+            return 0.0
+        hours = self._faculty_calendar.load(self._slot_hours)
+        return sum(max(0.0, h - FACULTY_DAILY_HOURS) for h in hours.values())
+
+    def as_dict(self):
+        return {
+            "unscheduled_hours": self.unscheduled_hours,
+            "room_churn": self.room_churn,
+            "faculty_overload": round(self.faculty_overload, 4),
+        }
+
+
+def score_key(result):
+    s = result["score"]
+    return (s["unscheduled_hours"], s["room_churn"], s["faculty_overload"], result["index"])
+
+
+def _run_seed(task):
+    index, seed, departments, rooms_file, slots_file, solver_mode, improve, repair, options, out_dir = task
+    os.makedirs(out_dir, exist_ok=True)
+    score = RunScore()
+    cwd = os.getcwd()
+    start = time.perf_counter()
+    try:
+        os.chdir(out_dir)
+        generate_all_departments(
+            departments,
+            rooms_file=rooms_file,
+            slots_file=slots_file,
+            solver_mode=solver_mode,
+            seed=seed,
+            on_department=score.add_department,
+            improve=improve,
+            repair=repair,
+            scheduler_options=options,
+        )
+    finally:
+        os.chdir(cwd)
+    return {
+        "index": index,
+        "seed": seed,
+        "score": score.as_dict(),
+        "seconds": time.perf_counter() - start,
+        "out_dir": out_dir,
+    }
+
+
+def run_portfolio(
+    departments,
+    rooms_file,
+    slots_file,
+    seeds=8,
+    workers=1,
+    root_seed=42,
+    time_budget=None,
+    solver_mode="greedy",
+    output_dir=".",
+    improve=None,
+    repair=None,
+    scheduler_options=None,
+):
+    """Run the pipeline under ``seeds`` seeds and keep the best; return the report."""
+    departments = {name: os.path.abspath(path) for name, path in departments.items()}
+    rooms_file = os.path.abspath(rooms_file)
+    slots_file = os.path.abspath(slots_file)
+    output_dir = os.path.abspath(output_dir)
+    scratch = tempfile.mkdtemp(prefix=".portfolio-", dir=output_dir)
+    tasks = [
+        (
+            i,
+            root_seed + i,
+            departments,
+            rooms_file,
+            slots_file,
+            solver_mode,
+            improve,
+            repair,
+            scheduler_options,
+            os.path.join(scratch, f"seed-{root_seed + i}"),
+        )
+        for i in range(seeds)
+    ]
+    deadline = time.perf_counter() + time_budget if time_budget else None
+    results = []
+
+    def should_stop():
+        if any(r["score"]["unscheduled_hours"] == 0 for r in results):
+            return True
+        return deadline is not None and time.perf_counter() >= deadline
+
+    try:
+        if workers <= 1:
+            for task in tasks:
+                if results and should_stop():
+                    break
+                results.append(_run_seed(task))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = {pool.submit(_run_seed, t) for t in tasks}
+                while pending:
+                    timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+                    done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                    results.extend(f.result() for f in done)
+                    if pending and should_stop():
+                        for future in pending:
+                            future.cancel()
+                        pending = {f for f in pending if not f.cancelled()}
+                        results.extend(f.result() for f in pending)
+                        break
+
+        results.sort(key=score_key)
+        best = results[0]
+        for path in glob.glob(os.path.join(best["out_dir"], "*.xlsx")):
+            shutil.copy2(path, output_dir)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    report = {
+        "best_seed": best["seed"],
+        "best_score": best["score"],
+        "runs": sorted(
+            ({k: v for k, v in r.items() if k != "out_dir"} for r in results), key=lambda r: r["index"]
+        ),
+        "skipped_seeds": [t[1] for t in tasks if t[0] not in {r["index"] for r in results}],
+    }
+    return report
+
+
+def format_portfolio_report(report):
+    lines = ["Portfolio results:"]
+    for run in report["runs"]:
+        s = run["score"]
+        marker = "*" if run["seed"] == report["best_seed"] else " "
+        lines.append(
+            f" {marker} seed {run['seed']:<6} unscheduled {s['unscheduled_hours']:6.1f}h"
+            f"  room churn {s['room_churn']:4d}  faculty overload {s['faculty_overload']:6.1f}h"
+            f"  ({run['seconds']:.1f}s)"
+        )
+    if report["skipped_seeds"]:
+        lines.append(f"   not run: {', '.join(str(s) for s in report['skipped_seeds'])}")
+    return "\n".join(lines)
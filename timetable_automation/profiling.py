@@ -0,0 +1,121 @@
+"""Opt-in hot-path instrumentation for Scheduler runs.
+
+Set ``TIMETABLE_PROFILE=1`` (or pass ``--profile`` to ``main``) and every
+Scheduler gets a Profiler that counts calls and inclusive wall-clock seconds
+of the methods in ``HOT_PATHS`` and records how many ``MAX_ATTEMPTS``
+iterations each course session needed.  The summary is written as JSON next
+to the timetables.  When profiling is off nothing is wrapped, so the only
+cost is a ``self.profiler is not None`` check per course session.
+"""
+
+import functools
+import json
+import os
+import time
+
+PROFILE_ENV = "TIMETABLE_PROFILE"
+PROFILE_FILENAME = "timetable_profile.json"
+
+HOT_PATHS = (
+    "_allocate_session",
+    "_pick_room_for_slots",
+    "_get_free_blocks",
+    "_free_windows",
+    "_compute_elective_room_assignments_legally",
+    "format_student_timetable_with_legend",
+    "_write_student_workbook",
+    "_generate_faculty_workbook",
+)
+
+
+def profiling_enabled():
+    return os.environ.get(PROFILE_ENV, "").strip().lower() not in ("", "0", "false", "no", "off")
+
+
+class Profiler:
+    def __init__(self):
+        # name -> [calls, seconds, hits]; hits counts calls with a truthy result.
+        self.stats = {}
+        self.attempts = []
+
+    def add(self, name, seconds, hit=False):
+        entry = self.stats.setdefault(name, [0, 0.0, 0])
+        entry[0] += 1
+        entry[1] += seconds
+        if hit:
+            entry[2] += 1
+
+    def _wrap(self, name, method):
+        add = self.add
+        clock = time.perf_counter
+
+        if name == "_allocate_session":
+            # Forced template slots and the free-block search behave very
+            # differently, so they are reported separately.
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                start = clock()
+                result = method(*args, **kwargs)
+                mode = "force" if kwargs.get("force_slots") else "search"
+                add(f"{name}[{mode}]", clock() - start, bool(result))
+                return result
+
+            return wrapper
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            result = method(*args, **kwargs)
+            add(name, clock() - start, bool(result))
+            return result
+
+        return wrapper
+
+    def instrument(self, scheduler):
+        for name in HOT_PATHS:
+            setattr(scheduler, name, self._wrap(name, getattr(scheduler, name)))
+        return scheduler
+
+    def record_attempts(self, dept_name, sheet_name, code, session_type, attempts, remaining):
+        if attempts:
+            self.attempts.append(
+                {
+                    "department": dept_name,
+                    "sheet": sheet_name,
+                    "course": code,
+                    "session": session_type,
+                    "attempts": attempts,
+                    "remaining_hours": remaining if remaining > 0 else 0,
+                }
+            )
+
+    def merge(self, summary):
+        # Fold in the summary() of a profiler that ran in another process.
+        for name, entry in summary["hot_paths"].items():
+            mine = self.stats.setdefault(name, [0, 0.0, 0])
+            mine[0] += entry["calls"]
+            mine[1] += entry["seconds"]
+            mine[2] += entry["hits"]
+        self.attempts.extend(summary["attempts"]["courses"])
+
+    def summary(self):
+        counts = [a["attempts"] for a in self.attempts]
+        return {
+            "hot_paths": {
+                name: {"calls": calls, "seconds": round(seconds, 6), "hits": hits}
+                for name, (calls, seconds, hits) in sorted(self.stats.items())
+            },
+            "attempts": {
+                "loops": len(counts),
+                "total": sum(counts),
+                "max": max(counts, default=0),
+                "exhausted": sum(1 for a in self.attempts if a["remaining_hours"] > 0),
+                "courses": self.attempts,
+            },
+        }
+
+    def dump(self, path):
+        with open(path, "w") as fh:
+            json.dump(self.summary(), fh, indent=2)
+        print(f"Profile written to {path}")
+        return path
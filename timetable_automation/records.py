@@ -0,0 +1,76 @@
+"""Compact record types for scheduled entries and report rows.
+
+Scheduled entries, unscheduled-course rows, exam placements and invigilation
+rows used to be plain dicts.  The classes here store the same fields in
+``__slots__`` (no per-instance ``__dict__``) but are ``Mapping``
+implementations that also allow assigning to their fields, so ``ent["room"]``,
+``ent.get("room", "")``, ``dict(ent)``, ``pd.DataFrame(records)`` and
+comparisons against dicts keep working.
+"""
+
+from collections.abc import Mapping
+
+
+class Record(Mapping):
+    __slots__ = ()
+
+    def __init__(self, *values, **fields):
+        names = self.__slots__
+        if len(values) > len(names):
+            raise TypeError(f"{type(self).__name__} takes at most {len(names)} values")
+        for name, value in zip(names, values):
+            setattr(self, name, value)
+        for name, value in fields.items():
+            if name not in names:
+                raise TypeError(f"{type(self).__name__} has no field {name!r}")
+            setattr(self, name, value)
+        missing = [name for name in names if not hasattr(self, name)]
+        if missing:
+            raise TypeError(f"{type(self).__name__} missing fields: {', '.join(missing)}")
+
+    def __getitem__(self, key):
+        if key in self.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def get(self, key, default=None):
+        if key in self.__slots__:
+            return getattr(self, key)
+        return default
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+class ScheduledEntry(Record):
+    __slots__ = ("sheet", "day", "slot", "code", "display", "faculty", "room")
+
+
+class UnscheduledCourse(Record):
+    __slots__ = ("sheet", "course_code", "course_title", "faculty", "type", "remaining_hours", "semester_half")
+
+
+class ExamPlacement(Record):
+    __slots__ = ("Date", "Slot", "Groups", "Course_Code", "Course_Title", "Students", "Allocations")
+
+
+class UnscheduledExam(Record):
+    __slots__ = ("Group", "Course_Code", "Course_Title", "Students")
+
+
+class InvigilationRow(Record):
+    __slots__ = ("Date", "Slot", "Room_ID", "Exam", "Invigilators")
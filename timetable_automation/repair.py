@@ -0,0 +1,159 @@
+"""Large Neighbourhood Search repair of unscheduled courses.
+
+LNSRepair works on the same model as the improvement pass (see improve.py):
+regular sessions of every department, pinned electives and combined courses,
+and one pending chunk per unscheduled 1.5h lecture, 1h tutorial or 2h lab.
+Each iteration picks a pending chunk and first tries to place it as it is.
+If that fails it destroys a neighbourhood around it:
+
+- section - the section's sessions on one day;
+- faculty - every session its faculty teaches on one day, in any department;
+- room    - every session held in one suitable room on one day.
+
+The chunk and the lifted sessions are then re-inserted with an exhaustive
+search instead of the retry loops' random attempts.  Every (day, window, room)
+is tried under the same rules as a move, the session with the fewest legal
+placements goes first, and it takes the tightest window on the lightest day.
+The result is kept only if everything found a place again, otherwise the
+neighbourhood is put back.  This repeats until nothing is pending or the
+budget runs out.
+"""
+
+import time
+
+from timetable_automation.improve import LocalSearch
+from timetable_automation.occupancy import scope_for_sheet
+
+NEIGHBOURHOODS = ("section", "faculty", "room")
+
+
+class LNSRepair(LocalSearch):
+    MAX_NEIGHBOURHOOD = 6
+
+    def __init__(self, departments, time_budget=10.0, max_iterations=None, rng=None, rows=None):
+        # rows limits the repair to the chunks of these unscheduled rows; the
+        # other pending chunks are left alone.
+        super().__init__(departments, time_budget=time_budget, rng=rng)
+        self.max_iterations = max_iterations
+        self.rows = None if rows is None else {id(row) for row in rows}
+
+    def _targets(self):
+        if self.rows is None:
+            return self.pending
+        return [s for s in self.pending if id(s.origin) in self.rows]
+
+    def _options(self, sess):
+        sch = sess.dept.scheduler
+        preferred = [r for r in (sess.room, sch.course_room_map.get(sess.code)) if r]
+        rooms = preferred + [r for r in sorted(sch.labs if sess.kind == "P" else sch.classrooms) if r not in preferred]
+        options = []
+        for day_index, day in enumerate(sch.days):
+            state = self.day_states.get((sess.dept, sess.sheet, day))
+            load = state.hours if state is not None else 0.0
+            for window in sch.geometry.windows(sess.hours):
+                if not self._slots_ok(sess, day, window.slots):
+                    continue
+                room = next((r for r in rooms if self._room_ok(sess, day, window.slots, r)), "")
+                if room:
+                    options.append((window.waste, load, day_index, window.start, day, window.slots, room))
+        return options
+
+    def _reinsert(self, sessions):
+        # Most constrained first; returns the sessions placed and whether all were.
+        placed = []
+        todo = list(sessions)
+        while todo:
+            best = None
+            for sess in todo:
+                options = self._options(sess)
+                if not options:
+                    return placed, False
+                if best is None or len(options) < len(best[1]):
+                    best = (sess, options)
+            sess, options = best
+            *_, day, slots, room = min(options)
+            self._place(sess, day, slots, room)
+            placed.append(sess)
+            todo.remove(sess)
+        return placed, True
+
+    def _neighbourhood(self, target, kind):
+        dept, sheet = target.dept, target.sheet
+        sch = dept.scheduler
+        day = self.rng.choice(sch.days)
+        if kind == "section":
+            state = self.day_states.get((dept, sheet, day))
+            found = [s for s in state.sessions if s.movable] if state is not None else []
+        elif kind == "faculty":
+            names = set(target.names)
+            found = [
+                s
+                for (_, other_sheet, other_day), state in self.day_states.items()
+                if other_sheet == sheet and other_day == day
+                for s in state.sessions
+                if s.movable and names.intersection(s.names)
+            ]
+        else:
+            pool = sch.labs if target.kind == "P" else sch.classrooms
+            room = self.rng.choice(pool) if pool else ""
+            scope = scope_for_sheet(sheet)
+            found = [
+                s
+                for (_, other_sheet, other_day), state in self.day_states.items()
+                if other_day == day and scope_for_sheet(other_sheet) == scope
+                for s in state.sessions
+                if s.movable and s.room == room
+            ]
+        if len(found) > self.MAX_NEIGHBOURHOOD:
+            found = self.rng.sample(found, self.MAX_NEIGHBOURHOOD)
+        return found
+
+    def _repair(self, target, destroyed):
+        lifted = [(s, s.day, s.slots, s.room) for s in destroyed]
+        for sess in destroyed:
+            self._remove(sess)
+        placed, complete = self._reinsert([target] + destroyed)
+        if complete:
+            self.pending.remove(target)
+            self.placed.append(target)
+            return True
+        for sess in placed:
+            self._remove(sess)
+        for sess, day, slots, room in lifted:
+            self._place(sess, day, slots, room)
+        return False
+
+    def run(self):
+        start = time.perf_counter()
+        self._sync_lists()
+        initial = sum(s.hours for s in self._targets())
+        stats = {"iterations": 0, "destroyed": 0}
+        while self._targets():
+            if self.max_iterations is not None and stats["iterations"] >= self.max_iterations:
+                break
+            if self.time_budget is not None and time.perf_counter() - start >= self.time_budget:
+                break
+            stats["iterations"] += 1
+            target = self.rng.choice(self._targets())
+            if self._repair(target, []):
+                continue
+            destroyed = self._neighbourhood(target, self.rng.choice(NEIGHBOURHOODS))
+            stats["destroyed"] += len(destroyed)
+            self._repair(target, destroyed)
+        self._sync_lists()
+        remaining = sum(s.hours for s in self._targets())
+        self._write_back()
+        stats.update(
+            initial_hours=initial,
+            repaired_hours=initial - remaining,
+            remaining_hours=remaining,
+            seconds=time.perf_counter() - start,
+        )
+        return stats
+
+
+def format_repair_report(stats):
+    return (
+        f"LNS repair: {stats['repaired_hours']:.1f}h of {stats['initial_hours']:.1f}h unscheduled placed"
+        f" in {stats['iterations']} iterations ({stats['seconds']:.1f}s), {stats['remaining_hours']:.1f}h left"
+    )
@@ -0,0 +1,64 @@
+"""Room candidates pre-bucketed by the static room rules.
+
+Whether a room can host a session at all depends only on the session type
+(lab or classroom), the room policy (compulsory-only, combined-only or
+general) and the room's capacity, none of which change during a run.
+RoomIndex sorts the rooms into those buckets once, capacity ascending, and
+memoises the candidate list of every query, so picking a room is one scan of
+the admissible rooms against the occupancy masks instead of a shuffle and a
+full rule check over the whole catalogue.
+"""
+
+from bisect import bisect_left
+
+GENERAL = "general"
+COMPULSORY_ONLY = "compulsory_only"
+COMBINED_ONLY = "combined_only"
+
+
+class RoomIndex:
+    def __init__(self, room_ids, room_table):
+        # Ties on capacity keep the catalogue order.
+        buckets = {}
+        for order, room_id in enumerate(room_ids):
+            room = room_table.profile(room_id)
+            if room.non_compulsory_blocked:
+                policy = COMBINED_ONLY
+            elif room.compulsory_only:
+                policy = COMPULSORY_ONLY
+            else:
+                policy = GENERAL
+            buckets.setdefault((room.is_lab, policy), []).append((room.capacity, order, room_id))
+        self.buckets = {key: sorted(rows) for key, rows in buckets.items()}
+        self._capacities = {key: [row[0] for row in rows] for key, rows in self.buckets.items()}
+        self._cache = {}
+
+    def _band(self, is_lab, policy, min_capacity):
+        rows = self.buckets.get((is_lab, policy), [])
+        if not rows or not min_capacity or min_capacity <= 0:
+            return rows
+        return rows[bisect_left(self._capacities[(is_lab, policy)], min_capacity):]
+
+    def combined_only(self, is_lab, min_capacity=None):
+        key = ("combined_only", is_lab, min_capacity or 0)
+        found = self._cache.get(key)
+        if found is None:
+            found = self._cache[key] = tuple(r for _, _, r in self._band(is_lab, COMBINED_ONLY, min_capacity))
+        return found
+
+    def candidates(self, is_lab, is_compulsory=True, is_combined=False, min_capacity=None):
+        """Rooms that pass the type, policy and capacity rules, in pick order.
+
+        Combined-only rooms (C004) need a combined compulsory course and come
+        first; compulsory-only rooms (C002/C003) need a compulsory course.
+        The rest follow smallest sufficient capacity first.
+        """
+        key = (is_lab, bool(is_compulsory), bool(is_combined), min_capacity or 0)
+        found = self._cache.get(key)
+        if found is None:
+            first = self.combined_only(is_lab, min_capacity) if is_compulsory and is_combined else ()
+            rest = list(self._band(is_lab, GENERAL, min_capacity))
+            if is_compulsory:
+                rest = sorted(rest + self._band(is_lab, COMPULSORY_ONLY, min_capacity))
+            found = self._cache[key] = first + tuple(r for _, _, r in rest)
+        return found
@@ -0,0 +1,126 @@
+"""On-disk snapshot of a solved multi-department run.
+
+A sequential run can save its solved state to ``timetable_state.pkl``:
+
+- the digests of the rooms, slots and course files;
+- the parsed courses of every department;
+- the shared ``global_*`` maps (without the occupancy index and faculty
+  calendar, which are rebuilt from the entries);
+- per department, the scheduled entries, course-room map and unscheduled rows.
+
+A checkpoint has the same layout for the departments finished so far, plus
+the occupancy index, the faculty calendar and the root seed, so ``--resume``
+carries on exactly where the interrupted run stopped.
+
+Records are stored as plain field tuples, and both files are written
+atomically like the input cache.  This module deliberately does not import
+main.py: ``python -m timetable_automation.main`` runs it as ``__main__``, and
+a second import would build a second copy of every class in it.
+"""
+
+import os
+import pickle
+
+from timetable_automation.inputs import default_cache as default_input_cache
+
+STATE_FORMAT = 2
+STATE_FILENAME = "timetable_state.pkl"
+CHECKPOINT_FILENAME = "timetable_checkpoint.pkl"
+
+
+def file_digest(path):
+    return default_input_cache.key(path)[2]
+
+
+def pack_records(records):
+    return [tuple(getattr(r, name) for name in r.__slots__) for r in records]
+
+
+def unpack_records(rows, record_type):
+    return [record_type(*row) for row in rows]
+
+
+def course_signatures(courses):
+    # code -> sorted field tuples of every row with that code.
+    found = {}
+    for course in courses:
+        found.setdefault(course.code, []).append(tuple(getattr(course, f, None) for f in type(course).__slots__))
+    return {code: tuple(sorted(rows, key=repr)) for code, rows in found.items()}
+
+
+def department_snapshot(course_file, scheduler):
+    return {
+        "digest": file_digest(course_file),
+        "courses": course_signatures(scheduler.courses),
+        "entries": pack_records(scheduler.scheduled_entries),
+        "course_room_map": dict(scheduler.course_room_map),
+        "unscheduled": pack_records(scheduler.unscheduled_courses),
+    }
+
+
+def _write(path, payload):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fh:
+        pickle.dump(payload, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def _read(path):
+    try:
+        with open(path, "rb") as fh:
+            payload = pickle.load(fh)
+    except (OSError, EOFError, pickle.PickleError, AttributeError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("format") != STATE_FORMAT:
+        return None
+    return payload
+
+
+def save_run_state(path, rooms_file, slots_file, state, snapshots):
+    _write(
+        path,
+        {
+            "format": STATE_FORMAT,
+            "rooms": file_digest(rooms_file),
+            "slots": file_digest(slots_file),
+            "state": {k: v for k, v in state.items() if k not in ("global_occupancy", "global_faculty_calendar")},
+            "departments": snapshots,
+        },
+    )
+
+
+def load_run_state(path):
+    payload = _read(path)
+    if payload is None or payload.get("checkpoint"):
+        return None
+    return payload
+
+
+def save_checkpoint(path, rooms_file, slots_file, state, snapshots, seed):
+    _write(
+        path,
+        {
+            "format": STATE_FORMAT,
+            "checkpoint": True,
+            "rooms": file_digest(rooms_file),
+            "slots": file_digest(slots_file),
+            "state": state,
+            "departments": snapshots,
+            "seed": seed,
+        },
+    )
+
+
+def load_checkpoint(path, departments, rooms_file, slots_file):
+    """Return the checkpoint at ``path`` if it is a prefix of this run, else None."""
+    payload = _read(path)
+    if payload is None or not payload.get("checkpoint"):
+        return None
+    if payload["rooms"] != file_digest(rooms_file) or payload["slots"] != file_digest(slots_file):
+        return None
+    done = list(payload["departments"])
+    if done != list(departments)[: len(done)]:
+        return None
+    if any(payload["departments"][name]["digest"] != file_digest(departments[name]) for name in done):
+        return None
+    return payload
@@ -0,0 +1,274 @@
+"""Backtracking constraint solver used by ``Scheduler(solver_mode="backtracking")``.
+
+Each L/T/P session left over after the cross-department templates have been
+applied becomes one variable whose domain is every (day, contiguous slot
+block, room) the greedy allocator would accept for it.  All variables belong
+to the same sheet of the same section, so they only interact on a shared day:
+they may not overlap each other's slots or trailing break, a course code gets
+at most one session per day and a section at most one lab per day.  Rooms,
+faculty, elective and C004 rules are checked against the committed state while
+building the domains.
+
+The search picks the most constrained variable first, forward-checks every
+assignment and backjumps straight to the culprit when a domain is wiped out
+(FC-CBJ).  It stops after ``time_limit`` seconds or ``node_limit`` nodes and
+then keeps the largest partial assignment it has seen.
+"""
+
+import time
+
+SESSION_LABELS = {"L": "Lecture", "T": "Tutorial", "P": "Lab"}
+
+
+class _OutOfBudget(Exception):
+    pass
+
+
+class SessionVar:
+    def __init__(self, index, course, session_type, duration, options):
+        self.index = index
+        self.course = course
+        self.code = options["code"]
+        self.faculty = options["faculty"]
+        self.session_type = session_type
+        self.duration = duration
+        self.options = options
+        self.domain = []
+
+
+class SessionValue:
+    def __init__(self, day, day_index, slots, start_idx, room, relaxed, waste, mask, footprint):
+        self.day = day
+        self.day_index = day_index
+        self.slots = slots
+        self.start_idx = start_idx
+        self.room = room
+        self.relaxed = relaxed
+        self.waste = waste
+        self.mask = mask
+        self.footprint = footprint
+
+
+class BacktrackingSolver:
+    def __init__(self, scheduler, timetable, lecturer_busy, labs_scheduled, sheet_name, time_limit=5.0, node_limit=50000):
+        self.scheduler = scheduler
+        self.timetable = timetable
+        self.lecturer_busy = lecturer_busy
+        self.labs_scheduled = labs_scheduled
+        self.sheet_name = sheet_name
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.vars = []
+        self.nodes = 0
+
+    def add_session(self, course, session_type, duration, options):
+        var = SessionVar(len(self.vars), course, session_type, duration, options)
+        self.vars.append(var)
+        return var
+
+    # ------------------------------------------------------------------ domains
+
+    def _windows(self, day, duration):
+        return self.scheduler._free_windows(self.timetable, day, duration)
+
+    def _is_class_cell(self, day, slot):
+        val = self.timetable.at[day, slot]
+        return val not in ("", "BREAK", "FREE")
+
+    def _room_candidates(self, var):
+        sch = self.scheduler
+        opts = var.options
+        pool = sch.room_index.candidates(
+            var.session_type == "P",
+            is_combined=bool(opts["combined_key"]),
+            min_capacity=opts["min_capacity_needed"],
+        )
+        mapped = sch.course_room_map.get(var.code)
+        if not mapped or mapped not in pool:
+            return pool
+        # The course's usual room goes right after C004 for combined lectures.
+        lead = 0
+        if opts["combined_key"] and var.session_type != "P":
+            lead = len(sch.room_index.combined_only(False, opts["min_capacity_needed"]))
+        if pool.index(mapped) < lead:
+            return pool
+        return pool[:lead] + (mapped,) + tuple(r for r in pool[lead:] if r != mapped)
+
+    def _pick_room(self, var, day, slots):
+        return self.scheduler._first_free_room(
+            self._room_candidates(var),
+            day,
+            slots,
+            sheet_name=self.sheet_name,
+            combined_key=var.options["combined_key"],
+        )
+
+    def _build_domain(self, var):
+        sch = self.scheduler
+        occ = sch.occupancy
+        opts = var.options
+        room_usage = sch._sheet_scoped_usage(sch.global_room_usage, self.sheet_name)
+        share = sch._faculty_share_key(var.code, opts["is_elective"], opts["combined_key"], self.sheet_name)
+        values = []
+        for day_index, day in enumerate(sch.days):
+            if sch.scheduled_entries.has_session(self.sheet_name, day, var.code):
+                continue
+            if var.session_type == "P" and self.labs_scheduled[day]:
+                continue
+            for window in self._windows(day, var.duration):
+                slots, trailing = list(window.slots), window.trailing
+                if any(self._is_class_cell(day, s) for s in trailing):
+                    continue
+                if var.faculty and sch._faculty_clash(self.lecturer_busy, day, var.faculty, slots, self.sheet_name, share):
+                    continue
+                relaxed = False
+                if opts["is_elective"]:
+                    if opts["min_rooms_needed"] > 1 and any(
+                        len(sch.all_rooms) - len(room_usage.get(day, {}).get(s, [])) < opts["min_rooms_needed"]
+                        for s in slots
+                    ):
+                        continue
+                    if any(sch._is_blocked_elective_slot(day, s) for s in slots):
+                        if not sch.relax_cross_sem_elective_block:
+                            continue
+                        relaxed = True
+                    room = ""
+                else:
+                    room = self._pick_room(var, day, slots)
+                    if not room:
+                        continue
+                mask = occ.mask_for(slots)
+                values.append(
+                    SessionValue(
+                        day,
+                        day_index,
+                        tuple(slots),
+                        window.start,
+                        room,
+                        relaxed,
+                        window.waste,
+                        mask,
+                        mask | occ.mask_for(trailing),
+                    )
+                )
+        return values
+
+    # ------------------------------------------------------------------- search
+
+    def _conflicts(self, a_var, a, b_var, b):
+        if a.day != b.day:
+            return False
+        if a_var.code == b_var.code:
+            return True
+        if a_var.session_type == "P" and b_var.session_type == "P":
+            return True
+        return bool(a.mask & b.footprint or b.mask & a.footprint)
+
+    def _select_var(self):
+        best = None
+        best_key = None
+        for var in self.vars:
+            if var in self.assignment:
+                continue
+            key = (len(var.domain), -var.duration, var.index)
+            if best_key is None or key < best_key:
+                best, best_key = var, key
+        return best
+
+    def _ordered_values(self, var):
+        load = self.day_load
+        return sorted(
+            var.domain,
+            key=lambda v: (v.relaxed, v.waste, load[v.day], v.day_index, v.start_idx, v.room),
+        )
+
+    def _forward_check(self, var, value, depth):
+        pruned = []
+        for other in self.vars:
+            if other in self.assignment or other is var:
+                continue
+            removed = [v for v in other.domain if self._conflicts(var, value, other, v)]
+            if not removed:
+                continue
+            other.domain = [v for v in other.domain if not self._conflicts(var, value, other, v)]
+            self.past_fc[other.index].add(depth)
+            pruned.append((other, removed))
+            if not other.domain:
+                return pruned, other
+        return pruned, None
+
+    def _undo(self, pruned, depth):
+        for other, removed in pruned:
+            other.domain.extend(removed)
+            self.past_fc[other.index].discard(depth)
+
+    def _check_budget(self):
+        self.nodes += 1
+        if self.nodes > self.node_limit or time.perf_counter() > self.deadline:
+            raise _OutOfBudget()
+
+    def _record_partial(self):
+        hours = sum(v.duration for v in self.assignment)
+        if hours > self.best_hours:
+            self.best_hours = hours
+            self.best = dict(self.assignment)
+
+    def _search(self, depth):
+        self._check_budget()
+        self._record_partial()
+        var = self._select_var()
+        if var is None:
+            return None
+        conf = set()
+        for value in self._ordered_values(var):
+            self.assignment[var] = value
+            self.day_load[value.day] += len(value.slots)
+            pruned, wiped = self._forward_check(var, value, depth)
+            if wiped is None:
+                result = self._search(depth + 1)
+                if result is None:
+                    return None
+                target, conf_child = result
+                if target < depth:
+                    self._undo(pruned, depth)
+                    self.day_load[value.day] -= len(value.slots)
+                    del self.assignment[var]
+                    return result
+                conf |= conf_child
+            else:
+                conf |= self.past_fc[wiped.index]
+            self._undo(pruned, depth)
+            self.day_load[value.day] -= len(value.slots)
+            del self.assignment[var]
+        conf |= self.past_fc[var.index]
+        conf.discard(depth)
+        if not conf:
+            return (-1, set())
+        target = max(conf)
+        conf.discard(target)
+        return (target, conf)
+
+    def solve(self):
+        """Return ({var: value}, [unplaced vars])."""
+        for var in self.vars:
+            var.domain = self._build_domain(var)
+        live = [v for v in self.vars if v.domain]
+        dead = [v for v in self.vars if not v.domain]
+        self.vars = live
+        self.assignment = {}
+        self.best = {}
+        self.best_hours = -1
+        self.past_fc = {v.index: set() for v in live}
+        self.day_load = {day: 0 for day in self.scheduler.days}
+        for ent in self.scheduler.scheduled_entries:
+            if ent["sheet"] == self.sheet_name and ent["day"] in self.day_load:
+                self.day_load[ent["day"]] += 1
+        self.deadline = time.perf_counter() + self.time_limit
+        try:
+            if self._search(0) is None:
+                self.best = dict(self.assignment)
+        except _OutOfBudget:
+            pass
+        unplaced = dead + [v for v in live if v not in self.best]
+        unplaced.sort(key=lambda v: v.index)
+        return self.best, unplaced
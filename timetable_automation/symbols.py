@@ -0,0 +1,76 @@
+"""Symbol tables: dense integer ids for names normalised once.
+
+Room ids, course codes and the like arrive as free-form strings and used to be
+re-normalised (``str(x).strip().upper()``) at every comparison.  A
+SymbolTable normalises each distinct raw value once, interns the canonical
+name and hands out a dense int, so per-symbol attributes can live in plain
+lists indexed by that id and names are only looked up again for output.
+"""
+
+import sys
+from collections import namedtuple
+
+
+def upper_key(value):
+    return str(value).strip().upper()
+
+
+class SymbolTable:
+    def __init__(self, names=(), normalise=upper_key):
+        self.normalise = normalise
+        self.names = []
+        self.ids = {}
+        self._raw = {}
+        for name in names:
+            self.id(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, raw):
+        return self.normalise(raw) in self.ids
+
+    def id(self, raw):
+        i = self._raw.get(raw)
+        if i is None:
+            name = sys.intern(self.normalise(raw))
+            i = self.ids.get(name)
+            if i is None:
+                i = self.ids[name] = len(self.names)
+                self.names.append(name)
+            self._raw[raw] = i
+        return i
+
+    def key(self, raw):
+        return self.names[self.id(raw)]
+
+
+RoomProfile = namedtuple("RoomProfile", "key is_lab capacity is_c004 compulsory_only non_compulsory_blocked")
+
+
+class RoomTable(SymbolTable):
+    # Every room check needs the same few attributes; they are derived once
+    # per room id from the Scheduler's room policy and capacities.
+    def __init__(self, names=(), capacity=None, compulsory_only=(), non_compulsory_blocked=()):
+        self.capacity = capacity if capacity is not None else {}
+        self.compulsory_only = set(compulsory_only)
+        self.non_compulsory_blocked = set(non_compulsory_blocked)
+        self.profiles = []
+        super().__init__(names)
+
+    def profile(self, raw):
+        i = self.id(raw)
+        profiles = self.profiles
+        while len(profiles) <= i:
+            key = self.names[len(profiles)]
+            profiles.append(
+                RoomProfile(
+                    key,
+                    key.startswith("L"),
+                    self.capacity.get(key, 0),
+                    key in self.non_compulsory_blocked,
+                    key in self.compulsory_only,
+                    key in self.non_compulsory_blocked,
+                )
+            )
+        return profiles[i]
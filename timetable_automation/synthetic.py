@@ -0,0 +1,211 @@
+"""Synthetic institute generator for benchmarks.
+
+Writes a data directory with the same files and CSV columns as ``data/`` and
+``data/exam_data/`` for an arbitrary number of departments, sections, courses,
+elective baskets, combined courses, rooms, labs and teaching slots.  The same
+seed always produces the same files.
+"""
+
+import csv
+import json
+import os
+import random
+
+COURSE_COLUMNS = ["Course_Code", "Course_Title", "L-T-P-S-C", "Faculty", "Semester_Half", "Elective", "Students", "basket", "is_combined"]
+EXAM_COURSE_COLUMNS = ["Course_Code", "Course_Title", "L-T-P-S-C", "Faculty", "Semester_Half", "Elective", "Students", "basket"]
+ROOM_COLUMNS = ["Room_ID", "Capacity", "Type", "Facilities"]
+SLOT_COLUMNS = ["Slot_ID", "Start_Time", "End_Time"]
+
+DEPARTMENT_NAMES = ["CSE", "DSAI", "ECE"]
+CORE_LTPSC = ["3-1-0-0-4", "3-0-2-0-4", "2-0-2-0-3", "3-1-0-0-2", "1-0-2-0-2", "3-0-0-0-3"]
+ELECTIVE_LTPSC = "3-1-0-0-4"
+COMBINED_LTPSC = "3-1-0-0-2"
+
+
+def _hhmm(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def make_slots(teaching_slots=8):
+    # Same skeleton as data/timeslots.csv: an early 07:30-09:00 slot and the
+    # 13:15-14:00 lunch slot (both excluded by the Scheduler) around hour-long
+    # teaching slots; the last morning slot runs to 13:15.
+    morning = min(4, teaching_slots)
+    afternoon = teaching_slots - morning
+    slots = [(7 * 60 + 30, 9 * 60)]
+    start = 9 * 60
+    for i in range(morning):
+        end = 13 * 60 + 15 if i == 3 else start + 60
+        slots.append((start, end))
+        start = end
+    if afternoon:
+        slots.append((13 * 60 + 15, 14 * 60))
+        start = 14 * 60
+        for _ in range(afternoon):
+            slots.append((start, start + 60))
+            start += 60
+    return [(_hhmm(a), _hhmm(b)) for a, b in slots]
+
+
+def _write_csv(path, columns, rows):
+    with open(path, "w", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def generate_institute(
+    out_dir,
+    departments=3,
+    sections=13,
+    courses_per_section=6,
+    elective_baskets=2,
+    electives_per_basket=3,
+    combined_courses=2,
+    rooms=24,
+    labs=12,
+    slots=9,
+    semesters=(1, 3, 5),
+    faculty=None,
+    seed=42,
+):
+    """Write a synthetic ``data/`` tree to ``out_dir`` and return its manifest.
+
+    ``sections`` is the total number of student sections; they are dealt out
+    round-robin over every (semester, department) pair, so each pair has one
+    or more sections named ``<DEPT>-<sem>-<letter>``.
+    """
+    rng = random.Random(seed)
+    exam_dir = os.path.join(out_dir, "exam_data")
+    os.makedirs(exam_dir, exist_ok=True)
+
+    dept_names = [DEPARTMENT_NAMES[i] if i < len(DEPARTMENT_NAMES) else f"D{i + 1:02d}" for i in range(departments)]
+    pairs = [(sem, dept) for sem in semesters for dept in dept_names]
+    section_names = {pair: [] for pair in pairs}
+    for i in range(sections):
+        sem, dept = pairs[i % len(pairs)]
+        n = len(section_names[(sem, dept)])
+        letter = chr(ord("A") + n) if n < 26 else f"S{n + 1}"
+        section_names[(sem, dept)].append(f"{dept}-{sem}-{letter}")
+
+    if faculty is None:
+        faculty = max(10, sections * courses_per_section // 3 + len(semesters) * (elective_baskets * electives_per_basket + combined_courses))
+    faculty_names = [f"Dr. Faculty {i + 1:03d}" for i in range(faculty)]
+    next_faculty = [0]
+
+    def pick_faculty():
+        name = faculty_names[next_faculty[0] % len(faculty_names)]
+        next_faculty[0] += 1
+        return name
+
+    # Courses shared by every section of a semester: elective baskets and
+    # combined courses (the latter only within a department cluster, which
+    # the Scheduler derives from the department prefix).
+    shared = {}
+    for sem in semesters:
+        rows = []
+        for b in range(1, elective_baskets + 1):
+            for e in range(electives_per_basket):
+                rows.append({
+                    "Course_Code": f"EL{sem}{b}{e + 1}",
+                    "Course_Title": f"Elective {sem}.{b}.{e + 1}",
+                    "L-T-P-S-C": ELECTIVE_LTPSC,
+                    "Faculty": pick_faculty(),
+                    "Semester_Half": "0",
+                    "Elective": 1,
+                    "Students": rng.randint(15, 60),
+                    "basket": b,
+                    "is_combined": 0,
+                })
+        for k in range(combined_courses):
+            rows.append({
+                "Course_Code": f"MA{sem}{k + 1:02d}",
+                "Course_Title": f"Combined Mathematics {sem}.{k + 1}",
+                "L-T-P-S-C": COMBINED_LTPSC,
+                "Faculty": pick_faculty(),
+                "Semester_Half": str(1 + k % 2),
+                "Elective": 0,
+                "Students": 0,
+                "basket": 0,
+                "is_combined": 1,
+            })
+        shared[sem] = rows
+
+    departments_map = {}
+    exam_departments = {}
+    for (sem, dept), names in section_names.items():
+        if not names:
+            continue
+        core = [
+            {
+                "Course_Code": f"{dept[:2]}{sem}{k + 1:02d}",
+                "Course_Title": f"{dept} Core {sem}.{k + 1}",
+                "L-T-P-S-C": rng.choice(CORE_LTPSC),
+                "Semester_Half": rng.choice(["0", "0", "1", "2"]),
+                "Elective": 0,
+                "basket": 0,
+                "is_combined": 0,
+            }
+            for k in range(courses_per_section)
+        ]
+        exam_rows = {}
+        for name in names:
+            strength = rng.randint(55, 90)
+            rows = [dict(c, Faculty=pick_faculty(), Students=strength) for c in core]
+            for row in shared[sem]:
+                rows.append(dict(row, Students=strength) if row["is_combined"] else dict(row))
+            path = os.path.join(out_dir, f"courses{name}.csv")
+            _write_csv(path, COURSE_COLUMNS, rows)
+            departments_map[name] = path
+            for row in rows:
+                # Section strengths add up; an elective keeps its own enrolment.
+                merged = exam_rows.setdefault(row["Course_Code"], dict(row, Students=0))
+                if row["Elective"]:
+                    merged["Students"] = row["Students"]
+                else:
+                    merged["Students"] += row["Students"]
+        exam_name = f"{dept}-{sem}"
+        exam_path = os.path.join(exam_dir, f"{dept}_{sem}.csv")
+        _write_csv(exam_path, EXAM_COURSE_COLUMNS, list(exam_rows.values()))
+        exam_departments[exam_name] = exam_path
+
+    room_rows = [
+        {"Room_ID": "C002", "Capacity": 120, "Type": "120-Seater Hall", "Facilities": "Whiteboard, Display Screen"},
+        {"Room_ID": "C003", "Capacity": 120, "Type": "120-Seater Hall", "Facilities": "Whiteboard, Display Screen"},
+        {"Room_ID": "C004", "Capacity": 240, "Type": "240-Seater Hall", "Facilities": "Whiteboard, Display Screen"},
+    ]
+    for i in range(rooms):
+        room_rows.append({
+            "Room_ID": f"C{1 + i // 20}{i % 20 + 1:02d}",
+            "Capacity": 96 if i % 3 else 120,
+            "Type": "Classroom",
+            "Facilities": "Whiteboard, Display Screen",
+        })
+    for i in range(labs):
+        room_rows.append({
+            "Room_ID": f"L{1 + i // 20}{i % 20 + 50:02d}",
+            "Capacity": 40,
+            "Type": "Lab",
+            "Facilities": "Computers",
+        })
+    slot_rows = [{"Slot_ID": i + 1, "Start_Time": a, "End_Time": b} for i, (a, b) in enumerate(make_slots(slots))]
+
+    paths = {
+        "rooms": os.path.join(out_dir, "rooms.csv"),
+        "slots": os.path.join(out_dir, "timeslots.csv"),
+        "faculty": os.path.join(out_dir, "Faculty.csv"),
+        "exam_rooms": os.path.join(exam_dir, "rooms.csv"),
+        "exam_slots": os.path.join(exam_dir, "timeslots.csv"),
+        "exam_faculty": os.path.join(exam_dir, "Faculty.csv"),
+    }
+    for key in ("rooms", "exam_rooms"):
+        _write_csv(paths[key], ROOM_COLUMNS, room_rows)
+    for key in ("slots", "exam_slots"):
+        _write_csv(paths[key], SLOT_COLUMNS, slot_rows)
+    _write_csv(paths["faculty"], ["Faculty_ID", "Name"], [{"Faculty_ID": f"F{i + 1:03d}", "Name": n} for i, n in enumerate(faculty_names)])
+    _write_csv(paths["exam_faculty"], ["Faculty ID", "Name"], [{"Faculty ID": f"F{i + 1:03d}", "Name": n} for i, n in enumerate(faculty_names)])
+
+    manifest = dict(paths, departments=departments_map, exam_departments=exam_departments)
+    with open(os.path.join(out_dir, "manifest.json"), "w") as fh:
+        json.dump(manifest, fh, indent=2)
+    return manifest